@@ -0,0 +1,74 @@
+"""
+Argument types of the command line tools. Invalid values are reported by
+argparse with the usage of the tool instead of an error popup, since the
+tools run without the UI.
+"""
+
+import argparse
+import math
+
+
+def number_range(number_type, minimum, maximum=None,
+                 include_minimum=True):
+    """
+    Creates an argument type accepting finite numbers within a range.
+
+    :param number_type: type, int or float.
+    :param minimum: int, the smallest allowed value.
+    :param maximum: int, the largest allowed value or None for no limit.
+    :param include_minimum: bool, whether the minimum itself is allowed.
+    :return: function, the argument type.
+    """
+
+    def parse_number(value):
+        try:
+            number = number_type(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f'{value} is not a valid {number_type.__name__}')
+
+        # Note! NaN fails every comparison, so it would pass the limits
+        if not math.isfinite(number):
+            raise argparse.ArgumentTypeError(
+                f'{value} is not a finite number')
+
+        below_minimum = number < minimum if include_minimum \
+            else number <= minimum
+        if below_minimum or (maximum is not None and number > maximum):
+            if maximum is not None:
+                limits = f'between {minimum}-{maximum}'
+            elif include_minimum:
+                limits = f'at least {minimum}'
+            else:
+                limits = f'greater than {minimum}'
+            raise argparse.ArgumentTypeError(
+                f'{value} must be {limits}')
+
+        return number
+
+    return parse_number
+
+
+positive_int = number_range(int, 1)
+positive_float = number_range(float, 0.0, include_minimum=False)
+
+
+def hex_rgb(value):
+    """
+    Parses a hex color code argument.
+
+    :param value: str, the hex code as RRGGBB or #RRGGBB.
+    :return: tuple, the red, green and blue values 0-255.
+    """
+
+    digits = value.lstrip('#')
+    try:
+        rgb_value = tuple(bytes.fromhex(digits))
+    except ValueError:
+        rgb_value = ()
+
+    if len(rgb_value) != 3:
+        raise argparse.ArgumentTypeError(
+            f'{value} is not a valid hex code')
+
+    return rgb_value
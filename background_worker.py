@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor
+import queue
+
+from main import show_error
+
+
+class BackgroundWorker:
+
+    def __init__(self, widget, poll_interval_ms=15):
+        """
+        Creates a BackgroundWorker instance that runs model work in a
+        background thread to keep the Tk event loop responsive. Results are
+        handed back to the Tk thread through a thread-safe queue that is polled
+        with after while work is in progress.
+
+        :param widget: tkinter.Misc, the widget whose event loop gets results.
+        :param poll_interval_ms: int, the time between result polls in ms.
+        """
+
+        self.__widget = widget
+        self.__poll_interval_ms = poll_interval_ms
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+        self.__results = queue.Queue()
+        self.__latest_jobs = {}
+        self.__pending_futures = {}
+        self.__poll_after_id = None
+
+    def submit(self, key, work_function, done_function):
+        """
+        Starts running the work in the background. Work submitted earlier with
+        the same key gets superseded: it is cancelled if it hasn't started yet
+        and its result is dropped if it has, so only the latest work wins.
+
+        The work function is called with a function telling whether the work
+        has been superseded, allowing long running work to stop early. The
+        done function is called on the Tk thread with the work's result.
+
+        :param key: str, the key identifying the kind of work.
+        :param work_function: function, the work to run in the background.
+        :param done_function: function, the function receiving the result.
+        """
+
+        if not callable(work_function) or not callable(done_function):
+            show_error('Invalid background work received!')
+            return
+
+        job_id = self.__latest_jobs.get(key, 0) + 1
+        self.__latest_jobs[key] = job_id
+
+        superseded_future = self.__pending_futures.pop(key, None)
+        if superseded_future is not None:
+            superseded_future.cancel()
+
+        def is_superseded():
+            return self.__latest_jobs[key] != job_id
+
+        def run_work():
+            if is_superseded():
+                return
+
+            try:
+                result = work_function(is_superseded)
+            except Exception as error:
+                self.__results.put((key, job_id, done_function, None, error))
+                return
+
+            self.__results.put((key, job_id, done_function, result, None))
+
+        self.__pending_futures[key] = self.__executor.submit(run_work)
+
+        if self.__poll_after_id is None:
+            self.__poll_after_id = self.__widget.after(
+                self.__poll_interval_ms, self.__poll_results)
+
+    def is_busy(self):
+        """
+        Tells whether there is background work in progress.
+
+        :return: bool, True if work is in progress.
+        """
+
+        return any(not future.done()
+                   for future in self.__pending_futures.values())
+
+    def __poll_results(self):
+        """
+        Hands the finished results of the latest work to their done functions
+        on the Tk thread and keeps polling while work is in progress.
+        """
+
+        self.__poll_after_id = None
+
+        while True:
+            try:
+                key, job_id, done_function, result, error = \
+                    self.__results.get_nowait()
+            except queue.Empty:
+                break
+
+            if self.__latest_jobs.get(key) != job_id:
+                continue
+
+            self.__pending_futures.pop(key, None)
+
+            if error is not None:
+                show_error(f'Background work ran into trouble: {error}')
+                continue
+
+            done_function(result)
+
+        if self.__pending_futures:
+            self.__poll_after_id = self.__widget.after(
+                self.__poll_interval_ms, self.__poll_results)
+
+    def shutdown(self):
+        """
+        Cancels all the work that hasn't started and stops the background
+        thread once the running work finishes.
+        """
+
+        for key in self.__latest_jobs:
+            self.__latest_jobs[key] += 1
+
+        self.__pending_futures.clear()
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+        if self.__poll_after_id is not None:
+            self.__widget.after_cancel(self.__poll_after_id)
+            self.__poll_after_id = None
@@ -0,0 +1,622 @@
+import argparse
+import io
+from datetime import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from argument_types import number_range, positive_int
+from cmyk import rgb_to_cmyk, separate
+from color import Color
+from color_import import read_colors
+from color_space import rgb_to_lab
+from color_vision import simulate_rgb
+from contrast import optimize_rgb
+from delta_e import one_to_many
+from palette import Palette
+from palette_export import palette_to_text
+from pigment_mixing import mix_batch
+from tonal_ramps import compute_ramps
+from variant_sweeps import apply_variant_amount
+
+RESULTS_DIR = '.benchmarks'
+DEFAULT_SCALES = [12, 1200, 120000]
+FULL_SCALES = DEFAULT_SCALES + [1200000]
+
+# Note! Objects are reused in pools so large scales process millions of
+# colors without holding millions of instances in memory
+COLOR_POOL_SIZE = 10000
+PALETTE_POOL_SIZE = 100
+
+
+def create_color_pool(color_count):
+    """
+    Creates colors with varying RGB values to run benchmarks on.
+
+    :param color_count: int, the number of colors to process.
+    :return: list, the colors.
+    """
+
+    return [
+        Color(idx % 256, idx * 7 % 256, idx * 13 % 256, f'Color {idx}')
+        for idx in range(min(color_count, COLOR_POOL_SIZE))
+    ]
+
+
+def create_palette_pool(color_count):
+    """
+    Creates palettes to run benchmarks on.
+
+    :param color_count: int, the number of colors to process.
+    :return: list, the palettes.
+    """
+
+    return [Palette() for _ in range(min(max(color_count // 12, 1),
+                                         PALETTE_POOL_SIZE))]
+
+
+def bench_color_construction(color_count):
+    """
+    Creates a benchmark constructing colors.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    values = [(idx % 256, idx * 7 % 256, idx * 13 % 256)
+              for idx in range(min(color_count, COLOR_POOL_SIZE))]
+
+    def run():
+        for idx in range(color_count):
+            red, green, blue = values[idx % len(values)]
+            Color(red, green, blue, 'Color')
+
+    return run
+
+
+def bench_color_hex(color_count):
+    """
+    Creates a benchmark encoding colors as hex codes.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    colors = create_color_pool(color_count)
+
+    def run():
+        for idx in range(color_count):
+            colors[idx % len(colors)].hex()
+
+    return run
+
+
+def bench_color_from_hex(color_count):
+    """
+    Creates a benchmark decoding colors from hex codes.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    hex_codes = [color.hex() for color in create_color_pool(color_count)]
+
+    def run():
+        for idx in range(color_count):
+            Color.from_hex(hex_codes[idx % len(hex_codes)])
+
+    return run
+
+
+def bench_delta_e_ciede2000(color_count):
+    """
+    Creates a benchmark calculating the CIEDE2000 differences of colors
+    to a reference color.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    lab_values = rgb_to_lab([color.values()
+                             for color in create_color_pool(color_count)])
+    reference_lab = rgb_to_lab([(254, 39, 18)])[0]
+
+    def run():
+        for offset in range(0, color_count, len(lab_values)):
+            one_to_many(reference_lab, lab_values[:color_count - offset])
+
+    return run
+
+
+def bench_hex_import(color_count):
+    """
+    Creates a benchmark importing colors from rows of hex codes.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    hex_rows = ''.join(color.hex() + '\n'
+                       for color in create_color_pool(color_count)).encode()
+
+    def run():
+        for offset in range(0, color_count, COLOR_POOL_SIZE):
+            read_colors(io.BytesIO(hex_rows[:(color_count - offset) * 8]))
+
+    return run
+
+
+def bench_color_tint(color_count):
+    """
+    Creates a benchmark tinting colors.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    colors = create_color_pool(color_count)
+
+    def run():
+        for idx in range(color_count):
+            colors[idx % len(colors)].tint(25)
+
+    return run
+
+
+def bench_color_shade(color_count):
+    """
+    Creates a benchmark shading colors.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    colors = create_color_pool(color_count)
+
+    def run():
+        for idx in range(color_count):
+            colors[idx % len(colors)].shade(25)
+
+    return run
+
+
+def bench_color_tone(color_count):
+    """
+    Creates a benchmark toning colors.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    colors = create_color_pool(color_count)
+
+    def run():
+        for idx in range(color_count):
+            colors[idx % len(colors)].tone(90)
+
+    return run
+
+
+def bench_color_brightness(color_count):
+    """
+    Creates a benchmark changing the brightness of colors.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    colors = create_color_pool(color_count)
+
+    def run():
+        for idx in range(color_count):
+            colors[idx % len(colors)].brightness(128.0)
+
+    return run
+
+
+def bench_contrast_optimizer(color_count):
+    """
+    Creates a benchmark optimizing the contrast of colors against white.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    rgb_values = [(idx % 256, idx * 7 % 256, idx * 13 % 256)
+                  for idx in range(min(color_count, COLOR_POOL_SIZE))]
+
+    def run():
+        for offset in range(0, color_count, len(rgb_values)):
+            optimize_rgb(rgb_values[:color_count - offset], (255, 255, 255))
+
+    return run
+
+
+def bench_palette_construction(color_count):
+    """
+    Creates a benchmark constructing palettes.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    def run():
+        for _ in range(max(color_count // 12, 1)):
+            Palette()
+
+    return run
+
+
+def bench_palette_find_by_name(color_count):
+    """
+    Creates a benchmark finding palette colors by name.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    palettes = create_palette_pool(color_count)
+
+    def run():
+        for idx in range(max(color_count // 12, 1)):
+            palettes[idx % len(palettes)].find_by_name('Red-purple')
+
+    return run
+
+
+def bench_palette_sort_color_wheel(color_count):
+    """
+    Creates a benchmark sorting palettes by a root color.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    palettes = create_palette_pool(color_count)
+
+    def run():
+        for idx in range(max(color_count // 12, 1)):
+            palette = palettes[idx % len(palettes)]
+            palette.sort_color_wheel(palette.get(6))
+
+    return run
+
+
+def bench_palette_get_scheme_colors(color_count):
+    """
+    Creates a benchmark fetching the scheme colors of palettes.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    palettes = create_palette_pool(color_count)
+    for palette in palettes:
+        palette.set_color_scheme('Intermediate')
+
+    def run():
+        for idx in range(max(color_count // 12, 1)):
+            palettes[idx % len(palettes)].get_scheme_colors()
+
+    return run
+
+
+def bench_palette_text_export(color_count):
+    """
+    Creates a benchmark exporting palettes as text.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    palettes = create_palette_pool(color_count)
+
+    def run():
+        for idx in range(max(color_count // 12, 1)):
+            palette_to_text(palettes[idx % len(palettes)])
+
+    return run
+
+
+def bench_tonal_ramps(color_count):
+    """
+    Creates a benchmark computing tonal ramps of colors.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    rgb_values = tuple((idx % 256, idx * 7 % 256, idx * 13 % 256)
+                       for idx in range(min(color_count, COLOR_POOL_SIZE)))
+
+    def run():
+        for offset in range(0, color_count, len(rgb_values)):
+            compute_ramps.cache_clear()
+            compute_ramps(rgb_values[:color_count - offset])
+
+    return run
+
+
+def bench_cmyk_separation(color_count):
+    """
+    Creates a benchmark separating colors to CMYK inks exactly.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    rgb_values = [(idx % 256, idx * 7 % 256, idx * 13 % 256)
+                  for idx in range(min(color_count, COLOR_POOL_SIZE))]
+
+    def run():
+        for offset in range(0, color_count, len(rgb_values)):
+            separate(rgb_values[:color_count - offset])
+
+    return run
+
+
+def bench_cmyk_table_lookup(color_count):
+    """
+    Creates a benchmark separating colors to CMYK inks with the
+    conversion table.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    rgb_values = [(idx % 256, idx * 7 % 256, idx * 13 % 256)
+                  for idx in range(min(color_count, COLOR_POOL_SIZE))]
+    rgb_to_cmyk(rgb_values[:1])
+
+    def run():
+        for offset in range(0, color_count, len(rgb_values)):
+            rgb_to_cmyk(rgb_values[:color_count - offset])
+
+    return run
+
+
+def bench_color_vision_simulation(color_count):
+    """
+    Creates a benchmark simulating deuteranopia on colors.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    rgb_values = [(idx % 256, idx * 7 % 256, idx * 13 % 256)
+                  for idx in range(min(color_count, COLOR_POOL_SIZE))]
+
+    def run():
+        for offset in range(0, color_count, len(rgb_values)):
+            simulate_rgb(rgb_values[:color_count - offset], 'deutan')
+
+    return run
+
+
+def bench_variant_amount_sweep(color_count):
+    """
+    Creates a benchmark applying tone amounts to palettes from the
+    sweep tables.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    palettes = create_palette_pool(color_count)
+    apply_variant_amount(palettes[0], 'TONE', 0)
+
+    def run():
+        for idx in range(max(color_count // 12, 1)):
+            apply_variant_amount(palettes[idx % len(palettes)], 'TONE',
+                                 idx % 101)
+
+    return run
+
+
+def bench_pigment_mixing(color_count):
+    """
+    Creates a benchmark mixing pairs of wheel colors like paints.
+
+    :param color_count: int, the number of colors to process.
+    :return: function, the run of the benchmark.
+    """
+
+    rgb_values = [tuple(color.values()) for color in Palette().values()]
+    rgb_pairs = [(first_rgb, second_rgb) for first_rgb in rgb_values
+                 for second_rgb in rgb_values]
+    mix_batch(rgb_pairs, (0.5,))
+
+    def run():
+        for offset in range(0, color_count, len(rgb_pairs)):
+            mix_batch(rgb_pairs[:color_count - offset], (0.5,))
+
+    return run
+
+
+BENCHMARKS = {
+    name[len('bench_'):]: function
+    for name, function in sorted(globals().items())
+    if name.startswith('bench_')
+}
+
+
+def time_benchmark(benchmark, color_count, repeats):
+    """
+    Runs a benchmark several times and takes the fastest run to reduce the
+    noise from other processes. Runs taking over a second aren't repeated.
+
+    :param benchmark: function, the function setting up the benchmark.
+    :param color_count: int, the number of colors to process.
+    :param repeats: int, the number of times to run the benchmark.
+    :return: float, the fastest run time in seconds.
+    """
+
+    run = benchmark(color_count)
+
+    fastest_time = None
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        run()
+        elapsed_time = time.perf_counter() - start_time
+
+        if fastest_time is None or elapsed_time < fastest_time:
+            fastest_time = elapsed_time
+
+        if elapsed_time > 1.0:
+            break
+
+    return fastest_time
+
+
+def run_benchmarks(scales, names=None, repeats=3):
+    """
+    Runs the benchmarks at every scale and prints the time per color.
+
+    :param scales: list, the numbers of colors to process.
+    :param names: list, the names of the benchmarks to run or None for all.
+    :param repeats: int, the number of times to run each benchmark.
+    :return: dict, the run times in seconds keyed by benchmark and scale.
+    """
+
+    results = {}
+    for name, benchmark in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+
+        results[name] = {}
+        for color_count in scales:
+            repeat_count = repeats if color_count < 1000000 else 1
+            elapsed_time = time_benchmark(benchmark, color_count,
+                                          repeat_count)
+            results[name][str(color_count)] = elapsed_time
+
+            print(f'{name:<28} {color_count:>9} colors '
+                  f'{elapsed_time * 1000:>10.2f} ms '
+                  f'{elapsed_time / color_count * 1e9:>10.1f} ns/color')
+
+    return results
+
+
+def get_revision():
+    """
+    Fetches the short hash of the checked out git commit.
+
+    :return: str, the commit hash or 'latest' if it can't be determined.
+    """
+
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'latest'
+
+
+def save_results(results, label):
+    """
+    Stores the results to the results directory for later comparisons.
+
+    :param results: dict, the run times keyed by benchmark and scale.
+    :param label: str, the label of the results file.
+    :return: str, the path of the results file.
+    """
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f'{label}.json')
+
+    with open(path, 'w') as file:
+        json.dump({
+            'label': label,
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'results': results
+        }, file, indent=2)
+
+    return path
+
+
+def compare_results(results, baseline_path, threshold):
+    """
+    Compares the results to stored baseline results and prints the
+    benchmarks that got slower than the threshold allows.
+
+    :param results: dict, the run times keyed by benchmark and scale.
+    :param baseline_path: str, the path of the baseline results file.
+    :param threshold: float, the allowed slowdown as a fraction.
+    :return: list, the names and scales of the slowed down benchmarks.
+    """
+
+    with open(baseline_path) as file:
+        baseline_results = json.load(file)['results']
+
+    regressions = []
+    for name, scale_results in results.items():
+        for color_count, elapsed_time in scale_results.items():
+            baseline_time = baseline_results.get(name, {}).get(color_count)
+            if not baseline_time:
+                continue
+
+            change = elapsed_time / baseline_time - 1
+            if change > threshold:
+                regressions.append((name, color_count))
+                print(f'SLOWER {name} at {color_count} colors: '
+                      f'{change * 100:+.1f}%')
+
+    if not regressions:
+        print(f'No slowdowns over {threshold * 100:.0f}% compared to '
+              f'{baseline_path}')
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the color and palette hot paths.')
+    parser.add_argument('names', nargs='*',
+                        help=f'benchmarks to run: {", ".join(BENCHMARKS)}')
+    parser.add_argument('--full', action='store_true',
+                        help='include the scale of millions of colors')
+    parser.add_argument('--repeats', type=positive_int, default=3,
+                        help='runs per benchmark, the fastest is kept')
+    parser.add_argument('--save', nargs='?', const=get_revision(),
+                        metavar='LABEL',
+                        help=f'store the results in {RESULTS_DIR}, labeled '
+                             f'with the commit hash by default')
+    parser.add_argument('--compare', metavar='RESULTS_FILE',
+                        help='flag slowdowns compared to stored results')
+    parser.add_argument('--threshold', type=number_range(float, 0.0),
+                        default=0.1,
+                        help='allowed slowdown as a fraction, default 0.1')
+    args = parser.parse_args()
+
+    # Note! The names aren't passed as choices since argparse compares the
+    # empty list of names to the choices and fails when no names are given
+    unknown_names = [name for name in args.names if name not in BENCHMARKS]
+    if unknown_names:
+        parser.error(f'unknown benchmarks: {", ".join(unknown_names)}')
+
+    if args.compare and not os.path.isfile(args.compare):
+        parser.error(f'results file {args.compare} not found')
+
+    scales = FULL_SCALES if args.full else DEFAULT_SCALES
+    results = run_benchmarks(scales, args.names, args.repeats)
+
+    if args.save:
+        print(f'Saved results to {save_results(results, args.save)}')
+
+    if args.compare:
+        try:
+            regressions = compare_results(results, args.compare,
+                                          args.threshold)
+        except (OSError, ValueError, KeyError) as error:
+            sys.exit(f'Reading {args.compare} ran into trouble: {error}')
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+Separation of RGB colors to CMYK printing inks. The gray component shared by
+the cyan, magenta and yellow inks is replaced by black either across all the
+colors (GCR, gray component replacement) or only in the neutral shadows (UCR,
+under color removal). The total ink coverage is kept within an ink limit by
+reducing the colored inks. Values are percentages 0-100, the ink limit is the
+allowed sum of the four inks.
+"""
+
+import functools
+
+from main import show_error
+from palette import Palette
+
+BLACK_GENERATIONS = ['GCR', 'UCR']
+DEFAULT_BLACK_GENERATION = 'GCR'
+DEFAULT_BLACK_AMOUNT = 100
+DEFAULT_INK_LIMIT = 300
+UCR_START = 0.5
+
+# Note! The conversion table holds every RGB value quantized to 5 bits per
+# channel, 32768 entries. Channel values map to their part of the table index
+# with lookups as well
+TABLE_BITS = 5
+TABLE_LEVELS = 1 << TABLE_BITS
+TABLE_SHIFT = 8 - TABLE_BITS
+RED_INDEXES = tuple((value >> TABLE_SHIFT) << TABLE_BITS * 2
+                    for value in range(256))
+GREEN_INDEXES = tuple((value >> TABLE_SHIFT) << TABLE_BITS
+                      for value in range(256))
+BLUE_INDEXES = tuple(value >> TABLE_SHIFT for value in range(256))
+
+
+def validate_settings(black_generation, black_amount, ink_limit):
+    """
+    Checks the separation settings.
+
+    :param black_generation: str, the black generation, GCR or UCR.
+    :param black_amount: int, the percentage of the gray component replaced
+    with black 0-100.
+    :param ink_limit: int, the allowed total ink coverage 100-400.
+    :return: bool, True if the settings are valid.
+    """
+
+    if black_generation not in BLACK_GENERATIONS:
+        show_error(f'Value {black_generation} is not a valid black '
+                   f'generation!')
+        return False
+
+    if (
+            not isinstance(black_amount, (int, float))
+            or not 0 <= black_amount <= 100
+    ):
+        show_error('Black amount must be a percentage 0-100!')
+        return False
+
+    if not isinstance(ink_limit, (int, float)) or not 100 <= ink_limit <= 400:
+        show_error('Ink limit must be a percentage 100-400!')
+        return False
+
+    return True
+
+
+def separate(rgb_values, black_generation=DEFAULT_BLACK_GENERATION,
+             black_amount=DEFAULT_BLACK_AMOUNT, ink_limit=DEFAULT_INK_LIMIT):
+    """
+    Separates RGB values to CMYK inks with exact arithmetic.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :param black_generation: str, the black generation, GCR or UCR.
+    :param black_amount: int, the percentage of the gray component replaced
+    with black 0-100.
+    :param ink_limit: int, the allowed total ink coverage 100-400.
+    :return: list, the CMYK percentages as (cyan, magenta, yellow, black)
+    tuples of floats.
+    """
+
+    if not validate_settings(black_generation, black_amount, ink_limit):
+        return
+
+    black_fraction = black_amount / 100
+    ink_limit_fraction = ink_limit / 100
+    under_color_removal = black_generation == 'UCR'
+
+    cmyk_values = []
+    for red, green, blue in rgb_values:
+        cyan = 1 - red / 255
+        magenta = 1 - green / 255
+        yellow = 1 - blue / 255
+
+        gray = min(cyan, magenta, yellow)
+        if under_color_removal:
+            black = black_fraction * max(gray - UCR_START, 0) \
+                / (1 - UCR_START)
+        else:
+            black = black_fraction * gray
+
+        cyan -= black
+        magenta -= black
+        yellow -= black
+
+        # Note! Black carries the most density per ink, so the colored inks
+        # give way when the total coverage is over the limit
+        color_ink = cyan + magenta + yellow
+        if color_ink + black > ink_limit_fraction:
+            black = min(black, ink_limit_fraction)
+            scale = (ink_limit_fraction - black) / color_ink
+            cyan *= scale
+            magenta *= scale
+            yellow *= scale
+
+        cmyk_values.append((cyan * 100, magenta * 100, yellow * 100,
+                            black * 100))
+
+    return cmyk_values
+
+
+@functools.lru_cache(maxsize=8)
+def separation_table(black_generation=DEFAULT_BLACK_GENERATION,
+                     black_amount=DEFAULT_BLACK_AMOUNT,
+                     ink_limit=DEFAULT_INK_LIMIT):
+    """
+    Precomputes the separation of every quantized RGB value. The levels are
+    sampled evenly from 0 to 255, so white and black separate exactly.
+
+    :param black_generation: str, the black generation, GCR or UCR.
+    :param black_amount: int, the percentage of the gray component replaced
+    with black 0-100.
+    :param ink_limit: int, the allowed total ink coverage 100-400.
+    :return: tuple, the CMYK percentages as tuples of ints.
+    """
+
+    samples = [level * 255 // (TABLE_LEVELS - 1)
+               for level in range(TABLE_LEVELS)]
+
+    cmyk_values = separate(
+        [(red, green, blue)
+         for red in samples for green in samples for blue in samples],
+        black_generation, black_amount, ink_limit)
+    if cmyk_values is None:
+        return
+
+    return tuple(tuple(round(ink) for ink in cmyk_value)
+                 for cmyk_value in cmyk_values)
+
+
+def rgb_to_cmyk(rgb_values, black_generation=DEFAULT_BLACK_GENERATION,
+                black_amount=DEFAULT_BLACK_AMOUNT,
+                ink_limit=DEFAULT_INK_LIMIT):
+    """
+    Separates RGB values to CMYK inks with lookups from the quantized
+    conversion table. Meant for large palettes and images where the exact
+    separation would be too slow, the inks are within a few percent of it.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :param black_generation: str, the black generation, GCR or UCR.
+    :param black_amount: int, the percentage of the gray component replaced
+    with black 0-100.
+    :param ink_limit: int, the allowed total ink coverage 100-400.
+    :return: list, the CMYK percentages as (cyan, magenta, yellow, black)
+    tuples of ints.
+    """
+
+    if not validate_settings(black_generation, black_amount, ink_limit):
+        return
+
+    table = separation_table(black_generation, black_amount, ink_limit)
+    red_indexes = RED_INDEXES
+    green_indexes = GREEN_INDEXES
+    blue_indexes = BLUE_INDEXES
+
+    return [table[red_indexes[red] | green_indexes[green] | blue_indexes[blue]]
+            for red, green, blue in rgb_values]
+
+
+def separate_palette(palette, black_generation=DEFAULT_BLACK_GENERATION,
+                     black_amount=DEFAULT_BLACK_AMOUNT,
+                     ink_limit=DEFAULT_INK_LIMIT):
+    """
+    Separates the colors in the palette to CMYK inks.
+
+    :param palette: Palette, the palette to separate.
+    :param black_generation: str, the black generation, GCR or UCR.
+    :param black_amount: int, the percentage of the gray component replaced
+    with black 0-100.
+    :param ink_limit: int, the allowed total ink coverage 100-400.
+    :return: list, the CMYK percentages as tuples of ints in palette order.
+    """
+
+    if not isinstance(palette, Palette):
+        show_error('Invalid palette to separate received!')
+        return
+
+    cmyk_values = separate([color.values() for color in palette.values()],
+                           black_generation, black_amount, ink_limit)
+    if cmyk_values is None:
+        return
+
+    return [tuple(round(ink) for ink in cmyk_value)
+            for cmyk_value in cmyk_values]
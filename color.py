@@ -2,6 +2,114 @@ import colorsys
 
 from main import show_error
 
+# Note! Hex codes are encoded and decoded with lookups of every 8-bit value
+HEX_CODES = tuple(f'{value:02X}' for value in range(256))
+HEX_VALUES = {
+    first + second: int(first + second, 16)
+    for first in '0123456789abcdefABCDEF'
+    for second in '0123456789abcdefABCDEF'
+}
+
+
+# Note! The functions below skip validation for bulk operations, callers
+# validate their inputs once before calling them in a loop
+def clamp_rgb(rgb_value):
+    """
+    Clamps a number to the RGB value range 0-255 without validating it.
+
+    :param rgb_value: float, the value to clamp.
+    :return: int, the RGB value in 0-255.
+    """
+
+    if rgb_value < 0:
+        return 0
+    elif rgb_value > 255:
+        return 255
+    else:
+        return round(rgb_value)
+
+
+def clamp_fraction(color_value):
+    """
+    Clamps a number to the fraction range 0.0-1.0 without validating it.
+
+    :param color_value: float, the value to clamp.
+    :return: float, the value in 0.0-1.0.
+    """
+
+    if color_value < 0.0:
+        return 0.0
+    elif color_value > 1.0:
+        return 1.0
+    else:
+        return float(color_value)
+
+
+def tint_rgb(red, green, blue, tint_fraction):
+    """
+    Adds white to RGB values without validating them.
+
+    :param red: int, the amount of red on a scale 0-255.
+    :param green: int, the amount of green on a scale 0-255.
+    :param blue: int, the amount of blue on a scale 0-255.
+    :param tint_fraction: float, the fraction of white to add.
+    :return: tuple, the tinted red, green and blue values.
+    """
+
+    red += (255 - red) * tint_fraction
+    green += (255 - green) * tint_fraction
+    blue += (255 - blue) * tint_fraction
+
+    # Note! Clamped inline, the kernels run once per color of a palette
+    return (0 if red < 0 else 255 if red > 255 else round(red),
+            0 if green < 0 else 255 if green > 255 else round(green),
+            0 if blue < 0 else 255 if blue > 255 else round(blue))
+
+
+def shade_rgb(red, green, blue, shade_fraction):
+    """
+    Adds black to RGB values without validating them.
+
+    :param red: int, the amount of red on a scale 0-255.
+    :param green: int, the amount of green on a scale 0-255.
+    :param blue: int, the amount of blue on a scale 0-255.
+    :param shade_fraction: float, the fraction of black to add.
+    :return: tuple, the shaded red, green and blue values.
+    """
+
+    red *= 1 - shade_fraction
+    green *= 1 - shade_fraction
+    blue *= 1 - shade_fraction
+
+    return (0 if red < 0 else 255 if red > 255 else round(red),
+            0 if green < 0 else 255 if green > 255 else round(green),
+            0 if blue < 0 else 255 if blue > 255 else round(blue))
+
+
+def tone_rgb(red, green, blue, tone_fraction):
+    """
+    Increases the saturation of RGB values without validating them.
+
+    :param red: int, the amount of red on a scale 0-255.
+    :param green: int, the amount of green on a scale 0-255.
+    :param blue: int, the amount of blue on a scale 0-255.
+    :param tone_fraction: float, the fraction of saturation to add.
+    :return: tuple, the toned red, green and blue values.
+    """
+
+    hue, saturation, value = colorsys.rgb_to_hsv(red / 255, green / 255,
+                                                 blue / 255)
+    red, green, blue = colorsys.hsv_to_rgb(
+        hue, clamp_fraction(saturation + saturation * tone_fraction), value)
+
+    red *= 255
+    green *= 255
+    blue *= 255
+
+    return (0 if red < 0 else 255 if red > 255 else round(red),
+            0 if green < 0 else 255 if green > 255 else round(green),
+            0 if blue < 0 else 255 if blue > 255 else round(blue))
+
 
 class Color:
 
@@ -43,7 +151,34 @@ class Color:
         :return: str, the color as hex color code.
         """
 
-        return f'#{self.__red:02x}{self.__green:02x}{self.__blue:02x}'.upper()
+        return '#' + HEX_CODES[self.__red] + HEX_CODES[self.__green] + \
+            HEX_CODES[self.__blue]
+
+    @classmethod
+    def from_hex(cls, hex_code, name=None):
+        """
+        Creates a Color instance from a hex color code. Both the six and the
+        three digit forms are accepted with or without the leading hash.
+
+        :param hex_code: str, the hex color code.
+        :param name: str, the name of the color.
+        :return: Color, the color of the hex code.
+        """
+
+        if not isinstance(hex_code, str):
+            show_error('Invalid hex color code received!')
+            return
+
+        digits = hex_code[1:] if hex_code.startswith('#') else hex_code
+        if len(digits) == 3:
+            digits = digits[0] * 2 + digits[1] * 2 + digits[2] * 2
+
+        rgb_values = [HEX_VALUES.get(digits[idx:idx + 2]) for idx in (0, 2, 4)]
+        if len(digits) != 6 or None in rgb_values:
+            show_error(f'Value {hex_code} is not a valid hex color code!')
+            return
+
+        return cls(*rgb_values, name)
 
     def name(self):
         """
@@ -63,6 +198,52 @@ class Color:
 
         return [self.__red, self.__green, self.__blue]
 
+    def original_values(self):
+        """
+        Separates the original Red, Green and Blue values the color was created
+        with into an array.
+
+        :return: array, the original red, green and blue values in an array.
+        """
+
+        return [self.__original_red, self.__original_green,
+                self.__original_blue]
+
+    def replace_values(self, red, green, blue):
+        """
+        Replaces the current RGB values of the color with values known to be
+        ints in 0-255. The values aren't validated, for bulk updates validated
+        beforehand.
+
+        :param red: int, the amount of red on a scale 0-255.
+        :param green: int, the amount of green on a scale 0-255.
+        :param blue: int, the amount of blue on a scale 0-255.
+        :return: Color, the color with the new values.
+        """
+
+        self.__red = red
+        self.__green = green
+        self.__blue = blue
+
+        return self
+
+    def transform(self, rgb_function, fraction):
+        """
+        Replaces the RGB values of the color with the values calculated by an
+        RGB function like tint_rgb. Nothing is validated, for bulk updates
+        whose amount has been validated beforehand.
+
+        :param rgb_function: function, the function of the RGB values and the
+        fraction returning the new RGB values.
+        :param fraction: float, the fraction to pass to the function.
+        :return: Color, the transformed color.
+        """
+
+        self.__red, self.__green, self.__blue = rgb_function(
+            self.__red, self.__green, self.__blue, fraction)
+
+        return self
+
     def get_minmidmax(self):
         """
         Arranges the RGB integer values into order from low to high.
@@ -109,12 +290,7 @@ class Color:
             show_error('Invalid RGB value to clamp received!')
             return
 
-        if rgb_value < 0:
-            return 0
-        elif rgb_value > 255:
-            return 255
-        else:
-            return round(rgb_value)
+        return clamp_rgb(rgb_value)
 
     def clamp_fraction_value(self, color_value):
         """
@@ -132,12 +308,7 @@ class Color:
             show_error('Invalid fraction value to clamp received!')
             return
 
-        if color_value < 0.0:
-            return 0.0
-        elif color_value > 1.0:
-            return 1.0
-        else:
-            return float(color_value)
+        return clamp_fraction(color_value)
 
     def get_brightness(self):
         """
@@ -167,13 +338,9 @@ class Color:
 
         brightness_change = brightness_amount - self.__original_brightness
 
-        new_red_rgb_value = self.__original_red + brightness_change
-        new_green_rgb_value = self.__original_green + brightness_change
-        new_blue_rgb_value = self.__original_blue + brightness_change
-
-        self.__red = self.clamp_rgb_value(new_red_rgb_value)
-        self.__green = self.clamp_rgb_value(new_green_rgb_value)
-        self.__blue = self.clamp_rgb_value(new_blue_rgb_value)
+        self.__red = clamp_rgb(self.__original_red + brightness_change)
+        self.__green = clamp_rgb(self.__original_green + brightness_change)
+        self.__blue = clamp_rgb(self.__original_blue + brightness_change)
 
     def tint(self, tint_percentage):
         """
@@ -190,14 +357,8 @@ class Color:
             show_error('Invalid tint parameter received!')
             return
 
-        tint_fraction = tint_percentage / 100
-
-        self.__red = self.clamp_rgb_value(self.__red + (255 - self.__red)
-                                          * tint_fraction)
-        self.__green = self.clamp_rgb_value(self.__green + (255 - self.__green)
-                                            * tint_fraction)
-        self.__blue = self.clamp_rgb_value(self.__blue + (255 - self.__blue)
-                                           * tint_fraction)
+        self.__red, self.__green, self.__blue = tint_rgb(
+            self.__red, self.__green, self.__blue, tint_percentage / 100)
 
         return self
 
@@ -216,12 +377,8 @@ class Color:
             show_error('Invalid shade parameter received!')
             return
 
-        shade_fraction = shade_percentage / 100
-
-        self.__red = self.clamp_rgb_value(self.__red * (1 - shade_fraction))
-        self.__green = self.clamp_rgb_value(
-            self.__green * (1 - shade_fraction))
-        self.__blue = self.clamp_rgb_value(self.__blue * (1 - shade_fraction))
+        self.__red, self.__green, self.__blue = shade_rgb(
+            self.__red, self.__green, self.__blue, shade_percentage / 100)
 
         return self
 
@@ -240,30 +397,7 @@ class Color:
             show_error('Invalid tone parameter received!')
             return
 
-        tone_amount = tone_percentage / 100
-
-        red_amount = self.__red / 255
-        green_amount = self.__green / 255
-        blue_amount = self.__blue / 255
-
-        color_hsv = colorsys.rgb_to_hsv(red_amount, green_amount, blue_amount)
-        saturation_amount = self.clamp_fraction_value(
-            color_hsv[1] + (color_hsv[1] * tone_amount))
-
-        toned_color_hsv = (color_hsv[0], saturation_amount, color_hsv[2])
-        toned_rgb_color = colorsys.hsv_to_rgb(
-            toned_color_hsv[0],
-            toned_color_hsv[1],
-            toned_color_hsv[2])
-
-        toned_rgb_values = (
-            self.clamp_rgb_value(toned_rgb_color[0] * 255),
-            self.clamp_rgb_value(toned_rgb_color[1] * 255),
-            self.clamp_rgb_value(toned_rgb_color[2] * 255)
-        )
-
-        self.__red = toned_rgb_values[0]
-        self.__green = toned_rgb_values[1]
-        self.__blue = toned_rgb_values[2]
+        self.__red, self.__green, self.__blue = tone_rgb(
+            self.__red, self.__green, self.__blue, tone_percentage / 100)
 
         return self
@@ -0,0 +1,287 @@
+"""
+Deduplication and clustering of large color collections. Colors are streamed
+a chunk at a time and collapsed into representatives within a perceptual
+distance in OKLab, found through a grid hash of the OKLab space. The
+representatives are then clustered to a target number of colors with a
+weighted k-means, keeping the member count of every cluster.
+"""
+
+import argparse
+import collections
+import math
+import random
+
+from argument_types import positive_float, positive_int
+from color import HEX_CODES, Color
+from color_import import read_color_chunks
+from color_space import oklab_to_oklch, rgb_to_oklab
+from main import show_error
+from palette import Palette
+
+DEFAULT_THRESHOLD = 0.02
+DEFAULT_CLUSTER_COUNT = 12
+KMEANS_ITERATIONS = 20
+
+# Note! Known RGB values skip the OKLab conversion and the grid search, the
+# cache is cleared when full to keep memory bounded
+RGB_CACHE_LIMIT = 1 << 20
+
+
+def grid_cell(oklab_value, threshold):
+    """
+    Finds the grid cell of an OKLab value. Cells are as wide as the threshold
+    so values within it are in the same or adjacent cells.
+
+    :param oklab_value: tuple, the OKLab value.
+    :param threshold: float, the width of the cells.
+    :return: tuple, the cell coordinates.
+    """
+
+    lightness, green_red, blue_yellow = oklab_value
+
+    return (math.floor(lightness / threshold),
+            math.floor(green_red / threshold),
+            math.floor(blue_yellow / threshold))
+
+
+def deduplicate(rgb_chunks, threshold=DEFAULT_THRESHOLD):
+    """
+    Collapses streamed colors into representatives. A color joins the first
+    representative within the threshold or becomes a new one, so memory grows
+    with the number of distinct looking colors instead of the input size.
+    A threshold that isn't greater than zero raises ValueError.
+
+    :param rgb_chunks: iterable, chunks of packed RGB bytes.
+    :param threshold: float, the OKLab distance within which colors are
+    duplicates.
+    :return: list, the representatives as lists of the RGB value, the OKLab
+    value and the member count, in order of appearance.
+    """
+
+    if not threshold > 0.0:
+        raise ValueError('Duplicate threshold must be greater than 0.0!')
+
+    representatives = []
+    grid = collections.defaultdict(list)
+    rgb_cache = {}
+    neighbor_offsets = [(lightness, green_red, blue_yellow)
+                        for lightness in (-1, 0, 1)
+                        for green_red in (-1, 0, 1)
+                        for blue_yellow in (-1, 0, 1)]
+
+    for rgb_bytes in rgb_chunks:
+        rgb_iterator = iter(rgb_bytes)
+        rgb_counts = collections.Counter(zip(rgb_iterator, rgb_iterator,
+                                             rgb_iterator))
+
+        new_rgb_values = [rgb_value for rgb_value in rgb_counts
+                          if rgb_value not in rgb_cache]
+        if len(rgb_cache) + len(new_rgb_values) > RGB_CACHE_LIMIT:
+            rgb_cache.clear()
+            new_rgb_values = list(rgb_counts)
+
+        for rgb_value, oklab_value in zip(new_rgb_values,
+                                          rgb_to_oklab(new_rgb_values)):
+            cell_lightness, cell_green_red, cell_blue_yellow = grid_cell(
+                oklab_value, threshold)
+
+            representative_idx = None
+            for offset_lightness, offset_green_red, offset_blue_yellow \
+                    in neighbor_offsets:
+                for idx in grid.get((cell_lightness + offset_lightness,
+                                     cell_green_red + offset_green_red,
+                                     cell_blue_yellow + offset_blue_yellow),
+                                    ()):
+                    if math.dist(representatives[idx][1],
+                                 oklab_value) <= threshold:
+                        representative_idx = idx
+                        break
+
+                if representative_idx is not None:
+                    break
+
+            if representative_idx is None:
+                representative_idx = len(representatives)
+                representatives.append([rgb_value, oklab_value, 0])
+                grid[(cell_lightness, cell_green_red,
+                      cell_blue_yellow)].append(representative_idx)
+
+            rgb_cache[rgb_value] = representative_idx
+
+        for rgb_value, count in rgb_counts.items():
+            representatives[rgb_cache[rgb_value]][2] += count
+
+    return representatives
+
+
+def cluster(representatives, cluster_count=DEFAULT_CLUSTER_COUNT, seed=0):
+    """
+    Clusters the representatives with k-means weighted by their member
+    counts. The clusters are seeded with weighted k-means++ and each cluster
+    is shown by the representative closest to its center.
+
+    :param representatives: list, the representatives from deduplicate.
+    :param cluster_count: int, the number of clusters.
+    :param seed: int, the seed of the initial cluster centers.
+    :return: list, the clusters as lists of the RGB value, the OKLab value and
+    the member count, most members first.
+    """
+
+    if len(representatives) <= cluster_count:
+        return sorted(representatives, key=lambda member: -member[2])
+
+    rng = random.Random(seed)
+    oklab_values = [oklab_value for _, oklab_value, _ in representatives]
+    weights = [count for _, _, count in representatives]
+
+    centers = [rng.choices(oklab_values, weights)[0]]
+    closest_distances = [math.dist(value, centers[0]) ** 2
+                         for value in oklab_values]
+    while len(centers) < cluster_count:
+        center = rng.choices(oklab_values, [
+            weight * distance for weight, distance
+            in zip(weights, closest_distances)
+        ])[0]
+        centers.append(center)
+        closest_distances = [min(distance, math.dist(value, center) ** 2)
+                             for value, distance
+                             in zip(oklab_values, closest_distances)]
+
+    assignments = None
+    for _ in range(KMEANS_ITERATIONS):
+        new_assignments = [
+            min(range(cluster_count),
+                key=lambda idx: math.dist(value, centers[idx]))
+            for value in oklab_values
+        ]
+        if new_assignments == assignments:
+            break
+        assignments = new_assignments
+
+        sums = [[0.0, 0.0, 0.0, 0] for _ in range(cluster_count)]
+        for (lightness, green_red, blue_yellow), weight, idx in zip(
+                oklab_values, weights, assignments):
+            cluster_sum = sums[idx]
+            cluster_sum[0] += lightness * weight
+            cluster_sum[1] += green_red * weight
+            cluster_sum[2] += blue_yellow * weight
+            cluster_sum[3] += weight
+
+        centers = [
+            (lightness / weight, green_red / weight, blue_yellow / weight)
+            if weight else center
+            for (lightness, green_red, blue_yellow, weight), center
+            in zip(sums, centers)
+        ]
+
+    clusters = []
+    for idx, center in enumerate(centers):
+        members = [member for member, assignment
+                   in zip(representatives, assignments) if assignment == idx]
+        if not members:
+            continue
+
+        closest_member = min(members,
+                             key=lambda member: math.dist(member[1], center))
+        clusters.append([closest_member[0], closest_member[1],
+                         sum(member[2] for member in members)])
+
+    return sorted(clusters, key=lambda member: -member[2])
+
+
+def clusters_to_colors(clusters):
+    """
+    Creates colors of the clusters named after their hex code.
+
+    :param clusters: list, the clusters from cluster.
+    :return: list, the colors and their member counts as tuples.
+    """
+
+    return [
+        (Color(red, green, blue, '#' + HEX_CODES[red] + HEX_CODES[green]
+               + HEX_CODES[blue]), count)
+        for (red, green, blue), _, count in clusters
+    ]
+
+
+def clusters_to_palette(clusters, color_wheel='RGB'):
+    """
+    Creates a palette of twelve clusters ordered by hue like a color wheel
+    starting from the cluster with the most members.
+
+    :param clusters: list, the twelve clusters from cluster.
+    :param color_wheel: str, the color wheel key of the palette.
+    :return: Palette, the palette of the clusters.
+    """
+
+    if len(clusters) != DEFAULT_CLUSTER_COUNT:
+        show_error('A palette needs exactly 12 clusters!')
+        return
+
+    hues = [hue for _, _, hue in
+            oklab_to_oklch([oklab_value for _, oklab_value, _ in clusters])]
+    root_hue = hues[0]
+    ordered_clusters = [
+        member for _, member in
+        sorted(zip(hues, clusters),
+               key=lambda item: (item[0] - root_hue) % (2 * math.pi))
+    ]
+
+    colors = [color for color, _ in clusters_to_colors(ordered_clusters)]
+
+    return Palette(color_wheel, colors)
+
+
+def cluster_file(path, cluster_count=DEFAULT_CLUSTER_COUNT,
+                 threshold=DEFAULT_THRESHOLD, seed=0):
+    """
+    Deduplicates and clusters the colors of a CSV or text file streamed a
+    chunk at a time.
+
+    :param path: str, the path of the file.
+    :param cluster_count: int, the number of clusters.
+    :param threshold: float, the OKLab distance within which colors are
+    duplicates.
+    :param seed: int, the seed of the initial cluster centers.
+    :return: tuple, the clusters, the number of representatives after
+    deduplication and the invalid rows.
+    """
+
+    errors = []
+
+    def rgb_chunks():
+        for rgb_bytes, _, chunk_errors in read_color_chunks(path):
+            errors.extend(chunk_errors)
+            yield rgb_bytes
+
+    representatives = deduplicate(rgb_chunks(), threshold)
+
+    return (cluster(representatives, cluster_count, seed),
+            len(representatives), errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Collapse near-duplicate colors of a CSV or text file '
+                    'and cluster them to a target number of colors.')
+    parser.add_argument('path', help='file of hex codes or rgb() values')
+    parser.add_argument('--clusters', type=positive_int,
+                        default=DEFAULT_CLUSTER_COUNT)
+    parser.add_argument('--threshold', type=positive_float,
+                        default=DEFAULT_THRESHOLD,
+                        help='OKLab distance within which colors are '
+                             'duplicates')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    clusters, representative_count, errors = cluster_file(
+        args.path, args.clusters, args.threshold, args.seed)
+
+    print(f'{representative_count} distinct colors, '
+          f'{len(errors)} invalid rows')
+    for color, count in clusters_to_colors(clusters):
+        print(f'{color.hex()} {count}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+Bulk import of colors from CSV and text files or streams. Every row holds a
+hex color code (#RRGGBB, RRGGBB or #RGB) or an rgb() value, optionally with a
+name in another column. Rows are decoded a chunk at a time into packed RGB
+bytes, invalid rows are reported without stopping the import.
+"""
+
+import re
+
+from color import HEX_CODES, Color
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Note! Translating a row with the hex digits deleted leaves nothing of a
+# valid hex code, so plain hex code rows are validated in a single call
+HEX_DIGITS = b'0123456789abcdefABCDEF'
+SEPARATORS = b' \t,;"\''
+RGB_PATTERN = re.compile(
+    rb'rgba?\(\s*(\d{1,3})\s*,\s*(\d{1,3})\s*,\s*(\d{1,3})\s*'
+    rb'(?:,\s*[\d.]+%?\s*)?\)', re.IGNORECASE)
+HEX_PATTERN = re.compile(
+    rb'(?<![\w#])(?:#([0-9A-Fa-f]{6}|[0-9A-Fa-f]{3})|([0-9A-Fa-f]{6}))\b')
+
+
+def parse_row(row):
+    """
+    Parses a row that isn't a plain hex code, like a CSV row with a name
+    column or an rgb() value.
+
+    :param row: bytes, the row stripped of surrounding whitespace.
+    :return: tuple, the hex digits and name of the color, or None and an error
+    message for invalid rows.
+    """
+
+    match = RGB_PATTERN.search(row)
+    if match:
+        rgb_values = [int(value) for value in match.groups()]
+        if max(rgb_values) > 255:
+            return None, 'RGB values must be 0-255'
+
+        digits = '%02x%02x%02x' % tuple(rgb_values)
+    else:
+        match = HEX_PATTERN.search(row)
+        if not match:
+            return None, 'No hex code or rgb() value found'
+
+        digits = (match.group(1) or match.group(2)).decode('ascii')
+        if len(digits) == 3:
+            digits = digits[0] * 2 + digits[1] * 2 + digits[2] * 2
+
+    name = (row[:match.start()] + b' ' + row[match.end():]).strip(
+        SEPARATORS).decode('utf-8', 'replace')
+
+    return digits, name or None
+
+
+def decode_rows(rows, first_line_number):
+    """
+    Decodes rows into packed RGB bytes. Plain hex code rows are validated with
+    a byte translation and every row of the chunk is decoded with a single
+    call.
+
+    :param rows: list, the rows as bytes.
+    :param first_line_number: int, the line number of the first row.
+    :return: tuple, the packed RGB bytes, names and errors of the rows.
+    """
+
+    digits = []
+    names = []
+    errors = []
+
+    for line_number, row in enumerate(rows, first_line_number):
+        row = row.strip()
+        if not row:
+            continue
+
+        hex_digits = row[1:] if row[:1] == b'#' else row
+        if (
+                len(hex_digits) == 6
+                and not hex_digits.translate(None, HEX_DIGITS)
+        ):
+            digits.append(hex_digits.decode('ascii'))
+            names.append(None)
+            continue
+
+        row_digits, name_or_error = parse_row(row)
+        if row_digits is None:
+            errors.append((line_number, row.decode('utf-8', 'replace'),
+                           name_or_error))
+            continue
+
+        digits.append(row_digits)
+        names.append(name_or_error)
+
+    return bytes.fromhex(''.join(digits)), names, errors
+
+
+def read_color_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Reads colors from a file or stream a chunk at a time so inputs of any
+    size are imported in constant memory.
+
+    :param source: str or file, the path of the file or a binary or text
+    stream.
+    :param chunk_size: int, the number of bytes to read at a time.
+    :return: generator, the packed RGB bytes, names and errors of each chunk
+    as tuples. Errors are tuples of the line number, the row and a message.
+    """
+
+    if isinstance(source, str):
+        with open(source, 'rb') as stream:
+            yield from read_color_chunks(stream, chunk_size)
+        return
+
+    remainder = b''
+    line_number = 1
+    while True:
+        data = source.read(chunk_size)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        if not data:
+            break
+
+        rows = (remainder + data).split(b'\n')
+        remainder = rows.pop()
+
+        yield decode_rows(rows, line_number)
+        line_number += len(rows)
+
+    if remainder:
+        yield decode_rows([remainder], line_number)
+
+
+def read_colors(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Reads all the colors from a file or stream.
+
+    :param source: str or file, the path of the file or a binary or text
+    stream.
+    :param chunk_size: int, the number of bytes to read at a time.
+    :return: dict, the packed RGB bytes of the colors, their names and the
+    errors of invalid rows.
+    """
+
+    rgb_bytes = bytearray()
+    names = []
+    errors = []
+
+    for chunk_rgb_bytes, chunk_names, chunk_errors in read_color_chunks(
+            source, chunk_size):
+        rgb_bytes += chunk_rgb_bytes
+        names.extend(chunk_names)
+        errors.extend(chunk_errors)
+
+    return {
+        'rgb': rgb_bytes,
+        'names': names,
+        'errors': errors
+    }
+
+
+def create_colors(rgb_bytes, names=None):
+    """
+    Creates Color instances from packed RGB bytes. Unnamed colors are named
+    after their hex code.
+
+    :param rgb_bytes: bytes, the packed RGB values.
+    :param names: list, the names of the colors or None.
+    :return: list, the colors.
+    """
+
+    if names is None:
+        names = [None] * (len(rgb_bytes) // 3)
+
+    colors = []
+    for idx, name in enumerate(names):
+        red, green, blue = rgb_bytes[idx * 3:idx * 3 + 3]
+        colors.append(Color(red, green, blue, name or '#' + HEX_CODES[red]
+                            + HEX_CODES[green] + HEX_CODES[blue]))
+
+    return colors
@@ -0,0 +1,140 @@
+"""
+Display orders of large color collections by hue, lightness or along a
+Hilbert curve through the RGB cube. Sort keys are calculated in batches for
+the distinct colors only and the orders are cached per collection, so
+switching back and forth between orders is a lookup.
+"""
+
+from array import array
+import functools
+
+from color_space import oklab_to_oklch, rgb_to_oklab
+
+ORDERS = ['ORIGINAL', 'HUE', 'LIGHTNESS', 'HILBERT']
+
+# Note! Colors with less chroma are ordered as grays by lightness after the
+# hues
+GRAY_CHROMA = 0.02
+HILBERT_BITS = 5
+
+
+def hilbert_index(red, green, blue, bits=HILBERT_BITS):
+    """
+    Calculates the position of a point of the RGB cube along a Hilbert curve
+    with Skilling's transpose algorithm. Consecutive positions are adjacent
+    points, so colors close on the curve are close in RGB.
+    https://doi.org/10.1063/1.1751381
+
+    :param red: int, the red coordinate on a scale 0 to 2^bits - 1.
+    :param green: int, the green coordinate on a scale 0 to 2^bits - 1.
+    :param blue: int, the blue coordinate on a scale 0 to 2^bits - 1.
+    :param bits: int, the number of bits per coordinate.
+    :return: int, the position along the curve.
+    """
+
+    coordinates = [red, green, blue]
+    highest_bit = 1 << (bits - 1)
+
+    bit = highest_bit
+    while bit > 1:
+        lower_bits = bit - 1
+        for idx in range(3):
+            if coordinates[idx] & bit:
+                coordinates[0] ^= lower_bits
+            else:
+                swapped_bits = (coordinates[0] ^ coordinates[idx]) \
+                    & lower_bits
+                coordinates[0] ^= swapped_bits
+                coordinates[idx] ^= swapped_bits
+        bit >>= 1
+
+    coordinates[1] ^= coordinates[0]
+    coordinates[2] ^= coordinates[1]
+
+    gray_bits = 0
+    bit = highest_bit
+    while bit > 1:
+        if coordinates[2] & bit:
+            gray_bits ^= bit - 1
+        bit >>= 1
+
+    index = 0
+    for bit_idx in range(bits - 1, -1, -1):
+        for coordinate in coordinates:
+            index = (index << 1) | (((coordinate ^ gray_bits) >> bit_idx) & 1)
+
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def hilbert_table(bits=HILBERT_BITS):
+    """
+    Builds a table of the Hilbert curve positions of the RGB cube quantized
+    to the number of bits per channel.
+
+    :param bits: int, the number of bits per channel.
+    :return: array, the positions indexed by the packed quantized RGB value.
+    """
+
+    size = 1 << bits
+
+    return array('I', (hilbert_index(red, green, blue, bits)
+                       for red in range(size)
+                       for green in range(size)
+                       for blue in range(size)))
+
+
+def sort_keys(rgb_values, order):
+    """
+    Calculates the sort keys of distinct RGB values in a batch.
+
+    :param rgb_values: list, the distinct RGB values as tuples.
+    :param order: str, the order, HUE, LIGHTNESS or HILBERT.
+    :return: list, the sort keys of the RGB values.
+    """
+
+    if order == 'HILBERT':
+        table = hilbert_table()
+        shift = 8 - HILBERT_BITS
+
+        return [table[(((red >> shift) << HILBERT_BITS | green >> shift)
+                       << HILBERT_BITS) | blue >> shift]
+                for red, green, blue in rgb_values]
+
+    oklab_values = rgb_to_oklab(rgb_values)
+    if order == 'LIGHTNESS':
+        return [lightness for lightness, _, _ in oklab_values]
+
+    return [(0, hue, lightness) if chroma >= GRAY_CHROMA
+            else (1, 0.0, lightness)
+            for lightness, chroma, hue in oklab_to_oklch(oklab_values)]
+
+
+@functools.lru_cache(maxsize=16)
+def color_order(rgb_bytes, order):
+    """
+    Orders a color collection for display. The order is cached per collection
+    and shouldn't be modified.
+
+    :param rgb_bytes: bytes, the packed RGB values of the collection.
+    :param order: str, the order, one of ORIGINAL, HUE, LIGHTNESS or HILBERT.
+    :return: array, the indexes of the colors in display order or None for an
+    invalid order.
+    """
+
+    if order not in ORDERS:
+        return None
+
+    color_count = len(rgb_bytes) // 3
+    if order == 'ORIGINAL':
+        return array('I', range(color_count))
+
+    rgb_iterator = iter(rgb_bytes)
+    rgb_values = list(zip(rgb_iterator, rgb_iterator, rgb_iterator))
+
+    distinct_values = list(dict.fromkeys(rgb_values))
+    keys = dict(zip(distinct_values, sort_keys(distinct_values, order)))
+    color_keys = [keys[rgb_value] for rgb_value in rgb_values]
+
+    return array('I', sorted(range(color_count),
+                             key=color_keys.__getitem__))
@@ -0,0 +1,255 @@
+"""
+Batch conversions between sRGB, linear RGB, CIE XYZ and CIELAB and the
+perceptual OKLab and OKLCh color spaces. The functions take and return lists
+of value tuples so whole palettes are converted in one call. RGB values are
+ints on a scale 0-255, linear RGB values floats on a scale 0.0-1.0.
+https://bottosson.github.io/posts/oklab/
+"""
+
+import math
+
+# Note! Decoding 8-bit sRGB values is a lookup as there are only 256 of them
+SRGB_TO_LINEAR = tuple(
+    value / 255 / 12.92 if value / 255 <= 0.04045
+    else ((value / 255 + 0.055) / 1.055) ** 2.4
+    for value in range(256)
+)
+
+
+def cube_root(value):
+    """
+    Calculates the real cube root keeping the sign of negative values.
+
+    :param value: float, the value.
+    :return: float, the cube root of the value.
+    """
+
+    return math.copysign(abs(value) ** (1 / 3), value)
+
+
+def linear_to_srgb_value(linear_value):
+    """
+    Encodes a linear RGB channel value to an sRGB value.
+
+    :param linear_value: float, the linear value on a scale 0.0-1.0.
+    :return: int, the sRGB value clamped to 0-255.
+    """
+
+    if linear_value <= 0.0031308:
+        srgb_value = 12.92 * linear_value
+    else:
+        srgb_value = 1.055 * linear_value ** (1 / 2.4) - 0.055
+
+    return min(max(round(srgb_value * 255), 0), 255)
+
+
+def rgb_to_linear(rgb_values):
+    """
+    Decodes sRGB values to linear RGB.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :return: list, the linear RGB values as tuples.
+    """
+
+    table = SRGB_TO_LINEAR
+
+    return [(table[red], table[green], table[blue])
+            for red, green, blue in rgb_values]
+
+
+def linear_to_rgb(linear_values):
+    """
+    Encodes linear RGB values to sRGB. Values out of gamut get clamped.
+
+    :param linear_values: list, the linear RGB values as tuples.
+    :return: list, the RGB values as (red, green, blue) tuples.
+    """
+
+    encode = linear_to_srgb_value
+
+    return [(encode(red), encode(green), encode(blue))
+            for red, green, blue in linear_values]
+
+
+def linear_to_oklab(linear_values):
+    """
+    Converts linear RGB values to OKLab.
+
+    :param linear_values: list, the linear RGB values as tuples.
+    :return: list, the OKLab values as (L, a, b) tuples.
+    """
+
+    oklab_values = []
+    for red, green, blue in linear_values:
+        long_cone = cube_root(
+            0.4122214708 * red + 0.5363325363 * green + 0.0514459929 * blue)
+        medium_cone = cube_root(
+            0.2119034982 * red + 0.6806995451 * green + 0.1073969566 * blue)
+        short_cone = cube_root(
+            0.0883024619 * red + 0.2817188376 * green + 0.6299787005 * blue)
+
+        oklab_values.append((
+            0.2104542553 * long_cone + 0.7936177850 * medium_cone
+            - 0.0040720468 * short_cone,
+            1.9779984951 * long_cone - 2.4285922050 * medium_cone
+            + 0.4505937099 * short_cone,
+            0.0259040371 * long_cone + 0.7827717662 * medium_cone
+            - 0.8086757660 * short_cone
+        ))
+
+    return oklab_values
+
+
+def oklab_to_linear(oklab_values):
+    """
+    Converts OKLab values to linear RGB. Values out of the sRGB gamut are
+    returned unclamped.
+
+    :param oklab_values: list, the OKLab values as (L, a, b) tuples.
+    :return: list, the linear RGB values as tuples.
+    """
+
+    linear_values = []
+    for lightness, green_red, blue_yellow in oklab_values:
+        long_cone = (lightness + 0.3963377774 * green_red
+                     + 0.2158037573 * blue_yellow) ** 3
+        medium_cone = (lightness - 0.1055613458 * green_red
+                       - 0.0638541728 * blue_yellow) ** 3
+        short_cone = (lightness - 0.0894841775 * green_red
+                      - 1.2914855480 * blue_yellow) ** 3
+
+        linear_values.append((
+            4.0767416621 * long_cone - 3.3077115913 * medium_cone
+            + 0.2309699292 * short_cone,
+            -1.2684380046 * long_cone + 2.6097574011 * medium_cone
+            - 0.3413193965 * short_cone,
+            -0.0041960863 * long_cone - 0.7034186147 * medium_cone
+            + 1.7076147010 * short_cone
+        ))
+
+    return linear_values
+
+
+def rgb_to_oklab(rgb_values):
+    """
+    Converts sRGB values to OKLab.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :return: list, the OKLab values as (L, a, b) tuples.
+    """
+
+    return linear_to_oklab(rgb_to_linear(rgb_values))
+
+
+def oklab_to_rgb(oklab_values):
+    """
+    Converts OKLab values to sRGB. Values out of gamut get clamped.
+
+    :param oklab_values: list, the OKLab values as (L, a, b) tuples.
+    :return: list, the RGB values as (red, green, blue) tuples.
+    """
+
+    return linear_to_rgb(oklab_to_linear(oklab_values))
+
+
+def oklab_to_oklch(oklab_values):
+    """
+    Converts OKLab values to the polar OKLCh form.
+
+    :param oklab_values: list, the OKLab values as (L, a, b) tuples.
+    :return: list, the OKLCh values as (L, chroma, hue radians) tuples.
+    """
+
+    return [(lightness, math.hypot(green_red, blue_yellow),
+             math.atan2(blue_yellow, green_red))
+            for lightness, green_red, blue_yellow in oklab_values]
+
+
+def oklch_to_oklab(oklch_values):
+    """
+    Converts OKLCh values to OKLab.
+
+    :param oklch_values: list, the OKLCh values as (L, chroma, hue radians)
+    tuples.
+    :return: list, the OKLab values as (L, a, b) tuples.
+    """
+
+    return [(lightness, chroma * math.cos(hue), chroma * math.sin(hue))
+            for lightness, chroma, hue in oklch_values]
+
+
+# Note! CIELAB values are relative to the D65 white point of sRGB
+D65_WHITE = (0.95047, 1.0, 1.08883)
+LAB_EPSILON = 216 / 24389
+LAB_KAPPA = 24389 / 27
+
+
+def linear_to_xyz(linear_values):
+    """
+    Converts linear RGB values to CIE XYZ.
+
+    :param linear_values: list, the linear RGB values as tuples.
+    :return: list, the XYZ values as tuples with white having Y 1.0.
+    """
+
+    return [(0.4124564 * red + 0.3575761 * green + 0.1804375 * blue,
+             0.2126729 * red + 0.7151522 * green + 0.0721750 * blue,
+             0.0193339 * red + 0.1191920 * green + 0.9503041 * blue)
+            for red, green, blue in linear_values]
+
+
+def xyz_to_lab(xyz_values):
+    """
+    Converts CIE XYZ values to CIELAB.
+
+    :param xyz_values: list, the XYZ values as tuples.
+    :return: list, the CIELAB values as (L, a, b) tuples with L 0.0-100.0.
+    """
+
+    white_x, white_y, white_z = D65_WHITE
+
+    def compress(value):
+        if value > LAB_EPSILON:
+            return value ** (1 / 3)
+
+        return (LAB_KAPPA * value + 16) / 116
+
+    lab_values = []
+    for x, y, z in xyz_values:
+        compressed_x = compress(x / white_x)
+        compressed_y = compress(y / white_y)
+        compressed_z = compress(z / white_z)
+
+        lab_values.append((116 * compressed_y - 16,
+                           500 * (compressed_x - compressed_y),
+                           200 * (compressed_y - compressed_z)))
+
+    return lab_values
+
+
+def rgb_to_lab(rgb_values):
+    """
+    Converts sRGB values to CIELAB.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :return: list, the CIELAB values as (L, a, b) tuples.
+    """
+
+    return xyz_to_lab(linear_to_xyz(rgb_to_linear(rgb_values)))
+
+
+def is_in_gamut(linear_value, tolerance=0.0001):
+    """
+    Tells whether a linear RGB value fits in the sRGB gamut.
+
+    :param linear_value: tuple, the linear RGB value.
+    :param tolerance: float, the allowed overshoot of each channel.
+    :return: bool, True if the value is in gamut.
+    """
+
+    red, green, blue = linear_value
+    lowest = -tolerance
+    highest = 1 + tolerance
+
+    return (lowest <= red <= highest and lowest <= green <= highest
+            and lowest <= blue <= highest)
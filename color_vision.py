@@ -0,0 +1,242 @@
+"""
+Color vision deficiency simulation for screening palettes. Colors are
+transformed in linear RGB with the Machado, Oliveira and Fernandes (2009)
+matrices for full protanopia, deuteranopia and tritanopia. Lower severities
+are interpolated towards normal vision.
+https://www.inf.ufrgs.br/~oliveira/pubs_files/CVD_Simulation/CVD_Simulation.html
+"""
+
+import argparse
+import functools
+import itertools
+import math
+
+from color import Color
+from color_space import SRGB_TO_LINEAR, rgb_to_oklab
+from main import show_error
+from palette import COLOR_SCHEMES, Palette
+
+DEFICIENCY_MATRICES = {
+    'protan': (
+        (0.152286, 1.052583, -0.204868),
+        (0.114503, 0.786281, 0.099216),
+        (-0.003882, -0.048116, 1.051998)
+    ),
+    'deutan': (
+        (0.367322, 0.860646, -0.227968),
+        (0.280085, 0.672501, 0.047413),
+        (-0.011820, 0.042940, 0.968881)
+    ),
+    'tritan': (
+        (1.255528, -0.076749, -0.178779),
+        (-0.078411, 0.930809, 0.147602),
+        (0.004733, 0.691367, 0.303900)
+    )
+}
+DEFICIENCIES = list(DEFICIENCY_MATRICES.keys())
+
+# Note! Encoding back to sRGB is a lookup from linear values quantized finely
+# enough to stay within one 8-bit step
+LINEAR_TO_SRGB_TABLE_SIZE = 8192
+LINEAR_TO_SRGB = tuple(
+    min(max(round((12.92 * linear_value if linear_value <= 0.0031308
+                   else 1.055 * linear_value ** (1 / 2.4) - 0.055) * 255),
+            0), 255)
+    for linear_value in (idx / (LINEAR_TO_SRGB_TABLE_SIZE - 1)
+                         for idx in range(LINEAR_TO_SRGB_TABLE_SIZE))
+)
+
+
+@functools.lru_cache(maxsize=32)
+def deficiency_tables(deficiency, severity=1.0):
+    """
+    Precomputes the contribution of every 8-bit input channel value to every
+    linear output channel, so simulating a color only takes lookups and sums.
+
+    :param deficiency: str, the deficiency, one of protan, deutan or tritan.
+    :param severity: float, the severity of the deficiency 0.0-1.0.
+    :return: tuple, nine tables of 256 values ordered by output and input
+    channel.
+    """
+
+    matrix = DEFICIENCY_MATRICES[deficiency]
+
+    tables = []
+    for output_channel in range(3):
+        for input_channel in range(3):
+            identity = 1.0 if output_channel == input_channel else 0.0
+            coefficient = identity + severity * (
+                matrix[output_channel][input_channel] - identity)
+            tables.append(tuple(coefficient * linear_value
+                                for linear_value in SRGB_TO_LINEAR))
+
+    return tuple(tables)
+
+
+def simulate_rgb(rgb_values, deficiency, severity=1.0):
+    """
+    Simulates how the colors look with a color vision deficiency.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :param deficiency: str, the deficiency, one of protan, deutan or tritan.
+    :param severity: float, the severity of the deficiency 0.0-1.0.
+    :return: list, the simulated RGB values as tuples.
+    """
+
+    if deficiency not in DEFICIENCY_MATRICES:
+        show_error(f'Value {deficiency} is not a valid color vision '
+                   f'deficiency!')
+        return
+
+    (red_red, red_green, red_blue,
+     green_red, green_green, green_blue,
+     blue_red, blue_green, blue_blue) = deficiency_tables(deficiency,
+                                                          float(severity))
+    encode = LINEAR_TO_SRGB
+    scale = LINEAR_TO_SRGB_TABLE_SIZE - 1
+
+    def quantize(linear_value):
+        return min(max(int(linear_value * scale + 0.5), 0), scale)
+
+    return [
+        (encode[quantize(red_red[red] + red_green[green] + red_blue[blue])],
+         encode[quantize(green_red[red] + green_green[green]
+                         + green_blue[blue])],
+         encode[quantize(blue_red[red] + blue_green[green]
+                         + blue_blue[blue])])
+        for red, green, blue in rgb_values
+    ]
+
+
+def simulate_palette(palette, deficiency, severity=1.0):
+    """
+    Creates a copy of the palette with the colors simulated for a color
+    vision deficiency. The color scheme and picked color are kept.
+
+    :param palette: Palette, the palette to simulate.
+    :param deficiency: str, the deficiency, one of protan, deutan or tritan.
+    :param severity: float, the severity of the deficiency 0.0-1.0.
+    :return: Palette, the simulated palette.
+    """
+
+    if not isinstance(palette, Palette):
+        show_error('Invalid palette to simulate received!')
+        return
+
+    colors = palette.values()
+    simulated_values = simulate_rgb([color.values() for color in colors],
+                                    deficiency, severity)
+    if simulated_values is None:
+        return
+
+    simulated_colors = [Color(*rgb_value, color.name())
+                        for color, rgb_value in zip(colors,
+                                                    simulated_values)]
+
+    simulated_palette = Palette(palette.get_color_wheel(), simulated_colors)
+    simulated_palette.set_color_scheme(palette.get_color_scheme())
+    simulated_palette.set_picked_color(simulated_colors[
+        colors.index(palette.get_picked_color())])
+
+    return simulated_palette
+
+
+def minimum_distance(rgb_values):
+    """
+    Finds the smallest perceptual distance between any two of the colors as
+    the Euclidean distance in OKLab.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :return: float, the smallest distance or infinity for less than two
+    colors.
+    """
+
+    oklab_values = rgb_to_oklab(rgb_values)
+
+    return min((math.dist(first, second) for first, second in
+                itertools.combinations(oklab_values, 2)), default=math.inf)
+
+
+def screen_colors(rgb_values, severity=1.0):
+    """
+    Reports how distinguishable the colors stay for every color vision
+    deficiency.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :param severity: float, the severity of the deficiencies 0.0-1.0.
+    :return: dict, the smallest distance between the colors keyed by normal
+    and each deficiency.
+    """
+
+    rgb_values = [tuple(rgb_value) for rgb_value in rgb_values]
+
+    distances = {'normal': minimum_distance(rgb_values)}
+    for deficiency in DEFICIENCIES:
+        distances[deficiency] = minimum_distance(
+            simulate_rgb(rgb_values, deficiency, severity))
+
+    return distances
+
+
+def screen_palette(palette, severity=1.0):
+    """
+    Reports how distinguishable the colors in the palette's color scheme stay
+    for every color vision deficiency.
+
+    :param palette: Palette, the palette to screen.
+    :param severity: float, the severity of the deficiencies 0.0-1.0.
+    :return: dict, the smallest distance between the scheme colors keyed by
+    normal and each deficiency.
+    """
+
+    if not isinstance(palette, Palette):
+        show_error('Invalid palette to screen received!')
+        return
+
+    return screen_colors([color.values()
+                          for color in palette.get_scheme_colors()],
+                         severity)
+
+
+def main():
+    from argument_types import number_range
+    from palette_snapshot import (COLOR_WHEEL_KEYS, DEFAULT_VARIANT_AMOUNTS,
+                                  build_snapshot, create_variant_palette)
+
+    parser = argparse.ArgumentParser(
+        description='Screen the color schemes of every color wheel, root '
+                    'color and hue variant for color vision deficiencies.')
+    parser.add_argument('--threshold', type=number_range(float, 0.0),
+                        default=0.05,
+                        help='smallest allowed OKLab distance between '
+                             'scheme colors')
+    parser.add_argument('--severity', type=number_range(float, 0.0, 1.0),
+                        default=1.0)
+    args = parser.parse_args()
+
+    snapshot = build_snapshot()
+
+    screened_count = 0
+    for color_wheel_key in COLOR_WHEEL_KEYS:
+        for root_color_name in snapshot['wheels'][color_wheel_key]:
+            for hue_variant_key in ['HUE', 'TINT', 'SHADE', 'TONE']:
+                for color_scheme_key in COLOR_SCHEMES:
+                    palette = create_variant_palette(
+                        color_wheel_key, root_color_name, color_scheme_key,
+                        hue_variant_key, DEFAULT_VARIANT_AMOUNTS, snapshot)
+                    distances = screen_palette(palette, args.severity)
+                    screened_count += 1
+
+                    failing = [name for name, distance in distances.items()
+                               if distance < args.threshold]
+                    if failing:
+                        print(f'{color_wheel_key} {root_color_name} '
+                              f'{hue_variant_key.title()} {color_scheme_key}: '
+                              + ', '.join(f'{name} {distances[name]:.3f}'
+                                          for name in failing))
+
+    print(f'Screened {screened_count} palettes')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,75 +1,127 @@
 from datetime import datetime
+import os
+import time
 import tkinter as tk
 from tkinter import ttk
-from tkinter.filedialog import asksaveasfile
-
+from tkinter.filedialog import askopenfilename, asksaveasfilename
+
+from background_worker import BackgroundWorker
+from color import Color
+from color_import import read_colors
+from color_ordering import color_order
+from color_vision import simulate_rgb
+import instrumentation
 from main import show_error, resource_path
-from palette import Palette
+from palette import COLOR_SCHEMES, Palette
+from delta_e import closest_color
+from export_job import ExportJob
+from palette_export import export_text_chunks
+from palette_snapshot import (SNAPSHOT_FILENAME, create_variant_palette,
+                              load_snapshot)
+from picker_canvas import PickerCanvas
+from render_scheduler import RenderScheduler
+from session_history import DEFAULT_MEMORY_BUDGET, SessionHistory
+from session_journal import (SessionJournal, create_session_palette,
+                             default_session_path, palette_state)
+from variant_sweeps import apply_variant_amount, create_sweep_palette
+from wheel_library import default_library
 
 
 class ColorianUI:
 
-    def __init__(self):
+    def __init__(self, main_window=None, history_budget=DEFAULT_MEMORY_BUDGET):
         """
         Creates Colorian UI initializing the color palettes and starts running
-        in a new window.
+        in a new window. When a main window is provided the UI is built into it
+        and running its event loop is left to the caller.
+
+        :param main_window: tkinter.Tk, the window to build the UI into.
+        :param history_budget: int, the memory budget of the undo and redo
+        history in bytes.
         """
 
+        self.__startup_start_time = time.perf_counter()
+        self.__startup_times = {}
+
         self.__default_tint_amount = 25
         self.__default_shade_amount = 25
         self.__default_tone_amount = 90
 
-        self.__color_picker_palette = Palette()
-        random_color = self.__color_picker_palette.random_color()
-        self.__color_picker_palette.set_picked_color(random_color)
-
-        self.__color_wheel_hue_palette = Palette()
-        picked_hue_color = self.__color_wheel_hue_palette.find_by_name(
-            random_color.name())
-        self.__color_wheel_hue_palette.set_picked_color(picked_hue_color)
-
-        self.__color_wheel_tint_palette = Palette().to_tint(
-            self.__default_tint_amount)
-        picked_hue_color = self.__color_wheel_tint_palette.find_by_name(
-            random_color.name())
-        self.__color_wheel_tint_palette.set_picked_color(picked_hue_color)
-
-        self.__color_wheel_shade_palette = Palette().to_shade(
-            self.__default_shade_amount)
-        picked_hue_color = self.__color_wheel_shade_palette.find_by_name(
-            random_color.name())
-        self.__color_wheel_shade_palette.set_picked_color(picked_hue_color)
-
-        self.__color_wheel_tone_palette = Palette().to_tone(
-            self.__default_tone_amount)
-        picked_hue_color = self.__color_wheel_tone_palette.find_by_name(
-            random_color.name())
-        self.__color_wheel_tone_palette.set_picked_color(picked_hue_color)
-
-        self.__selected_color_wheel_palette = self.__color_wheel_hue_palette
-
         self.__color_wheels = {
             'RYB (Web)': 'RYB',
             'RGB (Screen)': 'RGB',
             'CMYK (Print)': 'CMYK'
         }
+
+        # Note! Wheels defined in wheel files are listed from the compiled
+        # wheel cache, their colors are only created once they're picked
+        for color_wheel_key, color_wheel_title in \
+                default_library().wheels().items():
+            if color_wheel_title in self.__color_wheels:
+                color_wheel_title = f'{color_wheel_title} ({color_wheel_key})'
+            self.__color_wheels[color_wheel_title] = color_wheel_key
+
         self.__hue_variants = {
             'Hue': 'HUE',
             'Tint': 'TINT',
             'Shade': 'SHADE',
             'Tone': 'TONE'
         }
-        self.__color_schemes = [
-            'Analogous',
-            'Complementary',
-            'Triadic',
-            'Tetradic',
-            'Square',
-            'Split-complementary',
-            'Double split-complementary',
-            'Clash',
-            'Intermediate'
-        ]
+        self.__picker_orders = {
+            'Wheel order': 'ORIGINAL',
+            'Hue': 'HUE',
+            'Lightness': 'LIGHTNESS',
+            'Hilbert curve': 'HILBERT'
+        }
+        self.__color_visions = {
+            'Normal vision': None,
+            'Protanopia': 'protan',
+            'Deuteranopia': 'deutan',
+            'Tritanopia': 'tritan'
+        }
+        self.__color_schemes = list(COLOR_SCHEMES)
+
+        # Note! Hue variants are read from a snapshot prebuilt with
+        # palette_snapshot.py when bundled and computed if it's missing
+        self.__variant_amounts = {
+            'TINT': self.__default_tint_amount,
+            'SHADE': self.__default_shade_amount,
+            'TONE': self.__default_tone_amount
+        }
+        self.__palette_snapshot = load_snapshot(
+            resource_path(SNAPSHOT_FILENAME), self.__variant_amounts)
+
+        # Note! The previous session is restored from its journal with the
+        # palettes stored as they were, a new session starts from a random
+        # color
+        session_restore_start_time = time.perf_counter()
+        self.__session_journal = SessionJournal(default_session_path())
+        session_state = self.restore_session(self.__session_journal.load())
+        self.__startup_times['session_restore'] = \
+            time.perf_counter() - session_restore_start_time
+
+        if session_state is None:
+            self.__color_picker_palette = Palette()
+            random_color = self.__color_picker_palette.random_color()
+            self.__color_picker_palette.set_picked_color(random_color)
+
+            variant_palettes = {}
+            for hue_variant_key in self.__hue_variants.values():
+                variant_palettes[hue_variant_key] = \
+                    self.create_variant_palette(
+                        self.__color_picker_palette.get_color_wheel(),
+                        random_color.name(),
+                        self.__color_schemes[0],
+                        hue_variant_key,
+                        sort_by_root=False)
+
+            self.__color_wheel_hue_palette = variant_palettes['HUE']
+            self.__color_wheel_tint_palette = variant_palettes['TINT']
+            self.__color_wheel_shade_palette = variant_palettes['SHADE']
+            self.__color_wheel_tone_palette = variant_palettes['TONE']
+
+            self.__selected_color_wheel_palette = \
+                self.__color_wheel_hue_palette
 
         # Create custom widget theme
         self.__default_ui_dark_color = '#000000'
@@ -79,7 +131,10 @@ class ColorianUI:
         self.__default_ui_focus_color = '#B0AFB0'
         self.__default_ui_highlight_color = '#696969'
 
-        self.__main_window = tk.Tk()
+        self.__main_window = tk.Tk() if main_window is None else main_window
+        self.__render_scheduler = RenderScheduler(self.__main_window)
+        self.__background_worker = BackgroundWorker(self.__main_window)
+        self.__export_job = None
 
         widget_style = ttk.Style()
         widget_style.theme_settings('alt', {
@@ -136,6 +191,13 @@ class ColorianUI:
                     'foreground': self.__default_ui_fg_color
                 }
             },
+            'TProgressbar': {
+                'configure': {
+                    'background': self.__default_ui_fg_color,
+                    'borderwidth': 0,
+                    'troughcolor': self.__default_ui_highlight_color
+                }
+            },
             'TScale': {
                 'configure': {
                     'background': self.__default_ui_frame_color,
@@ -155,21 +217,19 @@ class ColorianUI:
         })
         widget_style.theme_use('alt')
 
-        # Initialize Main window and images
+        # Initialize Main window, images are loaded after first paint
         self.__main_window.title('Colorian')
         self.__main_window.configure(bg=self.__default_ui_frame_color)
 
-        self.__copy_icon_image = tk.PhotoImage(
-            master=self.__main_window,
-            file=resource_path('noun_copy_964433.png'))
-        self.__save_icon_image = tk.PhotoImage(
-            master=self.__main_window,
-            file=resource_path('noun_sticker_964404.png'))
+        self.__copy_icon_image = None
+        self.__save_icon_image = None
 
         # Initialize Color wheel dropdown
         color_wheels_list = list(self.__color_wheels.keys())
-        self.__color_wheel_value = tk.StringVar(self.__main_window,
-                                                color_wheels_list[0])
+        self.__color_wheel_value = tk.StringVar(
+            self.__main_window,
+            self.get_color_wheel_title(
+                self.__color_picker_palette.get_color_wheel()))
 
         self.__color_wheel_combobox = ttk.Combobox(
             self.__main_window,
@@ -182,15 +242,45 @@ class ColorianUI:
                                          self.set_color_wheel)
         self.__color_wheel_combobox.grid(row=0, column=0, padx=(20, 10))
 
-        # Initialize Color picker
-        self.__color_picker_frame = ttk.Frame(self.__main_window,
-                                              height=50,
-                                              width=600)
-        self.__color_picker_frame.grid(row=0, column=1, columnspan=12)
+        # Initialize Color picker showing the color wheel or imported colors,
+        # scrolled with the mouse wheel and zoomed with Control held down
+        self.__imported_colors = None
+        self.__imported_picked_index = None
 
-        self.update_color_picker()
+        self.__color_picker_canvas = PickerCanvas(
+            self.__main_window,
+            600,
+            50,
+            self.pick_picker_color,
+            background=self.__default_ui_frame_color,
+            picked_outline=self.__default_ui_fg_color)
+        self.__color_picker_canvas.grid(row=0, column=1, columnspan=12)
+
+        self.__picker_order_value = tk.StringVar(
+            self.__main_window, list(self.__picker_orders.keys())[0])
+        self.__color_picker_menu = tk.Menu(self.__main_window, tearoff=0)
+        for title in self.__picker_orders:
+            self.__color_picker_menu.add_radiobutton(
+                command=lambda: self.__render_scheduler.invalidate('picker'),
+                label=f'Order by {title.lower()}',
+                value=title,
+                variable=self.__picker_order_value)
+        self.__color_picker_menu.add_separator()
+        self.__color_picker_menu.add_command(label='Import colors...',
+                                             command=self.import_colors)
+        self.__color_picker_menu.add_command(
+            label='Show color wheel',
+            command=lambda: self.set_imported_colors(None))
+
+        # Note! Secondary click is Button-2 on Mac and Button-3 elsewhere
+        for sequence in ('<Button-2>', '<Button-3>'):
+            self.__color_picker_canvas.bind(
+                sequence,
+                lambda event: self.__color_picker_menu.tk_popup(
+                    event.x_root, event.y_root))
 
         # Initialize Hue wheel
+        self.__hue_wheel_slice_ids = {}
         self.__pie_canvas = tk.Canvas(
             self.__main_window,
             bg=self.__default_ui_frame_color,
@@ -209,8 +299,10 @@ class ColorianUI:
         self.__hue_variant_selector_frame.grid(row=0, column=0, pady=10)
 
         hue_variant_list = list(self.__hue_variants.keys())
-        self.__hue_variant_value = tk.StringVar(self.__main_window,
-                                                hue_variant_list[0])
+        self.__hue_variant_value = tk.StringVar(
+            self.__main_window,
+            hue_variant_list[0] if session_state is None
+            else session_state['variant'])
 
         for idx, title in enumerate(hue_variant_list):
             # Note! Uses tk to allow more customization over ttk
@@ -229,6 +321,30 @@ class ColorianUI:
                 width=30)
             hue_variant_radiobutton.grid(row=idx, column=0, sticky=tk.W)
 
+        # Initialize Hue variant amount sliders, scrubbing reads the variant
+        # colors from precomputed sweep tables
+        self.__variant_amount_values = {}
+        for idx, (title, hue_variant_key) in enumerate(
+                self.__hue_variants.items()):
+            if hue_variant_key not in self.__variant_amounts:
+                continue
+
+            self.__variant_amount_values[hue_variant_key] = tk.IntVar(
+                self.__main_window, self.__variant_amounts[hue_variant_key])
+
+            variant_amount_scale = ttk.Scale(
+                self.__hue_variant_selector_frame,
+                command=lambda value, variant_title=title:
+                self.set_variant_amount(variant_title, value),
+                from_=0,
+                length=100,
+                orient=tk.HORIZONTAL,
+                to=100,
+                variable=self.__variant_amount_values[hue_variant_key])
+            variant_amount_scale.bind('<ButtonRelease-1>',
+                                      self.finish_slider_drag)
+            variant_amount_scale.grid(row=idx, column=1, padx=(10, 0))
+
         # Initialize Color scheme dropdown
         self.__color_scheme_value = tk.StringVar(
             self.__main_window,
@@ -251,8 +367,11 @@ class ColorianUI:
             self.__color_scheme_settings_frame, text='Brightness')
         self.__hue_brightness_label.grid(row=2, column=0, pady=(2, 2))
 
+        # Note! The picked color comes from the restored session or the new
+        # random color alike
+        picked_color = self.__selected_color_wheel_palette.get_picked_color()
         self.__hue_brightness_value = tk.DoubleVar(
-            self.__main_window, random_color.get_brightness())
+            self.__main_window, picked_color.get_brightness())
         hue_brightness_min_value = 0.0
         hue_brightness_max_value = 255.0
 
@@ -265,20 +384,36 @@ class ColorianUI:
             to=hue_brightness_max_value,
             variable=self.__hue_brightness_value)
 
-        # Note! Only updates brightness to color wheel and palette view on
-        # mouseup event for better performance
+        # Note! Brightness changes redraw only the modified color wheel slice
+        # and palette swatch, coalesced to at most one render per frame
         self.__hue_brightness_scale.bind('<ButtonRelease-1>',
-                                         self.update_all_color_previews)
+                                         self.finish_slider_drag)
         self.__hue_brightness_scale.grid(row=3, column=0)
 
         self.__hue_preview_frame = tk.Frame(
             self.__color_scheme_settings_frame,
-            background=random_color.hex(),
+            background=picked_color.hex(),
             height=140,
             width=270)
 
         self.__hue_preview_frame.grid(row=4, column=0)
 
+        # Initialize Color vision simulation dropdown
+        color_vision_list = list(self.__color_visions.keys())
+        self.__color_vision_value = tk.StringVar(self.__main_window,
+                                                 color_vision_list[0])
+
+        self.__color_vision_combobox = ttk.Combobox(
+            self.__color_scheme_settings_frame,
+            state='readonly',
+            textvariable=self.__color_vision_value,
+            values=color_vision_list,
+            width=25
+        )
+        self.__color_vision_combobox.bind('<<ComboboxSelected>>',
+                                          self.set_color_vision)
+        self.__color_vision_combobox.grid(row=5, column=0, pady=(5, 0))
+
         # Initialize Palette view
         self.__palette_view_frame = ttk.Frame(self.__main_window)
         self.__palette_view_frame.grid(row=2, column=0, columnspan=7)
@@ -299,7 +434,6 @@ class ColorianUI:
             self.__palette_export_frame,
             command=self.export_palette_to_file,
             compound=tk.LEFT,
-            image=self.__save_icon_image,
             state='readonly',
             text='Export to file',
             padding=(0, 10, 25, 10),
@@ -308,9 +442,133 @@ class ColorianUI:
         self.__palette_export_button.grid(row=1, column=0, sticky=tk.NE,
                                           padx=(53, 0), pady=(0, 20))
 
-        # Start UI graphics and event loop
+        self.__palette_export_progress_bar = ttk.Progressbar(
+            self.__palette_export_frame,
+            length=160,
+            mode='determinate')
+        self.__palette_export_progress_bar.grid(row=2, column=0, sticky=tk.NE,
+                                                padx=(53, 0))
+        self.__palette_export_progress_bar.grid_remove()
+
+        # Register view regions in render order and listen to palette changes
+        self.__render_scheduler.register('picker', self.update_color_picker)
+        self.__render_scheduler.register('wheel', self.draw_hue_wheel,
+                                         supersedes=('wheel-slice',))
+        self.__render_scheduler.register('wheel-slice',
+                                         self.update_hue_wheel_slice)
+        self.__render_scheduler.register('preview', self.update_hue_preview)
+        self.__render_scheduler.register('slider',
+                                         self.update_hue_brightness_slider)
+        self.__render_scheduler.register('palette', self.update_palette_view,
+                                         supersedes=('palette-swatch',))
+        self.__render_scheduler.register('palette-swatch',
+                                         self.update_palette_view_swatch)
+
+        for palette in (self.__color_picker_palette,
+                        self.__color_wheel_hue_palette,
+                        self.__color_wheel_tint_palette,
+                        self.__color_wheel_shade_palette,
+                        self.__color_wheel_tone_palette):
+            palette.add_listener(self.on_palette_change)
+
+        # Initialize Debug overlay showing render times, toggled with F12
+        self.__debug_overlay_label = tk.Label(
+            self.__main_window,
+            background=self.__default_ui_dark_color,
+            font=('Courier', 12),
+            foreground=self.__default_ui_fg_color,
+            justify=tk.LEFT)
+        self.__debug_overlay_shown = False
+        self.__main_window.bind('<F12>', self.toggle_debug_overlay)
+        self.__render_scheduler.add_flush_listener(self.update_debug_overlay)
+
+        # Initialize undo and redo history of the editing session
+        self.__session_history = SessionHistory(history_budget)
+        self.__history_step = None
+        self.__pick_view_before = None
+        self.__main_window.bind('<Control-z>', self.undo)
+        self.__main_window.bind('<Control-y>', self.redo)
+        self.__main_window.bind('<Control-Z>', self.redo)
+
+        # Start event loop, UI graphics are rendered after first paint
+        self.__main_window.protocol('WM_DELETE_WINDOW', self.close)
+        self.__first_paint_bind_id = self.__main_window.bind(
+            '<Map>', self.finish_startup)
+
+        if main_window is None:
+            self.__main_window.mainloop()
+
+    def finish_startup(self, event):
+        """
+        Loads the images and renders the UI graphics once the main window has
+        been painted for the first time. Measures the time to first paint and
+        to the fully rendered UI.
+
+        :param event: tkinter.Event, the event of the window getting mapped.
+        """
+
+        if event.widget is not self.__main_window:
+            return
+
+        self.__main_window.unbind('<Map>', self.__first_paint_bind_id)
+        self.__main_window.update_idletasks()
+        self.__startup_times['first_paint'] = \
+            time.perf_counter() - self.__startup_start_time
+
+        self.__copy_icon_image = tk.PhotoImage(
+            master=self.__main_window,
+            file=resource_path('noun_copy_964433.png'))
+        self.__save_icon_image = tk.PhotoImage(
+            master=self.__main_window,
+            file=resource_path('noun_sticker_964404.png'))
+        self.__palette_export_button.config(image=self.__save_icon_image)
+
+        self.__render_scheduler.invalidate('picker')
         self.update_all_color_previews()
-        self.__main_window.mainloop()
+        self.__render_scheduler.flush()
+        self.__main_window.update_idletasks()
+        self.__startup_times['rendered'] = \
+            time.perf_counter() - self.__startup_start_time
+
+        wheel_file_errors = default_library().errors()
+        if wheel_file_errors:
+            show_error('Skipped invalid color wheel files:\n' + '\n'.join(
+                f'{os.path.basename(path)}: {error}'
+                for path, error in wheel_file_errors))
+
+        if os.environ.get('COLORIAN_STARTUP_TIME'):
+            print(f'Startup: first paint '
+                  f'{self.__startup_times["first_paint"] * 1000:.1f} ms, '
+                  f'rendered {self.__startup_times["rendered"] * 1000:.1f} '
+                  f'ms, palette snapshot '
+                  f'{"used" if self.__palette_snapshot else "missing"}, '
+                  f'session restore '
+                  f'{self.__startup_times["session_restore"] * 1000:.1f} ms')
+
+    def startup_times(self):
+        """
+        Fetches the startup time measurements.
+
+        :return: dict, the seconds from start to first paint and to the fully
+        rendered UI.
+        """
+
+        return dict(self.__startup_times)
+
+    def close(self):
+        """
+        Stops the background work and closes the main window.
+        """
+
+        self.end_history_step()
+        self.__background_worker.shutdown()
+
+        # Note! A running export is cancelled so it removes its temporary file
+        if self.__export_job is not None:
+            self.__export_job.shutdown()
+            self.__export_job.wait(1.0)
+
+        self.__main_window.destroy()
 
     def display_message(self, message):
         """
@@ -336,162 +594,652 @@ class ColorianUI:
         :param event: tkinter.Event, the event triggered by user.
         """
 
+        self.__render_scheduler.begin_action('color-wheel')
         self.__color_wheel_combobox.selection_clear()
+        self.begin_history_step()
 
         color_wheel_key = self.__color_wheels[self.__color_wheel_value.get()]
         self.__color_picker_palette.set_color_wheel(color_wheel_key)
 
         random_color = self.__color_picker_palette.random_color()
         self.__color_picker_palette.set_picked_color(random_color)
-
-        self.update_color_picker()
+        self.end_history_step()
 
     def update_color_picker(self):
         """
-        Populates the color picker buttons in order defined in the
-        palette. Implements the selection of color for updating it as the
-        picked color and all the color previews.
+        Shows the color wheel or the imported colors in the color picker in
+        the selected order. Imported collections are ordered in the
+        background.
         """
 
-        for widget in self.__color_picker_frame.winfo_children():
-            widget.destroy()
+        order = self.__picker_orders[self.__picker_order_value.get()]
+
+        if self.__imported_colors is None:
+            colors = self.__color_picker_palette.values()
+            rgb_bytes = bytes(value for color in colors
+                              for value in color.values())
+            self.__color_picker_canvas.set_colors(
+                rgb_bytes,
+                color_order(rgb_bytes, order),
+                colors.index(self.__color_picker_palette.get_picked_color()))
+            return
+
+        rgb_bytes = self.__imported_colors['rgb']
+
+        def show_imported_colors(color_indexes):
+            if (
+                    self.__imported_colors is None
+                    or self.__imported_colors['rgb'] is not rgb_bytes
+            ):
+                return
+
+            self.__color_picker_canvas.set_colors(
+                rgb_bytes, color_indexes, self.__imported_picked_index)
+
+        self.__background_worker.submit(
+            'picker-order',
+            lambda is_superseded: color_order(rgb_bytes, order),
+            show_imported_colors)
+
+    def pick_picker_color(self, color_idx):
+        """
+        Picks the color clicked in the color picker. Imported colors pick the
+        closest color of the color wheel.
+
+        :param color_idx: int, the index of the clicked color.
+        """
+
+        if self.__imported_colors is None:
+            self.pick_color(self.__color_picker_palette.values()[color_idx])
+            return
+
+        offset = color_idx * 3
+        rgb_bytes = self.__imported_colors['rgb']
+        imported_color = Color(*rgb_bytes[offset:offset + 3],
+                               self.__imported_colors['names'][color_idx])
+
+        wheel_color, _ = closest_color(imported_color,
+                                       self.__color_picker_palette)
+
+        self.__imported_picked_index = color_idx
+        self.__render_scheduler.invalidate('picker')
+        self.display_message(
+            f'{imported_color.name() or imported_color.hex()} is closest to '
+            f'{wheel_color.name()}')
+        self.pick_color(wheel_color)
+
+    def import_colors(self):
+        """
+        Prompts for a CSV or text file of colors and reads it in the
+        background to show the colors in the color picker.
+        """
+
+        path = askopenfilename(filetypes=[('Color lists', '*.csv *.txt'),
+                                          ('All files', '*')])
+        if not path:
+            return
+
+        self.__background_worker.submit(
+            'import-colors',
+            lambda is_superseded: read_colors(path),
+            self.set_imported_colors)
+
+    def set_imported_colors(self, imported_colors):
+        """
+        Shows imported colors in the color picker instead of the color wheel.
+
+        :param imported_colors: dict, the colors read with read_colors or None
+        to show the color wheel.
+        """
+
+        self.__imported_picked_index = None
+
+        if imported_colors is None:
+            self.__imported_colors = None
+            self.__render_scheduler.invalidate('picker')
+            return
+
+        if not imported_colors['rgb']:
+            show_error('No colors found in the file!')
+            return
+
+        self.__imported_colors = {
+            'rgb': bytes(imported_colors['rgb']),
+            'names': imported_colors['names']
+        }
+        self.__render_scheduler.invalidate('picker')
+        self.display_message(
+            f'Imported {len(imported_colors["names"])} colors, '
+            f'{len(imported_colors["errors"])} invalid rows')
+
+    def get_color_picker_palette(self):
+        """
+        Fetches the palette of the colors shown in the color picker.
+
+        :return: Palette, the color picker palette.
+        """
+
+        return self.__color_picker_palette
+
+    def get_selected_palette(self):
+        """
+        Fetches the color wheel palette of the selected hue variant.
+
+        :return: Palette, the shown color wheel palette.
+        """
+
+        return self.__selected_color_wheel_palette
+
+    def pick_color(self, color):
+        """
+        Sets the color as the picked color and starts recreating the color
+        wheel palettes of every hue variant with the color as their root color
+        in the background. Only the latest picked color's palettes get shown.
+
+        :param color: Color, the color picked from the color picker.
+        """
+
+        # Note! The step of a pick is recorded only once its palettes are
+        # shown, picks superseded before that coalesce into the latest one
+        if self.__pick_view_before is None:
+            self.end_history_step()
+            self.__pick_view_before = self.capture_view_state()
+
+        self.__color_picker_palette.set_picked_color(color)
+
+        picked_color_wheel_key = self.__color_picker_palette.get_color_wheel()
+        color_scheme_key = self.__color_scheme_value.get()
+        root_color_name = color.name()
+        variant_amounts = dict(self.__variant_amounts)
+
+        def create_variant_palettes(is_superseded):
+            variant_palettes = {}
+            for hue_variant_key in self.__hue_variants.values():
+                if is_superseded():
+                    return None
+
+                variant_palettes[hue_variant_key] = \
+                    self.create_variant_palette(
+                        picked_color_wheel_key,
+                        root_color_name,
+                        color_scheme_key,
+                        hue_variant_key,
+                        variant_amounts=variant_amounts)
+
+            return variant_palettes
+
+        self.__background_worker.submit('pick-color',
+                                        create_variant_palettes,
+                                        self.set_variant_palettes)
+
+    def set_variant_palettes(self, variant_palettes):
+        """
+        Replaces the color wheel palettes of every hue variant and updates all
+        the color previews.
+
+        :param variant_palettes: dict, the palettes keyed by hue variant.
+        """
+
+        self.__render_scheduler.begin_action('pick-color')
+        self.begin_history_step(view_before=self.__pick_view_before)
+        self.__pick_view_before = None
+
+        self.__color_wheel_hue_palette = variant_palettes['HUE']
+        self.__color_wheel_tint_palette = variant_palettes['TINT']
+        self.__color_wheel_shade_palette = variant_palettes['SHADE']
+        self.__color_wheel_tone_palette = variant_palettes['TONE']
+
+        for variant_palette in variant_palettes.values():
+            variant_palette.add_listener(self.on_palette_change)
+
+        self.select_hue_variant_palette()
+        self.end_history_step()
+
+        self.__render_scheduler.invalidate('slider')
+        self.update_all_color_previews()
+
+    def create_variant_palette(self, color_wheel_key, root_color_name,
+                               color_scheme_key, hue_variant_key,
+                               sort_by_root=True, variant_amounts=None):
+        """
+        Creates a color wheel palette sorted to start from the root color with
+        the hue variant applied to its colors. Doesn't touch any widgets so it
+        can be run in the background.
+
+        :param color_wheel_key: str, the color wheel of the palette.
+        :param root_color_name: str, the name of the root color.
+        :param color_scheme_key: str, the color scheme of the palette.
+        :param hue_variant_key: str, the hue variant to apply.
+        :param sort_by_root: bool, whether to sort the wheel by the root color.
+        :param variant_amounts: dict, the tint, shade and tone percentages,
+        defaults to the current amounts.
+        :return: Palette, the created palette.
+        """
+
+        if variant_amounts is None:
+            variant_amounts = self.__variant_amounts
+
+        # Note! The snapshot only holds the default amounts, other amounts
+        # are read from the sweep tables
+        if (
+                hue_variant_key in variant_amounts
+                and (self.__palette_snapshot is None
+                     or variant_amounts[hue_variant_key]
+                     != self.__palette_snapshot['amounts'][hue_variant_key])
+        ):
+            return create_sweep_palette(color_wheel_key,
+                                        root_color_name,
+                                        color_scheme_key,
+                                        hue_variant_key,
+                                        variant_amounts[hue_variant_key],
+                                        sort_by_root=sort_by_root)
+
+        return create_variant_palette(color_wheel_key,
+                                      root_color_name,
+                                      color_scheme_key,
+                                      hue_variant_key,
+                                      variant_amounts,
+                                      snapshot=self.__palette_snapshot,
+                                      sort_by_root=sort_by_root)
+
+    def get_variant_palette(self, hue_variant_key):
+        """
+        Fetches the color wheel palette of a hue variant.
+
+        :param hue_variant_key: str, the hue variant of the palette.
+        :return: Palette, the color wheel palette of the hue variant.
+        """
+
+        if hue_variant_key == 'TINT':
+            return self.__color_wheel_tint_palette
+        elif hue_variant_key == 'SHADE':
+            return self.__color_wheel_shade_palette
+        elif hue_variant_key == 'TONE':
+            return self.__color_wheel_tone_palette
+
+        return self.__color_wheel_hue_palette
+
+    def select_hue_variant_palette(self):
+        """
+        Sets the color wheel palette of the selected hue variant as the shown
+        palette and applies the selected color scheme to it.
+        """
+
+        hue_variant_key = self.__hue_variants[self.__hue_variant_value.get()]
+
+        self.__selected_color_wheel_palette = \
+            self.get_variant_palette(hue_variant_key)
+
+        # Note! Color scheme changes are only applied to the shown palette so
+        # the hidden ones are brought up to date when they get selected
+        self.__selected_color_wheel_palette.set_color_scheme(
+            self.__color_scheme_value.get())
+
+    def on_palette_change(self, palette, change):
+        """
+        Marks the view regions showing the changed palette state dirty. Changes
+        to palettes that aren't shown are ignored.
+
+        :param palette: Palette, the palette that changed.
+        :param change: str, the kind of change made to the palette.
+        """
+
+        if palette is self.__color_picker_palette:
+            if change in ('colors', 'picked'):
+                self.__render_scheduler.invalidate('picker')
+            return
+
+        if palette is not self.__selected_color_wheel_palette:
+            return
+
+        if change == 'colors':
+            self.update_all_color_previews()
+        elif change == 'scheme':
+            self.__render_scheduler.invalidate('wheel', 'palette')
+        elif change == 'picked':
+            self.__render_scheduler.invalidate('preview', 'slider')
+
+    def get_color_wheel_title(self, color_wheel_key):
+        """
+        Fetches the title of a color wheel shown in the color wheel dropdown.
+
+        :param color_wheel_key: str, the color wheel.
+        :return: str, the title of the color wheel.
+        """
+
+        for color_wheel_title, key in self.__color_wheels.items():
+            if key == color_wheel_key:
+                return color_wheel_title
+
+        show_error(f'Value {color_wheel_key} is not a valid color wheel!')
+        return
+
+    def restore_session(self, session_state):
+        """
+        Restores the color wheel, picked color, hue variant, color scheme and
+        color edits of the previous session from its saved state. The
+        palettes are created of their stored colors.
+
+        :param session_state: dict, the saved session state.
+        :return: dict, the restored session state or None if it couldn't be
+        used.
+        """
+
+        if (
+                not isinstance(session_state, dict)
+                or session_state.get('wheel')
+                not in self.__color_wheels.values()
+        ):
+            return None
+
+        try:
+            color_picker_palette = Palette(session_state['wheel'])
+            variant_palettes = {
+                hue_variant_key: create_session_palette(
+                    session_state['palettes'][hue_variant_key])
+                for hue_variant_key in self.__hue_variants.values()
+            }
+            hue_variant_key = self.__hue_variants[session_state['variant']]
+            picked_colors = [color for color in color_picker_palette.values()
+                             if color.name() == session_state['picked']]
+            color_scheme_key = session_state['scheme']
+            variant_amounts = session_state['amounts']
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        if (
+                not picked_colors
+                or None in variant_palettes.values()
+                or color_scheme_key not in self.__color_schemes
+                or not isinstance(variant_amounts, dict)
+                or variant_amounts.keys() != self.__variant_amounts.keys()
+                or not all(isinstance(amount, int)
+                           and not isinstance(amount, bool)
+                           and 0 <= amount <= 100
+                           for amount in variant_amounts.values())
+        ):
+            return None
+
+        color_picker_palette.set_picked_color(picked_colors[0])
+        for variant_palette in variant_palettes.values():
+            variant_palette.set_color_scheme(color_scheme_key)
+
+        self.__color_picker_palette = color_picker_palette
+        self.__color_wheel_hue_palette = variant_palettes['HUE']
+        self.__color_wheel_tint_palette = variant_palettes['TINT']
+        self.__color_wheel_shade_palette = variant_palettes['SHADE']
+        self.__color_wheel_tone_palette = variant_palettes['TONE']
+        self.__selected_color_wheel_palette = \
+            variant_palettes[hue_variant_key]
+        self.__variant_amounts.update(variant_amounts)
+
+        return session_state
+
+    def capture_session_state(self):
+        """
+        Fetches the state of the session to save in the session journal.
+
+        :return: dict, the state of the session.
+        """
+
+        return {
+            'wheel': self.__color_picker_palette.get_color_wheel(),
+            'picked': self.__color_picker_palette.get_picked_color().name(),
+            'variant': self.__hue_variant_value.get(),
+            'scheme': self.__color_scheme_value.get(),
+            'amounts': dict(self.__variant_amounts),
+            'palettes': {
+                hue_variant_key: palette_state(
+                    self.get_variant_palette(hue_variant_key))
+                for hue_variant_key in self.__hue_variants.values()
+            }
+        }
+
+    def save_session(self):
+        """
+        Appends the changes of the session to the session journal.
+        """
+
+        self.__session_journal.save(self.capture_session_state())
+
+    def capture_view_state(self):
+        """
+        Fetches the state of the view for the session history. The palettes
+        are referenced instead of copied so consecutive states share them.
+
+        :return: dict, the state of the view.
+        """
+
+        return {
+            'wheel': self.__color_picker_palette.get_color_wheel(),
+            'picked': self.__color_picker_palette.get_picked_color(),
+            'palettes': (self.__color_wheel_hue_palette,
+                         self.__color_wheel_tint_palette,
+                         self.__color_wheel_shade_palette,
+                         self.__color_wheel_tone_palette),
+            'variant': self.__hue_variant_value.get(),
+            'scheme': self.__color_scheme_value.get(),
+            'amounts': dict(self.__variant_amounts),
+            'hue': self.__selected_color_wheel_palette.get_picked_color()
+        }
+
+    def restore_view_state(self, view_state):
+        """
+        Restores a state of the view from the session history and marks the
+        whole view dirty.
+
+        :param view_state: dict, the state of the view to restore.
+        """
+
+        color_wheel_key = view_state['wheel']
+        if self.__color_picker_palette.get_color_wheel() != color_wheel_key:
+            self.__color_picker_palette.set_color_wheel(color_wheel_key)
+
+        self.__color_wheel_value.set(
+            self.get_color_wheel_title(color_wheel_key))
+
+        self.__color_picker_palette.set_picked_color(view_state['picked'])
+
+        # Note! The palettes got their listener when they were first shown
+        (self.__color_wheel_hue_palette,
+         self.__color_wheel_tint_palette,
+         self.__color_wheel_shade_palette,
+         self.__color_wheel_tone_palette) = view_state['palettes']
+
+        self.__variant_amounts.update(view_state['amounts'])
+        for hue_variant_key, amount in self.__variant_amounts.items():
+            self.__variant_amount_values[hue_variant_key].set(amount)
+
+        self.__hue_variant_value.set(view_state['variant'])
+        self.__color_scheme_value.set(view_state['scheme'])
+        self.select_hue_variant_palette()
+        self.__selected_color_wheel_palette.set_picked_color(view_state['hue'])
+
+        self.__render_scheduler.invalidate('slider')
+        self.update_all_color_previews()
+
+    def begin_history_step(self, colors=(), coalesce=False,
+                           view_before=None):
+        """
+        Starts a step of the session history from the current view state. A
+        pending step is ended first unless the changes are coalesced into it,
+        like the changes of a slider drag.
+
+        :param colors: list, the colors the step is going to change.
+        :param coalesce: bool, whether to continue a pending step.
+        :param view_before: dict, the view state to start the step from,
+        defaults to the current view state.
+        """
+
+        if not (coalesce and self.__history_step is not None):
+            self.end_history_step()
+            if view_before is None:
+                view_before = self.capture_view_state()
+            self.__history_step = (view_before, {})
+
+        color_values = self.__history_step[1]
+        for color in colors:
+            color_values.setdefault(color, color.values())
+
+    def end_history_step(self):
+        """
+        Records the pending step of the session history with the current view
+        state and values of the changed colors.
+        """
+
+        if self.__history_step is None:
+            return
+
+        view_before, color_values = self.__history_step
+        self.__history_step = None
+
+        if self.__session_history.record(
+                view_before,
+                self.capture_view_state(),
+                [(color, before_values, color.values())
+                 for color, before_values in color_values.items()]):
+            self.save_session()
+
+    def finish_slider_drag(self, event):
+        """
+        Ends the history step of a slider drag and renders the dirty regions
+        right away.
+
+        :param event: tkinter.Event, the event triggered by user.
+        """
+
+        self.end_history_step()
+        self.__render_scheduler.flush()
+
+    def undo(self, event=None):
+        """
+        Reverts the latest step of the session history.
+
+        :param event: tkinter.Event, the event triggered by user.
+        """
+
+        self.end_history_step()
+        view_state = self.__session_history.undo()
+        if view_state is None:
+            return
+
+        self.__render_scheduler.begin_action('undo')
+        self.restore_view_state(view_state)
+        self.save_session()
+
+    def redo(self, event=None):
+        """
+        Reapplies the latest reverted step of the session history.
 
-        for idx, color in enumerate(self.__color_picker_palette.values()):
-
-            color_swatch_frame = ttk.Frame(self.__color_picker_frame,
-                                           height=50,
-                                           width=50)
-            color_swatch_frame.rowconfigure(0, weight=1)
-            color_swatch_frame.columnconfigure(0, weight=1)
-            color_swatch_frame.grid_propagate(0)
-            color_swatch_frame.grid(row=0, column=idx)
-
-            def set_picked_color(color_value=color):
-                self.__color_picker_palette \
-                    .set_picked_color(color_value)
-
-                picked_color_wheel_key = self.__color_picker_palette \
-                    .get_color_wheel()
-                color_scheme_key = self.__color_scheme_value.get()
-
-                self.__color_wheel_hue_palette = Palette()
-                self.__color_wheel_hue_palette \
-                    .set_color_wheel(picked_color_wheel_key)
-                root_color = self.__color_wheel_hue_palette \
-                    .find_by_name(color_value.name())
-                self.__color_wheel_hue_palette.set_picked_color(root_color)
-                self.__color_wheel_hue_palette \
-                    .sort_color_wheel(root_color)
-                self.__color_wheel_hue_palette.set_color_scheme(
-                    color_scheme_key)
-
-                self.__color_wheel_tint_palette = Palette()
-                self.__color_wheel_tint_palette \
-                    .set_color_wheel(picked_color_wheel_key)
-                root_color = self.__color_wheel_tint_palette \
-                    .find_by_name(color_value.name())
-                self.__color_wheel_tint_palette.set_picked_color(root_color)
-                self.__color_wheel_tint_palette \
-                    .sort_color_wheel(root_color)
-                self.__color_wheel_tint_palette.to_tint(
-                    self.__default_tint_amount)
-                self.__color_wheel_tint_palette.set_color_scheme(
-                    color_scheme_key)
-
-                self.__color_wheel_shade_palette = Palette()
-                self.__color_wheel_shade_palette \
-                    .set_color_wheel(picked_color_wheel_key)
-                root_color = self.__color_wheel_shade_palette \
-                    .find_by_name(color_value.name())
-                self.__color_wheel_shade_palette.set_picked_color(root_color)
-                self.__color_wheel_shade_palette \
-                    .sort_color_wheel(root_color)
-                self.__color_wheel_shade_palette.to_shade(
-                    self.__default_shade_amount)
-                self.__color_wheel_shade_palette.set_color_scheme(
-                    color_scheme_key)
-
-                self.__color_wheel_tone_palette = Palette()
-                self.__color_wheel_tone_palette \
-                    .set_color_wheel(picked_color_wheel_key)
-                root_color = self.__color_wheel_tone_palette \
-                    .find_by_name(color_value.name())
-                self.__color_wheel_tone_palette.set_picked_color(root_color)
-                self.__color_wheel_tone_palette \
-                    .sort_color_wheel(root_color)
-                self.__color_wheel_tone_palette.to_tone(
-                    self.__default_tone_amount)
-                self.__color_wheel_tone_palette.set_color_scheme(
-                    color_scheme_key)
-
-                color_scheme = \
-                    self.__selected_color_wheel_palette.get_color_scheme()
-
-                hue_variant_key = self.__hue_variants[
-                    self.__hue_variant_value.get()]
-
-                if hue_variant_key == 'HUE':
-                    self.__selected_color_wheel_palette = \
-                        self.__color_wheel_hue_palette
-                elif hue_variant_key == 'TINT':
-                    self.__selected_color_wheel_palette = \
-                        self.__color_wheel_tint_palette
-                elif hue_variant_key == 'SHADE':
-                    self.__selected_color_wheel_palette = \
-                        self.__color_wheel_shade_palette
-                elif hue_variant_key == 'TONE':
-                    self.__selected_color_wheel_palette = \
-                        self.__color_wheel_tone_palette
-
-                self.__selected_color_wheel_palette.set_color_scheme(
-                    color_scheme)
-
-                self.update_hue_brightness_slider()
-                self.update_all_color_previews()
-
-            swatch_button_style = ttk.Style()
-            swatch_button_style.configure(
-                f'SwatchStyle{idx}.TButton',
-                background=color.hex(),
-                relief=tk.FLAT)
-
-            color_swatch_button = ttk.Button(
-                color_swatch_frame,
-                command=set_picked_color,
-                state='readonly',
-                style=f'SwatchStyle{idx}.TButton')
-
-            color_swatch_button.grid(sticky=tk.NSEW)
+        :param event: tkinter.Event, the event triggered by user.
+        """
+
+        self.end_history_step()
+        view_state = self.__session_history.redo()
+        if view_state is None:
+            return
+
+        self.__render_scheduler.begin_action('redo')
+        self.restore_view_state(view_state)
+        self.save_session()
+
+    def toggle_debug_overlay(self, event=None):
+        """
+        Shows or hides the debug overlay displaying the render time of the
+        latest user action.
+
+        :param event: tkinter.Event, the event triggered by user.
+        """
+
+        if self.__debug_overlay_shown:
+            self.__debug_overlay_label.place_forget()
+        else:
+            self.__debug_overlay_label.config(text='Waiting for render...')
+            self.__debug_overlay_label.place(relx=1.0, rely=0.0, anchor=tk.NE)
+            self.__debug_overlay_label.lift()
+
+        self.__debug_overlay_shown = not self.__debug_overlay_shown
+
+    def update_debug_overlay(self, action, regions, render_time):
+        """
+        Updates the debug overlay with the latest render if it's shown.
+
+        :param action: str, the user action that caused the render.
+        :param regions: list, the view regions rendered.
+        :param render_time: float, the render time in seconds.
+        """
+
+        if not self.__debug_overlay_shown:
+            return
+
+        self.__debug_overlay_label.config(
+            text=f'{action}: {render_time * 1000:.1f} ms\n'
+                 f'{", ".join(regions)}')
+
+    def stats(self):
+        """
+        Fetches the instrumentation stats together with the render counters of
+        the view regions.
 
+        :return: dict, the counters, timings and render counts.
+        """
+
+        ui_stats = instrumentation.stats()
+        ui_stats.update(self.render_stats())
+        ui_stats['startup'] = self.startup_times()
+
+        return ui_stats
+
+    def render_stats(self):
+        """
+        Fetches the render counters of the view regions.
+
+        :return: dict, the total renders per region and the average renders
+        per user action.
+        """
+
+        return {
+            'renders': self.__render_scheduler.render_counts(),
+            'renders_per_action':
+                self.__render_scheduler.action_render_counts()
+        }
+
+    @instrumentation.timed('ui.draw_hue_wheel')
     def draw_hue_wheel(self):
         """
         Updates the hue wheel and implements the selection of hue and updates
         all color previews.
         """
 
+        self.__pie_canvas.delete('all')
+        self.__hue_wheel_slice_ids = {}
+
         color_slices = self.__selected_color_wheel_palette.values()
         scheme_color_slices = \
             self.__selected_color_wheel_palette.get_scheme_colors()
+        slice_hexes = self.get_wheel_display_hexes(color_slices)
         extend_degrees = 360.0 / len(color_slices)
         start_degrees = extend_degrees * 2.5
 
         for idx, color in enumerate(color_slices):
 
             def select_hue(event, selected_hue=color):
+                self.__render_scheduler.begin_action('select-hue')
+                self.begin_history_step()
                 self.__selected_color_wheel_palette \
                     .set_picked_color(selected_hue)
-                self.update_hue_brightness_slider()
-                self.update_all_color_previews()
+                self.end_history_step()
 
             start_angle = -extend_degrees * idx + start_degrees
             tag_id = f'slice-{idx}'
 
-            self.__pie_canvas.create_arc((50, 10, 440, 400),
-                                         extent=extend_degrees,
-                                         fill=color.hex(),
-                                         outline=color.hex(),
-                                         start=start_angle,
-                                         tags=(tag_id,))
+            self.__hue_wheel_slice_ids[id(color)] = \
+                self.__pie_canvas.create_arc((50, 10, 440, 400),
+                                             extent=extend_degrees,
+                                             fill=slice_hexes[idx],
+                                             outline=slice_hexes[idx],
+                                             start=start_angle,
+                                             tags=(tag_id,))
 
             self.__pie_canvas.tag_bind(tag_id, '<1>', select_hue)
 
@@ -506,72 +1254,192 @@ class ColorianUI:
                                              start=start_angle,
                                              width=3)
 
+    def update_hue_wheel_slice(self, color=None):
+        """
+        Redraws the fill of a single color wheel slice without recreating the
+        rest of the wheel.
+
+        :param color: Color, the color whose slice to update, defaults to the
+        picked color.
+        """
+
+        if color is None:
+            color = self.__selected_color_wheel_palette.get_picked_color()
+
+        slice_id = self.__hue_wheel_slice_ids.get(id(color))
+        if slice_id is None:
+            return
+
+        slice_hex = self.get_wheel_display_hexes([color])[0]
+        self.__pie_canvas.itemconfigure(slice_id,
+                                        fill=slice_hex,
+                                        outline=slice_hex)
+
+    def get_wheel_display_hexes(self, colors):
+        """
+        Converts the colors to the hex color codes shown in the color wheel,
+        simulated for the selected color vision deficiency.
+
+        :param colors: list, the colors to convert.
+        :return: list, the hex color codes.
+        """
+
+        deficiency = self.__color_visions[self.__color_vision_value.get()]
+        if deficiency is None:
+            return [color.hex() for color in colors]
+
+        return [f'#{red:02X}{green:02X}{blue:02X}' for red, green, blue in
+                simulate_rgb([color.values() for color in colors],
+                             deficiency)]
+
+    def set_color_vision(self, event):
+        """
+        Updates the color wheel preview to simulate the selected color vision
+        deficiency. Clears text highlighting in the Combobox after selection
+        has been made.
+
+        :param event: tkinter.Event, the event triggered by user.
+        """
+
+        self.__render_scheduler.begin_action('color-vision')
+        self.__color_vision_combobox.selection_clear()
+        self.__render_scheduler.invalidate('wheel')
+
+    def update_palette_view_swatch(self, color=None):
+        """
+        Updates the background of a single palette view swatch if the color is
+        included in the current color scheme.
+
+        :param color: Color, the color whose swatch to update, defaults to the
+        picked color.
+        """
+
+        if color is None:
+            color = self.__selected_color_wheel_palette.get_picked_color()
+
+        scheme_colors = self.__selected_color_wheel_palette.get_scheme_colors()
+        if color not in scheme_colors:
+            return
+
+        palette_button_style = ttk.Style()
+        palette_button_style.configure(
+            f'PaletteStyle{scheme_colors.index(color)}.TButton',
+            background=color.hex())
+
     def update_all_color_previews(self, event=None):
         """
-        Aggregates all the functions to call when a color changes or gets
-        modified and the UI widget states need to be updated.
+        Marks all the view regions showing the shown palette dirty to be
+        redrawn when a color changes or gets modified.
         """
 
-        self.draw_hue_wheel()
-        self.update_hue_preview()
-        self.update_palette_view()
+        self.__render_scheduler.invalidate('wheel', 'preview', 'palette')
 
-    def set_hue_variant(self):
+    def set_hue_variant(self, hue_variant_title=None):
         """
         Updates the hue variant to the selected value and updates color
         previews.
+
+        :param hue_variant_title: str, the hue variant to select instead of
+        the one selected by user.
         """
 
-        hue_variant_key = self.__hue_variants[self.__hue_variant_value.get()]
+        if (
+                hue_variant_title is not None
+                and hue_variant_title not in self.__hue_variants
+        ):
+            show_error(f'Value {hue_variant_title} is not a valid hue '
+                       f'variant!')
+            return
 
-        if hue_variant_key == 'HUE':
-            self.__selected_color_wheel_palette = \
-                self.__color_wheel_hue_palette
-        elif hue_variant_key == 'TINT':
-            self.__selected_color_wheel_palette = \
-                self.__color_wheel_tint_palette
-        elif hue_variant_key == 'SHADE':
-            self.__selected_color_wheel_palette = \
-                self.__color_wheel_shade_palette
-        elif hue_variant_key == 'TONE':
-            self.__selected_color_wheel_palette = \
-                self.__color_wheel_tone_palette
+        self.__render_scheduler.begin_action('hue-variant')
+        self.begin_history_step()
+
+        if hue_variant_title is not None:
+            self.__hue_variant_value.set(hue_variant_title)
+
+        self.select_hue_variant_palette()
+        self.end_history_step()
+        self.update_all_color_previews()
+
+    def set_variant_amount(self, hue_variant_title, amount):
+        """
+        Changes the amount of a hue variant by reading its colors from the
+        sweep table and shows the hue variant.
+
+        :param hue_variant_title: str, the hue variant to change.
+        :param amount: float, the variant percentage 0-100 from the slider.
+        """
+
+        hue_variant_key = self.__hue_variants.get(hue_variant_title)
+        if hue_variant_key not in self.__variant_amounts:
+            show_error(f'Value {hue_variant_title} is not a hue variant with '
+                       f'an amount!')
+            return
+
+        amount = round(float(amount))
+        self.__variant_amount_values[hue_variant_key].set(amount)
+        if amount == self.__variant_amounts[hue_variant_key]:
+            return
+
+        self.__render_scheduler.begin_action('variant-amount')
+        variant_palette = self.get_variant_palette(hue_variant_key)
+        self.begin_history_step(variant_palette.values(), coalesce=True)
+        self.__variant_amounts[hue_variant_key] = amount
+
+        apply_variant_amount(variant_palette, hue_variant_key, amount)
 
+        self.__hue_variant_value.set(hue_variant_title)
+        self.select_hue_variant_palette()
         self.update_all_color_previews()
 
-    def set_color_scheme(self, event):
+    def set_color_scheme(self, event=None, color_scheme_key=None):
         """
-        Updates the color scheme to the selected value. Clears text
-        highlighting in the Combobox after selection has been made.
+        Updates the color scheme of the shown palette to the selected value.
+        Clears text highlighting in the Combobox after selection has been made.
 
         :param event: tkinter.Event, the event triggered by user.
+        :param color_scheme_key: str, the color scheme to select instead of
+        the one selected by user.
         """
 
+        if (
+                color_scheme_key is not None
+                and color_scheme_key not in self.__color_schemes
+        ):
+            show_error(f'Invalid color scheme {color_scheme_key} provided!')
+            return
+
+        self.__render_scheduler.begin_action('color-scheme')
         self.__color_scheme_combobox.selection_clear()
-        color_scheme_key = self.__color_scheme_value.get()
+        self.begin_history_step()
 
-        self.__color_wheel_hue_palette.set_color_scheme(color_scheme_key)
-        self.__color_wheel_tint_palette.set_color_scheme(color_scheme_key)
-        self.__color_wheel_shade_palette.set_color_scheme(color_scheme_key)
-        self.__color_wheel_tone_palette.set_color_scheme(color_scheme_key)
+        if color_scheme_key is not None:
+            self.__color_scheme_value.set(color_scheme_key)
 
-        self.update_all_color_previews()
+        color_scheme_key = self.__color_scheme_value.get()
+
+        self.__selected_color_wheel_palette.set_color_scheme(color_scheme_key)
+        self.end_history_step()
 
     def set_hue_brightness(self, event):
         """
         Modifies the selected color's brightness according to the fetched
-        slider's value. Updates hue brightness preview.
+        slider's value. Updates hue brightness preview and marks the picked
+        color's wheel slice and palette swatch dirty.
 
         :param event: tkinter.Event, the event triggered by user.
         """
 
+        self.__render_scheduler.begin_action('brightness')
         hue_brightness_value = round(self.__hue_brightness_value.get(), 1)
 
         selected_hue_color = self.__selected_color_wheel_palette \
             .get_picked_color()
+        self.begin_history_step([selected_hue_color], coalesce=True)
         selected_hue_color.brightness(hue_brightness_value)
 
         self.update_hue_preview()
+        self.__render_scheduler.invalidate('wheel-slice', 'palette-swatch')
 
     def update_hue_brightness_slider(self):
         """
@@ -595,6 +1463,7 @@ class ColorianUI:
         self.__hue_preview_frame.config(
             bg=selected_hue_color.hex())
 
+    @instrumentation.timed('ui.update_palette_view')
     def update_palette_view(self):
         """
         Generates the palette view buttons and implements the click to copy
@@ -637,48 +1506,61 @@ class ColorianUI:
 
     def export_palette_to_file(self):
         """
-        Prompts for location to save the file. Creates a file and converts the
-        current palette to a string representation to write it to the file.
+        Prompts for location to save the file and writes the current palette
+        and the imported colors to it in the background. Clicking the button
+        again while exporting cancels the export.
         """
 
-        try:
-            date_and_time = str(datetime.now()).split(':')
-            filename = f'Palette {date_and_time[0]}.{date_and_time[1]}.txt'
+        if self.__export_job is not None and self.__export_job.is_running():
+            self.__export_job.cancel()
+            return
+
+        date_and_time = str(datetime.now()).split(':')
+        filename = f'Palette {date_and_time[0]}.{date_and_time[1]}.txt'
 
-            file = asksaveasfile(mode='w',
-                                 defaultextension='.txt',
+        path = asksaveasfilename(defaultextension='.txt',
                                  initialfile=filename)
-            if file is None:
-                return
+        if not path:
+            return
 
-            content = 'Colorian Palette\n' + \
-                      '================\n\n'
+        chunk_count, chunks = export_text_chunks(
+            self.__selected_color_wheel_palette, self.__imported_colors)
 
-            color_scheme = \
-                self.__selected_color_wheel_palette.get_color_scheme()
+        self.__export_job = ExportJob(self.__main_window, path, chunks,
+                                      chunk_count,
+                                      self.update_export_progress,
+                                      self.finish_export)
+        self.__palette_export_button.config(text='Cancel export')
+        self.__palette_export_progress_bar.config(maximum=chunk_count,
+                                                  value=0)
+        self.__palette_export_progress_bar.grid()
+        self.__export_job.start()
 
-            content += \
-                color_scheme + ' color scheme\n' + \
-                ('-' * (len(color_scheme) + 13)) + '\n'
+    def update_export_progress(self, written_count, chunk_count):
+        """
+        Shows the progress of the export in the progress bar.
 
-            for color in (
-                    self.__selected_color_wheel_palette.get_scheme_colors()
-            ):
-                content += str(color) + '\n'
+        :param written_count: int, the number of chunks written.
+        :param chunk_count: int, the number of chunks in total.
+        """
 
-            content += '\n'
+        self.__palette_export_progress_bar.config(maximum=chunk_count,
+                                                  value=written_count)
 
-            content += 'Color wheel\n' + \
-                       '-----------\n'
+    def finish_export(self, outcome):
+        """
+        Hides the export progress and tells how the export went.
 
-            for color in self.__selected_color_wheel_palette.values():
-                content += str(color) + '\n'
+        :param outcome: str, the outcome of the export, done, cancelled or
+        failed.
+        """
 
-            print(content, file=file)
+        self.__palette_export_progress_bar.grid_remove()
+        self.__palette_export_button.config(text='Export to file')
 
-            file.close()
-        except OSError:
+        if outcome == 'failed':
             show_error('Exporting to file ran into trouble!')
             return
 
-        self.display_message('Palette exported!')
+        self.display_message('Palette exported!' if outcome == 'done'
+                             else 'Export cancelled!')
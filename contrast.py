@@ -0,0 +1,327 @@
+"""
+Optimizer finding the smallest brightness or lightness adjustments that make
+colors meet a WCAG contrast ratio against a reference color, like the text or
+background color of a UI theme. All the colors are searched at once with
+bisection and large batches of palettes are split across processes.
+https://www.w3.org/TR/WCAG21/#dfn-contrast-ratio
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import functools
+
+from color import Color
+from color_space import SRGB_TO_LINEAR, oklab_to_rgb, rgb_to_oklab
+from main import show_error
+from palette import COLOR_SCHEMES, Palette
+
+ADJUSTMENT_MODES = ['brightness', 'lightness']
+DEFAULT_MIN_CONTRAST = 4.5
+BISECTION_STEPS = 12
+BATCH_CHUNK_SIZE = 256
+
+# Note! Luminance of 8-bit channel values is a lookup with the WCAG weights
+# applied in advance
+RED_LUMINANCE = tuple(0.2126 * value for value in SRGB_TO_LINEAR)
+GREEN_LUMINANCE = tuple(0.7152 * value for value in SRGB_TO_LINEAR)
+BLUE_LUMINANCE = tuple(0.0722 * value for value in SRGB_TO_LINEAR)
+
+
+def relative_luminance(rgb_values):
+    """
+    Calculates the WCAG relative luminance of the colors.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :return: list, the relative luminances on a scale 0.0-1.0.
+    """
+
+    red_luminance = RED_LUMINANCE
+    green_luminance = GREEN_LUMINANCE
+    blue_luminance = BLUE_LUMINANCE
+
+    return [red_luminance[red] + green_luminance[green] + blue_luminance[blue]
+            for red, green, blue in rgb_values]
+
+
+def contrast_ratios(rgb_values, reference_luminance):
+    """
+    Calculates the WCAG contrast ratios of the colors against a reference.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :param reference_luminance: float, the relative luminance of the
+    reference color.
+    :return: list, the contrast ratios 1.0-21.0.
+    """
+
+    return [(max(luminance, reference_luminance) + 0.05)
+            / (min(luminance, reference_luminance) + 0.05)
+            for luminance in relative_luminance(rgb_values)]
+
+
+def adjust(rgb_values, amounts, mode):
+    """
+    Lightens or darkens the colors by signed amounts. Brightness adds the same
+    value to every channel like Color.brightness does, lightness moves the
+    OKLab lightness keeping the hue and chroma.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :param amounts: list, the adjustments as fractions -1.0-1.0.
+    :param mode: str, the adjustment mode, brightness or lightness.
+    :return: list, the adjusted RGB values clamped to the gamut.
+    """
+
+    if mode == 'lightness':
+        return oklab_to_rgb([
+            (lightness + amount, green_red, blue_yellow)
+            for (lightness, green_red, blue_yellow), amount
+            in zip(rgb_to_oklab(rgb_values), amounts)
+        ])
+
+    return [
+        tuple(min(max(round(value + amount * 255), 0), 255)
+              for value in rgb_value)
+        for rgb_value, amount in zip(rgb_values, amounts)
+    ]
+
+
+def optimize_rgb(rgb_values, reference_rgb,
+                 min_contrast=DEFAULT_MIN_CONTRAST, mode='brightness'):
+    """
+    Finds the smallest adjustment of each color that meets the contrast ratio
+    against the reference color. Both lightening and darkening are searched
+    and the smaller feasible adjustment is kept. Colors that can't meet the
+    contrast get the adjustment with the highest contrast available.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :param reference_rgb: tuple, the RGB value of the reference color.
+    :param min_contrast: float, the contrast ratio to meet 1.0-21.0.
+    :param mode: str, the adjustment mode, brightness or lightness.
+    :return: list, the adjusted RGB values, adjustments and contrast ratios
+    as tuples.
+    """
+
+    rgb_values = [tuple(rgb_value) for rgb_value in rgb_values]
+    reference_luminance = relative_luminance([tuple(reference_rgb)])[0]
+
+    results = [
+        (rgb_value, 0.0, contrast) for rgb_value, contrast in
+        zip(rgb_values, contrast_ratios(rgb_values, reference_luminance))
+    ]
+    search_indexes = [idx for idx, (_, _, contrast) in enumerate(results)
+                      if contrast < min_contrast]
+    if not search_indexes:
+        return results
+
+    # Note! Every color is searched in both directions in the same batch,
+    # lightening first and darkening second
+    search_values = [rgb_values[idx] for idx in search_indexes] * 2
+    directions = [1.0] * len(search_indexes) + [-1.0] * len(search_indexes)
+
+    extreme_contrasts = contrast_ratios(
+        adjust(search_values, directions, mode), reference_luminance)
+    low_amounts = [0.0] * len(search_values)
+    high_amounts = [1.0] * len(search_values)
+
+    for _ in range(BISECTION_STEPS):
+        middle_amounts = [(low + high) / 2
+                          for low, high in zip(low_amounts, high_amounts)]
+        middle_contrasts = contrast_ratios(
+            adjust(search_values, [direction * amount for direction, amount
+                                   in zip(directions, middle_amounts)],
+                   mode),
+            reference_luminance)
+
+        for position, contrast in enumerate(middle_contrasts):
+            if contrast >= min_contrast:
+                high_amounts[position] = middle_amounts[position]
+            else:
+                low_amounts[position] = middle_amounts[position]
+
+    amounts = [direction * (amount if extreme_contrast >= min_contrast
+                            else 1.0)
+               for direction, amount, extreme_contrast
+               in zip(directions, high_amounts, extreme_contrasts)]
+    adjusted_values = adjust(search_values, amounts, mode)
+    adjusted_contrasts = contrast_ratios(adjusted_values, reference_luminance)
+
+    search_count = len(search_indexes)
+    for position, idx in enumerate(search_indexes):
+        candidates = [
+            (adjusted_contrasts[candidate] < min_contrast,
+             abs(amounts[candidate]), -adjusted_contrasts[candidate],
+             candidate)
+            for candidate in (position, position + search_count)
+        ]
+        candidate = min(candidates)[3]
+        results[idx] = (adjusted_values[candidate], amounts[candidate],
+                        adjusted_contrasts[candidate])
+
+    return results
+
+
+def settings_error(min_contrast, mode):
+    """
+    Checks the optimizer settings.
+
+    :param min_contrast: float, the contrast ratio to meet 1.0-21.0.
+    :param mode: str, the adjustment mode, brightness or lightness.
+    :return: str, the error message or None if the settings are valid.
+    """
+
+    if (
+            not isinstance(min_contrast, (int, float))
+            or not 1.0 <= min_contrast <= 21.0
+    ):
+        return 'Contrast ratio must be between 1.0-21.0!'
+
+    if mode not in ADJUSTMENT_MODES:
+        return f'Value {mode} is not a valid adjustment mode!'
+
+    return None
+
+
+def optimize_palette(palette, reference_color,
+                     min_contrast=DEFAULT_MIN_CONTRAST, mode='brightness'):
+    """
+    Adjusts the colors in the palette's color scheme to meet the contrast
+    ratio against the reference color. The palette itself isn't modified.
+
+    :param palette: Palette, the palette with the color scheme to adjust.
+    :param reference_color: Color, the color to contrast against.
+    :param min_contrast: float, the contrast ratio to meet 1.0-21.0.
+    :param mode: str, the adjustment mode, brightness or lightness.
+    :return: list, the adjusted scheme colors as new Color instances.
+    """
+
+    if not isinstance(palette, Palette):
+        show_error('Invalid palette to optimize received!')
+        return
+
+    if not isinstance(reference_color, Color):
+        show_error('Invalid reference color received!')
+        return
+
+    error_message = settings_error(min_contrast, mode)
+    if error_message is not None:
+        show_error(error_message)
+        return
+
+    scheme_colors = palette.get_scheme_colors()
+    results = optimize_rgb([color.values() for color in scheme_colors],
+                           reference_color.values(), min_contrast, mode)
+
+    return [Color(*rgb_value, color.name())
+            for color, (rgb_value, _, _) in zip(scheme_colors, results)]
+
+
+def optimize_chunk(rgb_palettes, reference_rgb, min_contrast, mode):
+    """
+    Optimizes a chunk of palettes as one batch of colors.
+
+    :param rgb_palettes: list, the palettes as lists of RGB value tuples.
+    :param reference_rgb: tuple, the RGB value of the reference color.
+    :param min_contrast: float, the contrast ratio to meet 1.0-21.0.
+    :param mode: str, the adjustment mode, brightness or lightness.
+    :return: list, the optimized palettes as lists of result tuples.
+    """
+
+    results = optimize_rgb(
+        [rgb_value for rgb_values in rgb_palettes for rgb_value in rgb_values],
+        reference_rgb, min_contrast, mode)
+
+    palettes = []
+    offset = 0
+    for rgb_values in rgb_palettes:
+        palettes.append(results[offset:offset + len(rgb_values)])
+        offset += len(rgb_values)
+
+    return palettes
+
+
+def optimize_batch(rgb_palettes, reference_rgb,
+                   min_contrast=DEFAULT_MIN_CONTRAST, mode='brightness',
+                   processes=None):
+    """
+    Optimizes thousands of palettes in parallel. The palettes are split into
+    chunks that are optimized in a pool of processes, small batches are
+    optimized in the calling process. Invalid settings raise ValueError,
+    the batch runs without the UI.
+
+    :param rgb_palettes: list, the palettes as lists of RGB value tuples.
+    :param reference_rgb: tuple, the RGB value of the reference color.
+    :param min_contrast: float, the contrast ratio to meet 1.0-21.0.
+    :param mode: str, the adjustment mode, brightness or lightness.
+    :param processes: int, the number of processes or None for one per CPU.
+    :return: list, the optimized palettes as lists of result tuples in the
+    given order.
+    """
+
+    error_message = settings_error(min_contrast, mode)
+    if error_message is not None:
+        raise ValueError(error_message)
+
+    rgb_palettes = [[tuple(rgb_value) for rgb_value in rgb_values]
+                    for rgb_values in rgb_palettes]
+    reference_rgb = tuple(reference_rgb)
+
+    if len(rgb_palettes) <= BATCH_CHUNK_SIZE or processes == 1:
+        return optimize_chunk(rgb_palettes, reference_rgb, min_contrast,
+                              mode)
+
+    chunks = [rgb_palettes[offset:offset + BATCH_CHUNK_SIZE]
+              for offset in range(0, len(rgb_palettes), BATCH_CHUNK_SIZE)]
+    optimize = functools.partial(optimize_chunk, reference_rgb=reference_rgb,
+                                 min_contrast=min_contrast, mode=mode)
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return [palette for chunk_results in executor.map(optimize, chunks)
+                for palette in chunk_results]
+
+
+def main():
+    from argument_types import hex_rgb, number_range, positive_int
+    from palette_snapshot import (COLOR_WHEEL_KEYS, DEFAULT_VARIANT_AMOUNTS,
+                                  build_snapshot, create_variant_palette)
+
+    parser = argparse.ArgumentParser(
+        description='Adjust the color schemes of every color wheel, root '
+                    'color and hue variant to meet a contrast ratio.')
+    parser.add_argument('--reference', type=hex_rgb, default='FFFFFF',
+                        help='hex code of the color to contrast against')
+    parser.add_argument('--contrast', type=number_range(float, 1.0, 21.0),
+                        default=DEFAULT_MIN_CONTRAST,
+                        help='contrast ratio to meet, 4.5 for WCAG AA text')
+    parser.add_argument('--mode', choices=ADJUSTMENT_MODES,
+                        default='brightness')
+    parser.add_argument('--processes', type=positive_int)
+    args = parser.parse_args()
+
+    snapshot = build_snapshot()
+
+    palette_names = []
+    rgb_palettes = []
+    for color_wheel_key in COLOR_WHEEL_KEYS:
+        for root_color_name in snapshot['wheels'][color_wheel_key]:
+            for hue_variant_key in ['HUE', 'TINT', 'SHADE', 'TONE']:
+                for color_scheme_key in COLOR_SCHEMES:
+                    palette = create_variant_palette(
+                        color_wheel_key, root_color_name, color_scheme_key,
+                        hue_variant_key, DEFAULT_VARIANT_AMOUNTS, snapshot)
+                    palette_names.append(
+                        f'{color_wheel_key} {root_color_name} '
+                        f'{hue_variant_key.title()} {color_scheme_key}')
+                    rgb_palettes.append([color.values() for color
+                                         in palette.get_scheme_colors()])
+
+    optimized_palettes = optimize_batch(rgb_palettes, args.reference,
+                                        args.contrast, args.mode,
+                                        args.processes)
+
+    for palette_name, results in zip(palette_names, optimized_palettes):
+        print(f'{palette_name}: ' + ', '.join(
+            f'#{red:02X}{green:02X}{blue:02X} ({contrast:.2f})'
+            for (red, green, blue), _, contrast in results))
+
+
+if __name__ == '__main__':
+    main()
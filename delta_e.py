@@ -0,0 +1,310 @@
+"""
+Color differences (ΔE) between CIELAB values with the CIE76, CIE94 and
+CIEDE2000 formulas. Differences are calculated from one color to many, from
+many colors to many and pairwise inside a collection, the pairwise form in
+chunks to bound memory.
+http://www2.ece.rochester.edu/~gsharma/ciede2000/
+"""
+
+from array import array
+import math
+
+from color import Color
+from color_space import rgb_to_lab
+from main import show_error
+from palette import Palette
+
+DEFAULT_METHOD = 'CIEDE2000'
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Note! CIE94 uses the graphic arts weights
+CIE94_K1 = 0.045
+CIE94_K2 = 0.015
+POW_25_7 = 25 ** 7
+
+
+def cie76(first_lab, second_lab):
+    """
+    Calculates the CIE76 color difference, the Euclidean distance in CIELAB.
+
+    :param first_lab: tuple, the first CIELAB value.
+    :param second_lab: tuple, the second CIELAB value.
+    :return: float, the color difference.
+    """
+
+    return math.dist(first_lab, second_lab)
+
+
+def cie94(first_lab, second_lab):
+    """
+    Calculates the CIE94 color difference. The first color is the reference
+    weighting the chroma and hue differences.
+
+    :param first_lab: tuple, the CIELAB value of the reference color.
+    :param second_lab: tuple, the CIELAB value of the sample color.
+    :return: float, the color difference.
+    """
+
+    first_lightness, first_a, first_b = first_lab
+    second_lightness, second_a, second_b = second_lab
+
+    first_chroma = math.hypot(first_a, first_b)
+    chroma_difference = first_chroma - math.hypot(second_a, second_b)
+    hue_difference_squared = max(
+        (first_a - second_a) ** 2 + (first_b - second_b) ** 2
+        - chroma_difference ** 2, 0.0)
+
+    return math.sqrt(
+        (first_lightness - second_lightness) ** 2
+        + (chroma_difference / (1 + CIE94_K1 * first_chroma)) ** 2
+        + hue_difference_squared / (1 + CIE94_K2 * first_chroma) ** 2
+    )
+
+
+def ciede2000(first_lab, second_lab):
+    """
+    Calculates the CIEDE2000 color difference with unit weighting factors.
+
+    :param first_lab: tuple, the first CIELAB value.
+    :param second_lab: tuple, the second CIELAB value.
+    :return: float, the color difference.
+    """
+
+    first_lightness, first_a, first_b = first_lab
+    second_lightness, second_a, second_b = second_lab
+
+    mean_chroma_7 = ((math.hypot(first_a, first_b)
+                      + math.hypot(second_a, second_b)) / 2) ** 7
+    a_scale = 1.5 - 0.5 * math.sqrt(mean_chroma_7
+                                    / (mean_chroma_7 + POW_25_7))
+
+    first_a *= a_scale
+    second_a *= a_scale
+    first_chroma = math.hypot(first_a, first_b)
+    second_chroma = math.hypot(second_a, second_b)
+    first_hue = math.atan2(first_b, first_a) % (2 * math.pi) \
+        if first_chroma else 0.0
+    second_hue = math.atan2(second_b, second_a) % (2 * math.pi) \
+        if second_chroma else 0.0
+
+    lightness_difference = second_lightness - first_lightness
+    chroma_difference = second_chroma - first_chroma
+
+    hue_difference = 0.0
+    mean_hue = first_hue + second_hue
+    if first_chroma and second_chroma:
+        hue_difference = second_hue - first_hue
+        if hue_difference > math.pi:
+            hue_difference -= 2 * math.pi
+        elif hue_difference < -math.pi:
+            hue_difference += 2 * math.pi
+
+        if abs(first_hue - second_hue) <= math.pi:
+            mean_hue /= 2
+        elif mean_hue < 2 * math.pi:
+            mean_hue = (mean_hue + 2 * math.pi) / 2
+        else:
+            mean_hue = (mean_hue - 2 * math.pi) / 2
+
+    hue_difference = 2 * math.sqrt(first_chroma * second_chroma) \
+        * math.sin(hue_difference / 2)
+
+    mean_lightness = (first_lightness + second_lightness) / 2
+    mean_chroma = (first_chroma + second_chroma) / 2
+    mean_chroma_7 = mean_chroma ** 7
+
+    hue_weight = (1 - 0.17 * math.cos(mean_hue - math.radians(30))
+                  + 0.24 * math.cos(2 * mean_hue)
+                  + 0.32 * math.cos(3 * mean_hue + math.radians(6))
+                  - 0.20 * math.cos(4 * mean_hue - math.radians(63)))
+    rotation_angle = math.radians(60) * math.exp(
+        -((math.degrees(mean_hue) - 275) / 25) ** 2)
+    rotation = -2 * math.sqrt(mean_chroma_7 / (mean_chroma_7 + POW_25_7)) \
+        * math.sin(rotation_angle)
+
+    lightness_scale = 1 + 0.015 * (mean_lightness - 50) ** 2 / math.sqrt(
+        20 + (mean_lightness - 50) ** 2)
+    chroma_scale = 1 + 0.045 * mean_chroma
+    hue_scale = 1 + 0.015 * mean_chroma * hue_weight
+
+    lightness_term = lightness_difference / lightness_scale
+    chroma_term = chroma_difference / chroma_scale
+    hue_term = hue_difference / hue_scale
+
+    return math.sqrt(lightness_term ** 2 + chroma_term ** 2 + hue_term ** 2
+                     + rotation * chroma_term * hue_term)
+
+
+METHODS = {
+    'CIE76': cie76,
+    'CIE94': cie94,
+    'CIEDE2000': ciede2000
+}
+
+
+def get_method(method):
+    """
+    Fetches the difference function of a method.
+
+    :param method: str, the method, one of CIE76, CIE94 or CIEDE2000.
+    :return: function, the difference function or None if invalid.
+    """
+
+    if method not in METHODS:
+        show_error(f'Value {method} is not a valid color difference method!')
+        return
+
+    return METHODS[method]
+
+
+def one_to_many(lab_value, lab_values, method=DEFAULT_METHOD):
+    """
+    Calculates the differences from one color to many.
+
+    :param lab_value: tuple, the CIELAB value of the reference color.
+    :param lab_values: list, the CIELAB values to compare to.
+    :param method: str, the method, one of CIE76, CIE94 or CIEDE2000.
+    :return: list, the color differences.
+    """
+
+    difference = get_method(method)
+    if difference is None:
+        return
+
+    return [difference(lab_value, other_lab) for other_lab in lab_values]
+
+
+def many_to_many(first_values, second_values, method=DEFAULT_METHOD):
+    """
+    Calculates the differences from every color to every other color.
+
+    :param first_values: list, the CIELAB values of the reference colors.
+    :param second_values: list, the CIELAB values to compare to.
+    :param method: str, the method, one of CIE76, CIE94 or CIEDE2000.
+    :return: list, a row of color differences for each reference color.
+    """
+
+    difference = get_method(method)
+    if difference is None:
+        return
+
+    return [[difference(lab_value, other_lab) for other_lab in second_values]
+            for lab_value in first_values]
+
+
+def pairwise_chunks(lab_values, method=DEFAULT_METHOD,
+                    chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Calculates the differences between every pair of colors a chunk at a
+    time. Pairs are in the condensed order (0, 1), (0, 2) ... (1, 2) ...
+
+    :param lab_values: list, the CIELAB values.
+    :param method: str, the method, one of CIE76, CIE94 or CIEDE2000.
+    :param chunk_size: int, the number of differences per chunk.
+    :return: generator, the differences as arrays of doubles.
+    """
+
+    difference = get_method(method)
+    if difference is None:
+        return
+
+    chunk = array('d')
+    for first_idx, lab_value in enumerate(lab_values):
+        for other_lab in lab_values[first_idx + 1:]:
+            chunk.append(difference(lab_value, other_lab))
+
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = array('d')
+
+    if chunk:
+        yield chunk
+
+
+def pairwise(lab_values, method=DEFAULT_METHOD,
+             chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Calculates the differences between every pair of colors into a condensed
+    array of n * (n - 1) / 2 doubles.
+
+    :param lab_values: list, the CIELAB values.
+    :param method: str, the method, one of CIE76, CIE94 or CIEDE2000.
+    :param chunk_size: int, the number of differences calculated at a time.
+    :return: array, the differences in the condensed pair order.
+    """
+
+    if get_method(method) is None:
+        return
+
+    differences = array('d')
+    for chunk in pairwise_chunks(lab_values, method, chunk_size):
+        differences.extend(chunk)
+
+    return differences
+
+
+def minimum_pairwise(lab_values, method=DEFAULT_METHOD,
+                     chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Finds the smallest difference between any two colors without keeping all
+    the differences in memory.
+
+    :param lab_values: list, the CIELAB values.
+    :param method: str, the method, one of CIE76, CIE94 or CIEDE2000.
+    :param chunk_size: int, the number of differences calculated at a time.
+    :return: float, the smallest difference or infinity for less than two
+    colors.
+    """
+
+    if get_method(method) is None:
+        return
+
+    return min((min(chunk) for chunk
+                in pairwise_chunks(lab_values, method, chunk_size)),
+               default=math.inf)
+
+
+def closest_color(color, palette, method=DEFAULT_METHOD):
+    """
+    Finds the color in the palette closest to the color, like the wheel hue
+    matching a picked color.
+
+    :param color: Color, the color to match.
+    :param palette: Palette, the palette to search.
+    :param method: str, the method, one of CIE76, CIE94 or CIEDE2000.
+    :return: tuple, the closest palette color and its difference.
+    """
+
+    if not isinstance(color, Color) or not isinstance(palette, Palette):
+        show_error('Invalid color or palette to match received!')
+        return
+
+    colors = palette.values()
+    lab_values = rgb_to_lab([color.values()] + [palette_color.values()
+                                                for palette_color in colors])
+    differences = one_to_many(lab_values[0], lab_values[1:], method)
+    if differences is None:
+        return
+
+    closest_idx = min(range(len(colors)), key=differences.__getitem__)
+
+    return colors[closest_idx], differences[closest_idx]
+
+
+def scheme_distance(palette, method=DEFAULT_METHOD):
+    """
+    Finds the smallest difference between the colors in the palette's color
+    scheme to check they are distinct.
+
+    :param palette: Palette, the palette to check.
+    :param method: str, the method, one of CIE76, CIE94 or CIEDE2000.
+    :return: float, the smallest difference between the scheme colors.
+    """
+
+    if not isinstance(palette, Palette):
+        show_error('Invalid palette to check received!')
+        return
+
+    return minimum_pairwise(rgb_to_lab([color.values() for color
+                                        in palette.get_scheme_colors()]),
+                            method)
@@ -0,0 +1,151 @@
+import os
+import threading
+
+from instrumentation import timed
+from main import show_error
+
+
+class ExportJob:
+
+    def __init__(self, widget, path, chunks, chunk_count, progress_function,
+                 done_function, poll_interval_ms=50):
+        """
+        Creates an ExportJob instance that writes text to a file in chunks
+        from a background thread. The text is written to a temporary file
+        next to the target that replaces the target only once everything has
+        been written, so a cancelled or failed export never leaves a partial
+        file. Progress and the outcome are handed to the Tk thread by polling
+        with after.
+
+        :param widget: tkinter.Misc, the widget whose event loop gets updates.
+        :param path: str, the path of the file to write.
+        :param chunks: iterator, the text chunks to write.
+        :param chunk_count: int, the number of chunks to write.
+        :param progress_function: function, called with the number of chunks
+        written and the number of chunks in total.
+        :param done_function: function, called with the outcome, done,
+        cancelled or failed.
+        :param poll_interval_ms: int, the time between progress polls in ms.
+        """
+
+        self.__widget = widget
+        self.__path = path
+        self.__chunks = chunks
+        self.__chunk_count = chunk_count
+        self.__progress_function = progress_function
+        self.__done_function = done_function
+        self.__poll_interval_ms = poll_interval_ms
+
+        self.__cancel_event = threading.Event()
+        self.__written_count = 0
+        self.__outcome = None
+        self.__thread = None
+        self.__poll_after_id = None
+
+    def start(self):
+        """
+        Starts writing the file in the background.
+        """
+
+        if self.__thread is not None:
+            show_error('The export has already been started!')
+            return
+
+        self.__thread = threading.Thread(target=self.__write, daemon=True)
+        self.__thread.start()
+        self.__poll_after_id = self.__widget.after(self.__poll_interval_ms,
+                                                   self.__poll_progress)
+
+    def cancel(self):
+        """
+        Stops the export after the chunk being written and removes the
+        temporary file. The target file is left as it was.
+        """
+
+        self.__cancel_event.set()
+
+    def is_running(self):
+        """
+        Tells whether the export is still writing.
+
+        :return: bool, True if the export is in progress.
+        """
+
+        return self.__thread is not None and self.__outcome is None
+
+    def wait(self, timeout=None):
+        """
+        Waits for the background thread to stop writing.
+
+        :param timeout: float, the time to wait at most in seconds or None.
+        """
+
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+    @timed('export.write_file')
+    def __write(self):
+        """
+        Writes the chunks to a temporary file and moves it over the target.
+        Runs in the background thread.
+        """
+
+        temporary_path = self.__path + '.tmp'
+
+        try:
+            with open(temporary_path, 'w') as file:
+                for chunk in self.__chunks:
+                    if self.__cancel_event.is_set():
+                        break
+
+                    file.write(chunk)
+                    self.__written_count += 1
+
+            if not self.__cancel_event.is_set():
+                os.replace(temporary_path, self.__path)
+                self.__outcome = 'done'
+        except OSError:
+            # Note! Failed writes are reported as the outcome below
+            pass
+        finally:
+            # Note! Unexpected errors fail the export too instead of leaving
+            # the UI waiting for it
+            if self.__outcome is None:
+                try:
+                    os.remove(temporary_path)
+                except OSError:
+                    pass
+
+                self.__outcome = 'cancelled' \
+                    if self.__cancel_event.is_set() else 'failed'
+
+    def __poll_progress(self):
+        """
+        Reports the progress on the Tk thread and the outcome once the export
+        has stopped.
+        """
+
+        self.__poll_after_id = None
+
+        # Note! The outcome is read before the progress so the last progress
+        # report is complete
+        outcome = self.__outcome
+        self.__progress_function(self.__written_count, self.__chunk_count)
+
+        if outcome is not None:
+            self.__done_function(outcome)
+            return
+
+        self.__poll_after_id = self.__widget.after(self.__poll_interval_ms,
+                                                   self.__poll_progress)
+
+    def shutdown(self):
+        """
+        Cancels the export and stops reporting to the Tk thread.
+        """
+
+        self.cancel()
+
+        if self.__poll_after_id is not None:
+            self.__widget.after_cancel(self.__poll_after_id)
+            self.__poll_after_id = None
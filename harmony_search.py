@@ -0,0 +1,420 @@
+"""
+Search for harmonious palettes over continuous OKLCh lightness, chroma and
+hue. Candidate color schemes are scored on how closely their hues follow the
+angles of a color scheme, their contrast against a reference color and the
+smallest perceptual distance between their colors. The search is simulated
+annealing with several chains scored in one batch per step, and seeded
+restarts run in a pool of processes.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import math
+import random
+
+from color import Color
+from color_space import (oklab_to_linear, oklab_to_oklch, oklab_to_rgb,
+                         oklch_to_oklab, rgb_to_linear, rgb_to_oklab)
+from palette import COLOR_SCHEMES, Palette
+
+WHEEL_SLOT_COUNT = 12
+SLOT_ANGLE = 2 * math.pi / WHEEL_SLOT_COUNT
+MAX_CHROMA = 0.37
+
+DEFAULT_STEP_COUNT = 1500
+DEFAULT_CHAIN_COUNT = 16
+DEFAULT_RESTART_COUNT = 8
+START_TEMPERATURE = 1.0
+END_TEMPERATURE = 0.001
+
+# Note! Weights of the scoring terms, each term is normalized so that 1.0 is
+# a clearly unusable scheme
+ANGLE_WEIGHT = 1.0
+CONTRAST_WEIGHT = 1.0
+DISTANCE_WEIGHT = 1.0
+CHROMA_WEIGHT = 0.25
+GAMUT_WEIGHT = 10.0
+ANGLE_TOLERANCE = math.radians(15)
+TARGET_CHROMA = 0.1
+DUPLICATE_DISTANCE = 0.02
+
+
+def wrap_angle(angle):
+    """
+    Wraps an angle to the range -pi-pi.
+
+    :param angle: float, the angle in radians.
+    :return: float, the wrapped angle.
+    """
+
+    return (angle + math.pi) % (2 * math.pi) - math.pi
+
+
+def score_candidates(candidates, scheme_angles, reference_luminance,
+                     min_contrast, min_distance):
+    """
+    Scores candidate color schemes in one batch. Lower costs are better.
+
+    :param candidates: list, the candidates as lists of OKLCh value tuples,
+    the first color being the root color.
+    :param scheme_angles: list, the hue angles of the color scheme from the
+    root color in radians.
+    :param reference_luminance: float, the relative luminance of the color
+    to contrast against.
+    :param min_contrast: float, the contrast ratio every color should meet.
+    :param min_distance: float, the OKLab distance every color pair should
+    keep.
+    :return: list, the costs of the candidates.
+    """
+
+    color_count = len(scheme_angles)
+    oklab_values = oklch_to_oklab(
+        [oklch_value for candidate in candidates for oklch_value in candidate])
+    linear_values = oklab_to_linear(oklab_values)
+
+    costs = []
+    for idx, candidate in enumerate(candidates):
+        offset = idx * color_count
+        root_hue = candidate[0][2]
+
+        angle_cost = sum(
+            wrap_angle(hue - root_hue - scheme_angle) ** 2
+            for (_, _, hue), scheme_angle in zip(candidate, scheme_angles)
+        ) / color_count / ANGLE_TOLERANCE ** 2
+
+        chroma_cost = sum(max(TARGET_CHROMA - chroma, 0.0)
+                          for _, chroma, _ in candidate) \
+            / color_count / TARGET_CHROMA
+
+        contrast_cost = 0.0
+        gamut_cost = 0.0
+        for red, green, blue in linear_values[offset:offset + color_count]:
+            gamut_cost += (max(-red, red - 1, 0.0)
+                           + max(-green, green - 1, 0.0)
+                           + max(-blue, blue - 1, 0.0))
+
+            luminance = (0.2126 * min(max(red, 0.0), 1.0)
+                         + 0.7152 * min(max(green, 0.0), 1.0)
+                         + 0.0722 * min(max(blue, 0.0), 1.0))
+            contrast = (max(luminance, reference_luminance) + 0.05) \
+                / (min(luminance, reference_luminance) + 0.05)
+            contrast_cost += max(min_contrast - contrast, 0.0) / min_contrast
+        contrast_cost /= color_count
+
+        candidate_oklab_values = oklab_values[offset:offset + color_count]
+        closest_distance = min(
+            math.dist(candidate_oklab_values[first],
+                      candidate_oklab_values[second])
+            for first in range(color_count)
+            for second in range(first + 1, color_count)
+        ) if color_count > 1 else min_distance
+        distance_cost = max(min_distance - closest_distance, 0.0) \
+            / min_distance
+
+        costs.append(ANGLE_WEIGHT * angle_cost + CHROMA_WEIGHT * chroma_cost
+                     + CONTRAST_WEIGHT * contrast_cost
+                     + DISTANCE_WEIGHT * distance_cost
+                     + GAMUT_WEIGHT * gamut_cost)
+
+    return costs
+
+
+def random_candidate(rng, scheme_angles, root_value=None):
+    """
+    Creates a random candidate following the scheme angles.
+
+    :param rng: Random, the random number generator.
+    :param scheme_angles: list, the hue angles of the color scheme.
+    :param root_value: tuple, the fixed OKLCh value of the root color or None
+    to randomize it.
+    :return: list, the candidate as OKLCh value tuples.
+    """
+
+    if root_value is None:
+        root_value = (rng.uniform(0.3, 0.9), rng.uniform(0.02, 0.2),
+                      rng.uniform(-math.pi, math.pi))
+
+    return [root_value] + [
+        (rng.uniform(0.3, 0.9), rng.uniform(0.02, 0.2),
+         wrap_angle(root_value[2] + scheme_angle))
+        for scheme_angle in scheme_angles[1:]
+    ]
+
+
+def perturb(rng, candidate, temperature_fraction, fixed_root):
+    """
+    Proposes a neighbor of the candidate by moving one of its colors. The
+    moves shrink as the search cools down.
+
+    :param rng: Random, the random number generator.
+    :param candidate: list, the candidate as OKLCh value tuples.
+    :param temperature_fraction: float, the temperature relative to the start
+    temperature 0.0-1.0.
+    :param fixed_root: bool, True to keep the root color unchanged.
+    :return: list, the proposed candidate.
+    """
+
+    step_scale = 0.05 + 0.95 * temperature_fraction
+    idx = rng.randrange(1 if fixed_root else 0, len(candidate))
+    lightness, chroma, hue = candidate[idx]
+
+    proposal = list(candidate)
+    proposal[idx] = (
+        min(max(lightness + rng.gauss(0.0, 0.1 * step_scale), 0.0), 1.0),
+        min(max(chroma + rng.gauss(0.0, 0.04 * step_scale), 0.0), MAX_CHROMA),
+        wrap_angle(hue + rng.gauss(0.0, 0.5 * step_scale))
+    )
+
+    return proposal
+
+
+def anneal(seed, scheme_angles, reference_luminance, min_contrast,
+           min_distance, root_value=None, step_count=DEFAULT_STEP_COUNT,
+           chain_count=DEFAULT_CHAIN_COUNT):
+    """
+    Runs a restart of simulated annealing. The chains advance in lockstep so
+    the proposals of every chain are scored in one batch.
+
+    :param seed: int, the seed of the restart.
+    :param scheme_angles: list, the hue angles of the color scheme.
+    :param reference_luminance: float, the relative luminance of the color
+    to contrast against.
+    :param min_contrast: float, the contrast ratio every color should meet.
+    :param min_distance: float, the OKLab distance every color pair should
+    keep.
+    :param root_value: tuple, the fixed OKLCh value of the root color or None
+    to search it too.
+    :param step_count: int, the number of annealing steps.
+    :param chain_count: int, the number of chains.
+    :return: list, the best cost and candidate of every chain as tuples.
+    """
+
+    rng = random.Random(seed)
+    score = functools.partial(score_candidates, scheme_angles=scheme_angles,
+                              reference_luminance=reference_luminance,
+                              min_contrast=min_contrast,
+                              min_distance=min_distance)
+    fixed_root = root_value is not None
+
+    chains = [random_candidate(rng, scheme_angles, root_value)
+              for _ in range(chain_count)]
+    costs = score(chains)
+    best = list(zip(costs, chains))
+
+    cooling = (END_TEMPERATURE / START_TEMPERATURE) ** (1 / max(step_count,
+                                                                1))
+    temperature = START_TEMPERATURE
+    for _ in range(step_count):
+        temperature_fraction = temperature / START_TEMPERATURE
+        proposals = [perturb(rng, chain, temperature_fraction, fixed_root)
+                     for chain in chains]
+        proposal_costs = score(proposals)
+
+        for idx, proposal_cost in enumerate(proposal_costs):
+            cost_change = proposal_cost - costs[idx]
+            if (
+                    cost_change <= 0
+                    or rng.random() < math.exp(-cost_change / temperature)
+            ):
+                chains[idx] = proposals[idx]
+                costs[idx] = proposal_cost
+
+                if proposal_cost < best[idx][0]:
+                    best[idx] = (proposal_cost, proposals[idx])
+
+        temperature *= cooling
+
+    return best
+
+
+def candidate_to_palette(candidate, scheme_key, scheme_indexes):
+    """
+    Creates a palette with the candidate's colors in the scheme's color wheel
+    slots. The other slots follow the wheel's hue steps with the lightness,
+    chroma and hue deviation interpolated between the neighboring scheme
+    colors.
+
+    :param candidate: list, the candidate as OKLCh value tuples.
+    :param scheme_key: str, the color scheme of the candidate.
+    :param scheme_indexes: list, the color wheel slots of the scheme colors.
+    :return: Palette, the palette with the color scheme set.
+    """
+
+    root_hue = candidate[0][2]
+    slot_values = {
+        scheme_index: (lightness, chroma,
+                       wrap_angle(hue - root_hue - scheme_index * SLOT_ANGLE))
+        for scheme_index, (lightness, chroma, hue)
+        in zip(scheme_indexes, candidate)
+    }
+    sorted_slots = sorted(slot_values)
+
+    oklch_values = []
+    for slot in range(WHEEL_SLOT_COUNT):
+        if slot in slot_values:
+            lightness, chroma, deviation = slot_values[slot]
+        else:
+            previous_slot = max((scheme_slot for scheme_slot in sorted_slots
+                                 if scheme_slot < slot),
+                                default=sorted_slots[-1])
+            next_slot = min((scheme_slot for scheme_slot in sorted_slots
+                             if scheme_slot > slot),
+                            default=sorted_slots[0])
+            span = (next_slot - previous_slot) % WHEEL_SLOT_COUNT \
+                or WHEEL_SLOT_COUNT
+            fraction = (slot - previous_slot) % WHEEL_SLOT_COUNT / span
+
+            lightness, chroma, deviation = (
+                previous_value + (next_value - previous_value) * fraction
+                for previous_value, next_value
+                in zip(slot_values[previous_slot], slot_values[next_slot])
+            )
+
+        oklch_values.append((lightness, chroma,
+                             root_hue + slot * SLOT_ANGLE + deviation))
+
+    colors = [
+        Color(*rgb_value,
+              f'Hue {round(math.degrees(hue)) % 360}\N{DEGREE SIGN}')
+        for rgb_value, (_, _, hue)
+        in zip(oklab_to_rgb(oklch_to_oklab(oklch_values)), oklch_values)
+    ]
+
+    palette = Palette('RGB', colors)
+    palette.set_color_scheme(scheme_key)
+    palette.set_picked_color(colors[0])
+
+    return palette
+
+
+def search(color_scheme_key, result_count=5, reference_color=None,
+           min_contrast=3.0, min_distance=0.1, root_color=None,
+           restart_count=DEFAULT_RESTART_COUNT, step_count=DEFAULT_STEP_COUNT,
+           chain_count=DEFAULT_CHAIN_COUNT, seed=0, processes=None):
+    """
+    Searches the best palettes for a color scheme with seeded restarts of
+    simulated annealing run in a pool of processes. Invalid arguments raise
+    ValueError, the search runs without the UI.
+
+    :param color_scheme_key: str, the color scheme whose angles to follow.
+    :param result_count: int, the number of palettes to return.
+    :param reference_color: Color, the color to contrast against, white by
+    default.
+    :param min_contrast: float, the contrast ratio every color should meet.
+    :param min_distance: float, the OKLab distance every color pair should
+    keep.
+    :param root_color: Color, the root color to keep or None to search it
+    too.
+    :param restart_count: int, the number of seeded restarts.
+    :param step_count: int, the number of annealing steps per restart.
+    :param chain_count: int, the number of chains per restart.
+    :param seed: int, the seed of the first restart.
+    :param processes: int, the number of processes or None for one per CPU.
+    :return: list, the best palettes with the color scheme set, best first.
+    """
+
+    if color_scheme_key not in COLOR_SCHEMES:
+        raise ValueError(f'Value {color_scheme_key} is not a valid color '
+                         f'scheme!')
+
+    if reference_color is None:
+        reference_color = Color(255, 255, 255, 'White')
+
+    if (
+            not isinstance(reference_color, Color)
+            or (root_color is not None and not isinstance(root_color, Color))
+    ):
+        raise ValueError('Invalid color to search palettes with received!')
+
+    if not isinstance(result_count, int) or result_count < 1:
+        raise ValueError('Invalid number of palettes to search received!')
+
+    if not 1.0 <= min_contrast <= 21.0:
+        raise ValueError('Contrast ratio must be between 1.0-21.0!')
+
+    if not min_distance > 0.0:
+        raise ValueError('Color distance must be greater than 0.0!')
+
+    scheme_indexes = Palette().get_scheme_indexes(color_scheme_key)
+    scheme_angles = [scheme_index * SLOT_ANGLE
+                     for scheme_index in scheme_indexes]
+    reference_red, reference_green, reference_blue = rgb_to_linear(
+        [reference_color.values()])[0]
+    reference_luminance = (0.2126 * reference_red + 0.7152 * reference_green
+                           + 0.0722 * reference_blue)
+    root_value = None
+    if root_color is not None:
+        root_value = oklab_to_oklch(rgb_to_oklab([root_color.values()]))[0]
+
+    run_restart = functools.partial(
+        anneal, scheme_angles=scheme_angles,
+        reference_luminance=reference_luminance, min_contrast=min_contrast,
+        min_distance=min_distance, root_value=root_value,
+        step_count=step_count, chain_count=chain_count)
+    seeds = range(seed, seed + restart_count)
+
+    if processes == 1 or restart_count == 1:
+        restart_results = map(run_restart, seeds)
+        results = [result for restart in restart_results
+                   for result in restart]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = [result for restart in executor.map(run_restart, seeds)
+                       for result in restart]
+
+    # Note! Chains often settle to the same optimum, near duplicates of a
+    # better result are skipped
+    best_results = []
+    for cost, candidate in sorted(results, key=lambda result: result[0]):
+        oklab_values = oklch_to_oklab(candidate)
+        if any(max(math.dist(value, kept_value) for value, kept_value
+                   in zip(oklab_values, kept_values)) < DUPLICATE_DISTANCE
+               for kept_values in best_results):
+            continue
+
+        best_results.append(oklab_values)
+        if len(best_results) == result_count:
+            break
+
+    return [
+        candidate_to_palette(oklab_to_oklch(oklab_values), color_scheme_key,
+                             scheme_indexes)
+        for oklab_values in best_results
+    ]
+
+
+def main():
+    from argument_types import number_range, positive_float, positive_int
+    from palette_export import palette_to_text
+
+    parser = argparse.ArgumentParser(
+        description='Search palettes following a color scheme over '
+                    'continuous hue, chroma and lightness.')
+    parser.add_argument('scheme', choices=list(COLOR_SCHEMES),
+                        help='color scheme, e.g. Triadic')
+    parser.add_argument('--results', type=positive_int, default=5)
+    parser.add_argument('--contrast', type=number_range(float, 1.0, 21.0),
+                        default=3.0,
+                        help='contrast ratio against white to meet')
+    parser.add_argument('--distance', type=positive_float, default=0.1,
+                        help='smallest OKLab distance between the colors')
+    parser.add_argument('--restarts', type=positive_int,
+                        default=DEFAULT_RESTART_COUNT)
+    parser.add_argument('--steps', type=positive_int,
+                        default=DEFAULT_STEP_COUNT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=positive_int)
+    args = parser.parse_args()
+
+    palettes = search(args.scheme, args.results, min_contrast=args.contrast,
+                      min_distance=args.distance,
+                      restart_count=args.restarts, step_count=args.steps,
+                      seed=args.seed, processes=args.processes)
+
+    for palette in palettes:
+        print(palette_to_text(palette))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""
+Opt-in counters and timing histograms for the hot paths. Instrumentation is
+enabled by setting the COLORIAN_STATS environment variable or calling enable.
+When disabled the instrumented functions only check one flag before running.
+Setting COLORIAN_STATS_FILE also enables it and dumps the stats as JSON to
+the file on exit.
+"""
+
+import atexit
+import functools
+import json
+import os
+import time
+
+
+# Note! Histogram buckets are powers of two microseconds, the last bucket
+# collects everything slower than about a second
+HISTOGRAM_BUCKET_COUNT = 21
+
+_enabled = bool(os.environ.get('COLORIAN_STATS')
+                or os.environ.get('COLORIAN_STATS_FILE'))
+_counters = {}
+_timings = {}
+
+
+def enable():
+    """
+    Starts collecting counters and timings.
+    """
+
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """
+    Stops collecting counters and timings. Collected stats are kept.
+    """
+
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """
+    Tells whether counters and timings are being collected.
+
+    :return: bool, True if instrumentation is enabled.
+    """
+
+    return _enabled
+
+
+def reset():
+    """
+    Clears all the collected counters and timings.
+    """
+
+    _counters.clear()
+    _timings.clear()
+
+
+def count(name, amount=1):
+    """
+    Increments a counter when instrumentation is enabled.
+
+    :param name: str, the name of the counter.
+    :param amount: int, the amount to increment by.
+    """
+
+    if not _enabled:
+        return
+
+    _counters[name] = _counters.get(name, 0) + amount
+
+
+def record_time(name, seconds):
+    """
+    Adds a measured time to a timing histogram when instrumentation is
+    enabled.
+
+    :param name: str, the name of the timing.
+    :param seconds: float, the measured time in seconds.
+    """
+
+    if not _enabled:
+        return
+
+    timing = _timings.get(name)
+    if timing is None:
+        timing = {
+            'count': 0,
+            'total': 0.0,
+            'min': seconds,
+            'max': seconds,
+            'buckets': [0] * HISTOGRAM_BUCKET_COUNT
+        }
+        _timings[name] = timing
+
+    timing['count'] += 1
+    timing['total'] += seconds
+    timing['min'] = min(timing['min'], seconds)
+    timing['max'] = max(timing['max'], seconds)
+
+    bucket = min(int(seconds * 1000000).bit_length(),
+                 HISTOGRAM_BUCKET_COUNT - 1)
+    timing['buckets'][bucket] += 1
+
+
+def timed(name):
+    """
+    Decorates a function to count its calls and record their durations under
+    the name when instrumentation is enabled.
+
+    :param name: str, the name of the timing.
+    :return: function, the decorator.
+    """
+
+    def decorator(function):
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+
+            start_time = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record_time(name, time.perf_counter() - start_time)
+
+        return wrapper
+
+    return decorator
+
+
+class Timer:
+
+    def __init__(self, name):
+        """
+        Creates a Timer instance that records the duration of a with block
+        under the name when instrumentation is enabled.
+
+        :param name: str, the name of the timing.
+        """
+
+        self.__name = name
+        self.__start_time = None
+
+    def __enter__(self):
+        if _enabled:
+            self.__start_time = time.perf_counter()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.__start_time is not None:
+            record_time(self.__name,
+                        time.perf_counter() - self.__start_time)
+            self.__start_time = None
+
+
+def stats():
+    """
+    Takes a snapshot of the collected counters and timings. Times are in
+    milliseconds and the histograms are keyed by the upper bound of each
+    bucket in microseconds.
+
+    :return: dict, the counters and timings.
+    """
+
+    timings = {}
+    for name, timing in _timings.items():
+        histogram = {}
+        for bucket, bucket_count in enumerate(timing['buckets']):
+            if bucket_count:
+                upper_bound = 'inf' if bucket == HISTOGRAM_BUCKET_COUNT - 1 \
+                    else f'<{2 ** bucket}us'
+                histogram[upper_bound] = bucket_count
+
+        timings[name] = {
+            'count': timing['count'],
+            'total_ms': timing['total'] * 1000,
+            'mean_ms': timing['total'] / timing['count'] * 1000,
+            'min_ms': timing['min'] * 1000,
+            'max_ms': timing['max'] * 1000,
+            'histogram': histogram
+        }
+
+    return {
+        'enabled': _enabled,
+        'counters': dict(_counters),
+        'timings': timings
+    }
+
+
+def dump_stats(path):
+    """
+    Writes the snapshot of the collected stats to a JSON file.
+
+    :param path: str, the path of the file to write.
+    """
+
+    with open(path, 'w') as file:
+        json.dump(stats(), file, indent=2)
+
+
+def _dump_stats_on_exit():
+    stats_path = os.environ.get('COLORIAN_STATS_FILE')
+    if stats_path and (_counters or _timings):
+        dump_stats(stats_path)
+
+
+atexit.register(_dump_stats_on_exit)
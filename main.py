@@ -2,8 +2,6 @@ import os
 import sys
 from tkinter import messagebox
 
-import colorian_ui
-
 
 def show_error(error_message):
     """
@@ -30,6 +28,10 @@ def resource_path(relative_path):
 
 
 def main():
+    # Note! Imported here so the color and palette modules importing the
+    # helpers above can be used without the UI
+    import colorian_ui
+
     colorian_ui.ColorianUI()
 
 
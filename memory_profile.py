@@ -0,0 +1,335 @@
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+from argument_types import number_range, positive_int
+from palette import COLOR_SCHEMES, Palette
+from palette_export import palette_to_text
+from palette_snapshot import (COLOR_WHEEL_KEYS, DEFAULT_VARIANT_AMOUNTS,
+                              build_snapshot, create_variant_palette)
+
+HUE_VARIANT_KEYS = ['HUE', 'TINT', 'SHADE', 'TONE']
+HUE_VARIANT_TITLES = ['Hue', 'Tint', 'Shade', 'Tone']
+COLOR_SCHEME_KEYS = list(COLOR_SCHEMES)
+ACTIONS = ['pick', 'variant', 'scheme', 'hue', 'brightness', 'export']
+
+# Note! The undo history of the UI session is kept small so it fills up
+# during the warmup and its growth isn't counted as retained memory
+UI_HISTORY_BUDGET = 64 * 1024
+
+
+class ModelSession:
+
+    def __init__(self, seed, snapshot=None):
+        """
+        Creates a ModelSession instance that replays user actions against the
+        palettes the same way ColorianUI does without any widgets.
+
+        :param seed: int, the seed of the random actions.
+        :param snapshot: dict, the palette snapshot to create palettes from.
+        """
+
+        self.__random = random.Random(seed)
+        self.__snapshot = snapshot
+        self.__color_picker_palette = Palette()
+        self.__color_scheme_key = COLOR_SCHEME_KEYS[0]
+        self.__variant_palettes = {}
+        self.__selected_palette = None
+
+        self.pick()
+
+    def pick(self):
+        """
+        Picks a random color wheel and root color and recreates the palettes
+        of every hue variant.
+        """
+
+        color_wheel_key = self.__random.choice(COLOR_WHEEL_KEYS)
+        self.__color_picker_palette.set_color_wheel(color_wheel_key)
+        root_color = self.__color_picker_palette.random_color()
+        self.__color_picker_palette.set_picked_color(root_color)
+
+        self.__variant_palettes = {
+            hue_variant_key: create_variant_palette(
+                color_wheel_key, root_color.name(), self.__color_scheme_key,
+                hue_variant_key, DEFAULT_VARIANT_AMOUNTS,
+                snapshot=self.__snapshot)
+            for hue_variant_key in HUE_VARIANT_KEYS
+        }
+        self.__selected_palette = self.__variant_palettes['HUE']
+
+    def variant(self):
+        """
+        Selects a random hue variant palette.
+        """
+
+        self.__selected_palette = self.__variant_palettes[
+            self.__random.choice(HUE_VARIANT_KEYS)]
+        self.__selected_palette.set_color_scheme(self.__color_scheme_key)
+
+    def scheme(self):
+        """
+        Selects a random color scheme.
+        """
+
+        self.__color_scheme_key = self.__random.choice(COLOR_SCHEME_KEYS)
+        self.__selected_palette.set_color_scheme(self.__color_scheme_key)
+
+    def hue(self):
+        """
+        Picks a random hue from the color wheel.
+        """
+
+        self.__selected_palette.set_picked_color(
+            self.__selected_palette.random_color())
+
+    def brightness(self):
+        """
+        Sets a random brightness to the picked hue.
+        """
+
+        self.__selected_palette.get_picked_color().brightness(
+            self.__random.uniform(0.0, 255.0))
+
+    def export(self):
+        """
+        Converts the shown palette to export text.
+        """
+
+        palette_to_text(self.__selected_palette)
+
+    def run(self, action):
+        """
+        Runs one of the actions by name.
+
+        :param action: str, the name of the action.
+        """
+
+        getattr(self, action)()
+
+
+class UISession:
+
+    def __init__(self, seed):
+        """
+        Creates a UISession instance that replays user actions against a
+        ColorianUI built into a window. Needs a display, like a virtual one.
+        The session is journaled to a temporary file instead of the user's
+        own session, so every run starts from a clean session.
+
+        :param seed: int, the seed of the random actions.
+        """
+
+        import tkinter as tk
+
+        import colorian_ui
+
+        self.__random = random.Random(seed)
+        self.__session_directory = tempfile.TemporaryDirectory()
+        self.__original_session_path = os.environ.get('COLORIAN_SESSION')
+        os.environ['COLORIAN_SESSION'] = os.path.join(
+            self.__session_directory.name, 'session')
+
+        try:
+            self.__main_window = tk.Tk()
+            self.__ui = colorian_ui.ColorianUI(
+                self.__main_window, history_budget=UI_HISTORY_BUDGET)
+        except Exception:
+            self.restore_session_path()
+            raise
+
+        self.process_events()
+
+    def process_events(self):
+        """
+        Runs the event loop until the renders and background work are done.
+        """
+
+        for _ in range(3):
+            self.__main_window.update()
+            self.__main_window.after(20)
+        self.__main_window.update()
+
+    def count_widgets(self):
+        """
+        Counts the widgets in the window to notice leaking widgets.
+
+        :return: int, the number of widgets.
+        """
+
+        widgets = [self.__main_window]
+        widget_count = 0
+        while widgets:
+            widget = widgets.pop()
+            widget_count += 1
+            widgets.extend(widget.winfo_children())
+
+        return widget_count
+
+    def run(self, action):
+        """
+        Runs one of the actions by name and processes the resulting events.
+
+        :param action: str, the name of the action.
+        """
+
+        if action == 'pick':
+            self.__ui.pick_color(
+                self.__ui.get_color_picker_palette().random_color())
+        elif action == 'variant':
+            self.__ui.set_hue_variant(
+                self.__random.choice(HUE_VARIANT_TITLES))
+        elif action == 'scheme':
+            self.__ui.set_color_scheme(
+                color_scheme_key=self.__random.choice(COLOR_SCHEME_KEYS))
+        elif action == 'hue':
+            palette = self.__ui.get_selected_palette()
+            palette.set_picked_color(palette.random_color())
+        elif action == 'brightness':
+            self.__ui.get_selected_palette().get_picked_color().brightness(
+                self.__random.uniform(0.0, 255.0))
+            self.__ui.update_all_color_previews()
+        elif action == 'export':
+            palette_to_text(self.__ui.get_selected_palette())
+
+        self.process_events()
+
+    def restore_session_path(self):
+        """
+        Points the session journal back to the user's own session and removes
+        the temporary one.
+        """
+
+        if self.__original_session_path is None:
+            os.environ.pop('COLORIAN_SESSION', None)
+        else:
+            os.environ['COLORIAN_SESSION'] = self.__original_session_path
+
+        self.__session_directory.cleanup()
+
+    def close(self):
+        """
+        Closes the window and removes the temporary session.
+        """
+
+        self.__ui.close()
+        self.restore_session_path()
+
+
+def measure_session(session, action_count, warmup_count, seed):
+    """
+    Replays random actions in the session and measures how much memory stays
+    allocated after them. A warmup run fills caches before measuring.
+
+    :param session: ModelSession or UISession, the session to replay
+    actions in.
+    :param action_count: int, the number of measured actions.
+    :param warmup_count: int, the number of actions before measuring.
+    :param seed: int, the seed of the random actions.
+    :return: tuple, the retained bytes per action and the top allocation
+    sites of the growth.
+    """
+
+    action_random = random.Random(seed)
+
+    for _ in range(warmup_count):
+        session.run(action_random.choice(ACTIONS))
+
+    gc.collect()
+    start_snapshot = tracemalloc.take_snapshot()
+    start_size = tracemalloc.get_traced_memory()[0]
+
+    for _ in range(action_count):
+        session.run(action_random.choice(ACTIONS))
+
+    gc.collect()
+    retained_size = tracemalloc.get_traced_memory()[0] - start_size
+    growth_sites = tracemalloc.take_snapshot().compare_to(start_snapshot,
+                                                          'lineno')[:5]
+
+    return retained_size / action_count, growth_sites
+
+
+def report(name, retained_per_action, growth_sites, budget):
+    """
+    Prints the retained memory of a session and whether it's within budget.
+
+    :param name: str, the name of the session.
+    :param retained_per_action: float, the retained bytes per action.
+    :param growth_sites: list, the top allocation sites of the growth.
+    :param budget: float, the allowed retained bytes per action.
+    :return: bool, True if the session was within budget.
+    """
+
+    within_budget = retained_per_action <= budget
+    print(f'{name:<18} {retained_per_action:>10.1f} B/action retained '
+          f'(budget {budget:.0f}) {"OK" if within_budget else "FAIL"}')
+
+    if not within_budget:
+        for growth_site in growth_sites:
+            print(f'    {growth_site}')
+
+    return within_budget
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Replay scripted sessions and fail when retained memory '
+                    'per action grows over budget.')
+    parser.add_argument('--actions', type=positive_int, default=5000,
+                        help='number of measured actions per session')
+    parser.add_argument('--warmup', type=number_range(int, 0), default=500,
+                        help='number of actions before measuring')
+    parser.add_argument('--budget', type=float, default=64.0,
+                        help='allowed retained bytes per action')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--no-ui', action='store_true',
+                        help='skip the session against the Tk UI')
+    args = parser.parse_args()
+
+    tracemalloc.start(10)
+
+    sessions = [
+        ('model', lambda: ModelSession(args.seed)),
+        ('model (snapshot)',
+         lambda: ModelSession(args.seed, build_snapshot()))
+    ]
+
+    all_within_budget = True
+    for name, create_session in sessions:
+        retained_per_action, growth_sites = measure_session(
+            create_session(), args.actions, args.warmup, args.seed)
+        all_within_budget &= report(name, retained_per_action, growth_sites,
+                                    args.budget)
+
+    if not args.no_ui:
+        try:
+            ui_session = UISession(args.seed)
+        except Exception as error:
+            print(f'{"ui":<18} skipped, no display available ({error})')
+        else:
+            widget_count = ui_session.count_widgets()
+            ui_actions = max(args.actions // 10, 1)
+            retained_per_action, growth_sites = measure_session(
+                ui_session, ui_actions, args.warmup // 10, args.seed)
+            all_within_budget &= report('ui', retained_per_action,
+                                        growth_sites, args.budget)
+
+            widget_growth = ui_session.count_widgets() - widget_count
+            print(f'{"ui widgets":<18} {widget_growth:>+10d} after '
+                  f'{ui_actions} actions')
+            all_within_budget &= widget_growth <= 0
+            ui_session.close()
+
+    tracemalloc.stop()
+
+    if not all_within_budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,38 @@
 import random
 
-from color import Color
+from color import Color, shade_rgb, tint_rgb, tone_rgb
+from instrumentation import timed
 from main import show_error
+from pigment_mixing import gradient_ratios, mix_batch
+from wheel_library import default_library
+
+# Note! Color schemes are presented as arrays with each 12 hue in the color
+# wheel representing index values 0-11 with root color being value 0
+COLOR_SCHEMES = {
+    'Analogous': [0, 1, 11],
+    'Complementary': [0, 6],
+    'Triadic': [0, 4, 8],
+    'Tetradic': [0, 2, 6, 8],
+    'Square': [0, 3, 6, 9],
+    'Split-complementary': [0, 5, 7],
+    'Double split-complementary': [0, 1, 5, 7, 11],
+    'Clash': [0, 2, 8],
+    'Intermediate': [0, 2, 4, 6, 8, 10]
+}
 
 
 class Palette:
 
-    def __init__(self, color_wheel='RYB'):
+    @timed('palette.construct')
+    def __init__(self, color_wheel='RYB', colors=None):
         """
         Creates a Palette instance that represents a group of Color instances.
         the palette has colors from a specific color wheel, a color scheme and
         a picked color.
+
+        :param color_wheel: str, the color wheel of the palette.
+        :param colors: list, the Color instances to use instead of the color
+        wheel's default colors.
         """
 
         self.__RYB_COLORS = [
@@ -60,21 +82,12 @@ class Palette:
             'RGB': self.__RGB_COLORS,
             'CMYK': self.__CMYK_COLORS
         }
-        """
-        Color schemes are presented as arrays with each 12 hue in the color
-        wheel representing index values 0-11 with root color being value 0.
-        """
-        self.__COLOR_SCHEMES = {
-            'Analogous': [0, 1, 11],
-            'Complementary': [0, 6],
-            'Triadic': [0, 4, 8],
-            'Tetradic': [0, 2, 6, 8],
-            'Square': [0, 3, 6, 9],
-            'Split-complementary': [0, 5, 7],
-            'Double split-complementary': [0, 1, 5, 7, 11],
-            'Clash': [0, 2, 8],
-            'Intermediate': [0, 2, 4, 6, 8, 10]
-        }
+        self.__COLOR_SCHEMES = COLOR_SCHEMES
+
+        self.__listeners = []
+
+        if isinstance(color_wheel, str):
+            self.__load_color_wheel(color_wheel.upper())
 
         if (
                 not isinstance(color_wheel, str)
@@ -83,11 +96,73 @@ class Palette:
             show_error(f'Value {color_wheel} is not a valid color wheel!')
             return
 
+        if colors is not None:
+            if (
+                    not isinstance(colors, list)
+                    or len(colors) != len(self.__color_wheels[
+                        color_wheel.upper()])
+                    or not all(isinstance(color, Color) for color in colors)
+            ):
+                show_error('Invalid colors for the color wheel received!')
+                return
+
+            self.__color_wheels[color_wheel.upper()] = colors
+
         self.__color_palette = self.__color_wheels[color_wheel.upper()]
         self.__color_wheel = color_wheel.upper()
         self.__color_scheme = list(self.__COLOR_SCHEMES.keys())[0]
         self.__picked_color = self.__color_palette[0]
 
+    def __load_color_wheel(self, color_wheel_key):
+        """
+        Adds the colors of a color wheel defined in a wheel file the first
+        time the wheel is used.
+
+        :param color_wheel_key: str, the color wheel to load.
+        """
+
+        if color_wheel_key in self.__color_wheels:
+            return
+
+        colors = default_library().colors(color_wheel_key)
+        if colors is not None:
+            self.__color_wheels[color_wheel_key] = colors
+
+    def add_listener(self, listener):
+        """
+        Registers a function to be called whenever the palette state changes.
+        The listener is called with the palette and the kind of change which is
+        one of 'colors', 'scheme' or 'picked'.
+
+        :param listener: function, the function to call on changes.
+        """
+
+        if not callable(listener):
+            show_error('Invalid palette listener received!')
+            return
+
+        self.__listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Unregisters a function added with add_listener.
+
+        :param listener: function, the function to remove.
+        """
+
+        if listener in self.__listeners:
+            self.__listeners.remove(listener)
+
+    def __notify_listeners(self, change):
+        """
+        Calls all the registered listeners with the kind of change.
+
+        :param change: str, the kind of change made to the palette.
+        """
+
+        for listener in list(self.__listeners):
+            listener(self, change)
+
     def values(self):
         """
         Fetches all the colors currently in the palette as a list.
@@ -151,6 +226,25 @@ class Palette:
 
         return self.__color_scheme
 
+    def get_scheme_indexes(self, color_scheme_key=None):
+        """
+        Fetches the color wheel indexes of a color scheme with root color
+        being index 0.
+
+        :param color_scheme_key: str, the color scheme or None for the current
+        color scheme.
+        :return: list, the color wheel indexes of the color scheme.
+        """
+
+        if color_scheme_key is None:
+            color_scheme_key = self.__color_scheme
+
+        if color_scheme_key not in self.__COLOR_SCHEMES:
+            show_error(f'Invalid color scheme {color_scheme_key} provided!')
+            return
+
+        return list(self.__COLOR_SCHEMES[color_scheme_key])
+
     def get_picked_color(self):
         """
         Fetches the color that is set as the picked color in the palette.
@@ -170,6 +264,7 @@ class Palette:
         return self.__color_palette[
             random.randint(0, len(self.__color_palette) - 1)]
 
+    @timed('palette.get_scheme_colors')
     def get_scheme_colors(self):
         """
         Fetches colors from the palette that are included in the current color
@@ -192,6 +287,9 @@ class Palette:
         :return: Palette, the palette with set color wheel.
         """
 
+        if isinstance(color_wheel_key, str):
+            self.__load_color_wheel(color_wheel_key)
+
         if (
                 not isinstance(color_wheel_key, str)
                 or color_wheel_key not in self.__color_wheels
@@ -201,6 +299,7 @@ class Palette:
 
         self.__color_palette = self.__color_wheels[color_wheel_key]
         self.__color_wheel = color_wheel_key
+        self.__notify_listeners('colors')
 
         return self
 
@@ -220,7 +319,11 @@ class Palette:
             show_error(f'Invalid color scheme {color_scheme_key} provided!')
             return
 
+        if color_scheme_key == self.__color_scheme:
+            return self
+
         self.__color_scheme = color_scheme_key
+        self.__notify_listeners('scheme')
 
         return self
 
@@ -238,7 +341,11 @@ class Palette:
             show_error('Tried to set invalid picked color!')
             return
 
+        if picked_color is self.__picked_color:
+            return self
+
         self.__picked_color = picked_color
+        self.__notify_listeners('picked')
 
         return self
 
@@ -261,9 +368,11 @@ class Palette:
         self.__color_palette = \
             self.__color_palette[self.__color_palette.index(first_color):] + \
             self.__color_palette[:self.__color_palette.index(first_color)]
+        self.__notify_listeners('colors')
 
         return self
 
+    @timed('palette.to_tint')
     def to_tint(self, tint_percentage):
         """
         Tints (lightens) the palette colors according to provided tint amount.
@@ -279,11 +388,15 @@ class Palette:
             show_error('Invalid tint percentage received!')
             return
 
+        # Note! The percentage is validated once for the whole palette
+        tint_fraction = tint_percentage / 100
         for color in self.values():
-            color.tint(tint_percentage)
+            color.transform(tint_rgb, tint_fraction)
+        self.__notify_listeners('colors')
 
         return self
 
+    @timed('palette.to_shade')
     def to_shade(self, shade_percentage):
         """
         Shades (darkens) the palette colors according to provided shade amount.
@@ -299,11 +412,15 @@ class Palette:
             show_error('Invalid shade percentage received!')
             return
 
+        # Note! The percentage is validated once for the whole palette
+        shade_fraction = shade_percentage / 100
         for color in self.values():
-            color.shade(shade_percentage)
+            color.transform(shade_rgb, shade_fraction)
+        self.__notify_listeners('colors')
 
         return self
 
+    @timed('palette.to_tone')
     def to_tone(self, tone_percentage):
         """
         Tones (saturates) the palette colors according to provided tone amount.
@@ -319,7 +436,79 @@ class Palette:
             show_error('Invalid tone percentage received!')
             return
 
+        # Note! The percentage is validated once for the whole palette
+        tone_fraction = tone_percentage / 100
         for color in self.values():
-            color.tone(tone_percentage)
+            color.transform(tone_rgb, tone_fraction)
+        self.__notify_listeners('colors')
 
         return self
+
+    @timed('palette.mix_colors')
+    def mix_colors(self, first_color, second_color, step_count):
+        """
+        Mixes a gradient between two palette colors like paints mix.
+
+        :param first_color: Color, the color the gradient starts from.
+        :param second_color: Color, the color the gradient ends to.
+        :param step_count: int, the number of mixtures in the gradient.
+        :return: list, new Color instances of the mixtures from the first
+        color to the second.
+        """
+
+        if (
+                not isinstance(first_color, Color)
+                or not isinstance(second_color, Color)
+                or first_color not in self.__color_palette
+                or second_color not in self.__color_palette
+        ):
+            show_error('Invalid colors to mix provided!')
+            return
+
+        if not isinstance(step_count, int) or step_count < 1:
+            show_error('Invalid mixing step count received!')
+            return
+
+        ratios = gradient_ratios(step_count)
+        mixtures = mix_batch([(first_color.values(), second_color.values())],
+                             ratios)[0]
+
+        return [Color(*rgb_value, f'{first_color.name()}-'
+                                  f'{second_color.name()} '
+                                  f'{round(ratio * 100)}%')
+                for rgb_value, ratio in zip(mixtures, ratios)]
+
+    @timed('palette.intermediate_hues')
+    def intermediate_hues(self, step_count=1):
+        """
+        Mixes the intermediate hues between adjacent colors of the wheel like
+        paints mix, the last color mixing with the first.
+
+        :param step_count: int, the number of mixtures between two colors.
+        :return: list, new Color instances of the wheel colors and their
+        mixtures in wheel order.
+        """
+
+        if not isinstance(step_count, int) or step_count < 1:
+            show_error('Invalid mixing step count received!')
+            return
+
+        # Note! All the pairs are mixed in one batch so each spectrum is
+        # reconstructed only once
+        colors = self.__color_palette
+        next_colors = colors[1:] + colors[:1]
+        ratios = gradient_ratios(step_count)
+        mixtures = mix_batch([(color.values(), next_color.values())
+                              for color, next_color
+                              in zip(colors, next_colors)], ratios)
+
+        hues = []
+        for color, next_color, rgb_values in zip(colors, next_colors,
+                                                 mixtures):
+            hues.append(Color(*color.values(), color.name()))
+            hues.extend(Color(*rgb_value, f'{color.name()}-'
+                                          f'{next_color.name()} '
+                                          f'{round(ratio * 100)}%')
+                        for rgb_value, ratio in zip(rgb_values, ratios))
+
+        return hues
@@ -0,0 +1,362 @@
+"""
+A palette atlas shares the colors of every hue variant of every color wheel
+between processes. The colors are computed once into a shared memory block
+with a small header and an index, and worker processes attach to the block
+and read the colors in place, so the memory of a worker stays flat however
+many workers there are.
+
+The block starts with a fixed header, the magic bytes, the atlas version and
+the lengths of the index and the colors. The index is JSON listing the hue
+variant amounts, the color names of each wheel and the offset of the packed
+RGB values of each wheel and hue variant in the colors that follow it.
+"""
+
+import argparse
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import json
+from multiprocessing import shared_memory
+import struct
+import time
+import tracemalloc
+
+from argument_types import positive_int
+from palette import COLOR_SCHEMES
+from palette_snapshot import (DEFAULT_VARIANT_AMOUNTS, SNAPSHOT_VERSION,
+                              build_snapshot, create_snapshot_palette)
+
+ATLAS_MAGIC = b'CLRA'
+ATLAS_VERSION = 1
+ATLAS_HEADER = struct.Struct('<4sHII')
+HUE_VARIANT_KEYS = ['HUE', 'TINT', 'SHADE', 'TONE']
+
+
+class PaletteAtlas:
+
+    def __init__(self, memory, is_owner=False):
+        """
+        Creates a PaletteAtlas instance reading the colors of a shared memory
+        block in place. Use create_atlas to build an atlas and attach_atlas to
+        read one built by another process. A block that doesn't hold an atlas
+        is closed and raises ValueError.
+
+        :param memory: SharedMemory, the block holding the atlas.
+        :param is_owner: bool, whether this instance created the block and
+        is responsible for unlinking it.
+        """
+
+        self.__memory = memory
+        self.__is_owner = is_owner
+
+        # Note! The whole block is checked before any views of it are taken,
+        # so an invalid block can be closed right away
+        try:
+            if memory.size < ATLAS_HEADER.size:
+                raise ValueError('The block is smaller than the header')
+
+            magic, version, index_length, colors_length = \
+                ATLAS_HEADER.unpack_from(memory.buf)
+            index_offset = ATLAS_HEADER.size
+            colors_offset = index_offset + index_length
+            if (
+                    magic != ATLAS_MAGIC or version != ATLAS_VERSION
+                    or colors_offset + colors_length > memory.size
+            ):
+                raise ValueError('The header is invalid')
+
+            index = json.loads(bytes(
+                memory.buf[index_offset:colors_offset]).decode('utf-8'))
+            amounts = dict(index['amounts'])
+            wheels = {color_wheel_key: tuple(color_names)
+                      for color_wheel_key, color_names
+                      in index['wheels'].items()}
+
+            offsets = {}
+            for entry_key, offset in index['offsets'].items():
+                color_wheel_key, hue_variant_key = entry_key.split('/')
+                color_count = len(wheels[color_wheel_key])
+                if (
+                        not isinstance(offset, int)
+                        or not 0 <= offset <= colors_length - color_count * 3
+                ):
+                    raise ValueError('The colors are out of bounds')
+
+                offsets[(color_wheel_key, hue_variant_key)] = \
+                    (offset, offset + color_count * 3)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            memory.close()
+            raise ValueError('Invalid palette atlas received!') from error
+
+        self.__amounts = amounts
+        self.__wheels = wheels
+
+        # Note! The colors are memoryviews of the shared block, nothing is
+        # copied until a palette is created
+        self.__colors_view = memory.buf[colors_offset:
+                                        colors_offset + colors_length]
+        self.__colors = {
+            entry_key: self.__colors_view[start:end]
+            for entry_key, (start, end) in offsets.items()
+        }
+
+    def name(self):
+        """
+        Fetches the name of the shared memory block to attach to.
+
+        :return: str, the name of the block.
+        """
+
+        return self.__memory.name
+
+    def variant_amounts(self):
+        """
+        Fetches the hue variant amounts the atlas was built with.
+
+        :return: dict, the tint, shade and tone percentages.
+        """
+
+        return dict(self.__amounts)
+
+    def color_wheels(self):
+        """
+        Fetches the color wheels of the atlas.
+
+        :return: list, the color wheel keys.
+        """
+
+        return list(self.__wheels)
+
+    def color_names(self, color_wheel_key):
+        """
+        Fetches the color names of a color wheel in wheel order.
+
+        :param color_wheel_key: str, the color wheel.
+        :return: tuple, the color names or None if the atlas has no such
+        wheel.
+        """
+
+        return self.__wheels.get(color_wheel_key)
+
+    def rgb_values(self, color_wheel_key, hue_variant_key):
+        """
+        Fetches the packed RGB values of a hue variant of a color wheel in
+        wheel order without copying them.
+
+        :param color_wheel_key: str, the color wheel.
+        :param hue_variant_key: str, the hue variant.
+        :return: memoryview, the packed RGB values or None if the atlas has
+        no such palette.
+        """
+
+        return self.__colors.get((color_wheel_key, hue_variant_key))
+
+    def snapshot(self):
+        """
+        Fetches the atlas as a palette snapshot whose colors are views of the
+        shared block, so the palette snapshot functions read it in place.
+
+        :return: dict, the snapshot of the color wheels.
+        """
+
+        return {
+            'version': SNAPSHOT_VERSION,
+            'amounts': dict(self.__amounts),
+            'wheels': dict(self.__wheels),
+            'colors': dict(self.__colors)
+        }
+
+    def create_palette(self, color_wheel_key, hue_variant_key,
+                       root_color_name=None):
+        """
+        Creates a palette of a hue variant of a color wheel from the atlas.
+
+        :param color_wheel_key: str, the color wheel of the palette.
+        :param hue_variant_key: str, the hue variant of the palette.
+        :param root_color_name: str, the name of the root color to sort the
+        palette by and set as picked color.
+        :return: Palette, the palette or None if the atlas has no such
+        palette.
+        """
+
+        return create_snapshot_palette(self.snapshot(), color_wheel_key,
+                                       hue_variant_key, root_color_name)
+
+    def close(self):
+        """
+        Detaches from the shared memory block. Palettes created from the atlas
+        stay usable.
+        """
+
+        # Note! Views of the block must be released before it can be closed
+        for rgb_values in self.__colors.values():
+            rgb_values.release()
+        self.__colors = {}
+        self.__colors_view.release()
+
+        self.__memory.close()
+
+    def unlink(self):
+        """
+        Frees the shared memory block once every process has detached. Only
+        the process that created the atlas can unlink it, others raise
+        ValueError.
+        """
+
+        if not self.__is_owner:
+            raise ValueError('Only the creator of the palette atlas can free '
+                             'it!')
+
+        self.__memory.unlink()
+
+
+def create_atlas(variant_amounts=None):
+    """
+    Computes the colors of every hue variant of every color wheel into a new
+    shared memory block.
+
+    :param variant_amounts: dict, the tint, shade and tone percentages.
+    :return: PaletteAtlas, the atlas owning the block.
+    """
+
+    snapshot = build_snapshot(variant_amounts)
+
+    offsets = {}
+    colors = bytearray()
+    for (color_wheel_key, hue_variant_key), rgb_values in \
+            snapshot['colors'].items():
+        offsets[f'{color_wheel_key}/{hue_variant_key}'] = len(colors)
+        colors += rgb_values
+
+    index = json.dumps({
+        'amounts': snapshot['amounts'],
+        'wheels': {color_wheel_key: list(color_names)
+                   for color_wheel_key, color_names
+                   in snapshot['wheels'].items()},
+        'offsets': offsets
+    }).encode('utf-8')
+
+    memory = shared_memory.SharedMemory(
+        create=True, size=ATLAS_HEADER.size + len(index) + len(colors))
+    ATLAS_HEADER.pack_into(memory.buf, 0, ATLAS_MAGIC, ATLAS_VERSION,
+                           len(index), len(colors))
+    memory.buf[ATLAS_HEADER.size:ATLAS_HEADER.size + len(index)] = index
+    memory.buf[ATLAS_HEADER.size + len(index):
+               ATLAS_HEADER.size + len(index) + len(colors)] = colors
+
+    return PaletteAtlas(memory, is_owner=True)
+
+
+def attach_atlas(name):
+    """
+    Attaches to an atlas created by another process.
+
+    :param name: str, the name of the shared memory block.
+    :return: PaletteAtlas, the atlas reading the block in place.
+    """
+
+    # Note! Python 3.13 and later attach without registering the block with
+    # the resource tracker. Older versions don't take track and register it,
+    # which is harmless in the worker processes of the creator since they
+    # share its resource tracker and the block is still freed only once
+    try:
+        memory = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        memory = shared_memory.SharedMemory(name=name)
+
+    return PaletteAtlas(memory)
+
+
+@functools.lru_cache(maxsize=None)
+def worker_atlas(name):
+    """
+    Fetches the atlas of a worker process, attaching to it on first use so
+    every task of the worker shares the same attachment.
+
+    :param name: str, the name of the shared memory block.
+    :return: PaletteAtlas, the atlas of the worker.
+    """
+
+    atlas = attach_atlas(name)
+
+    # Note! The views of the block are released before the worker shuts down
+    # so the block detaches cleanly
+    atexit.register(atlas.close)
+
+    return atlas
+
+
+def scheme_hexes_chunk(jobs, atlas_name, color_scheme_key):
+    """
+    Creates the palettes of a chunk of jobs from the shared atlas and lists
+    the hex codes of their color scheme.
+
+    :param jobs: list, the color wheel, hue variant and root color name of
+    each palette.
+    :param atlas_name: str, the name of the shared memory block.
+    :param color_scheme_key: str, the color scheme of the palettes.
+    :return: tuple, the hex codes of each palette and the peak memory
+    allocated by the worker process in bytes.
+    """
+
+    # Note! Workers have no UI to show errors in, they're raised to the
+    # process that submitted the chunk
+    if color_scheme_key not in COLOR_SCHEMES:
+        raise ValueError(f'Value {color_scheme_key} is not a valid color '
+                         f'scheme!')
+
+    # Note! Allocations are traced from the first chunk of the worker on
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    atlas = worker_atlas(atlas_name)
+
+    results = []
+    for color_wheel_key, hue_variant_key, root_color_name in jobs:
+        palette = atlas.create_palette(color_wheel_key, hue_variant_key,
+                                       root_color_name)
+        palette.set_color_scheme(color_scheme_key)
+        results.append([color.hex() for color in palette.get_scheme_colors()])
+
+    return results, tracemalloc.get_traced_memory()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build a shared palette atlas and read every color '
+                    'wheel, hue variant and root color from worker '
+                    'processes.')
+    parser.add_argument('--scheme', choices=list(COLOR_SCHEMES),
+                        default='Triadic')
+    parser.add_argument('--processes', type=positive_int)
+    parser.add_argument('--chunk-size', type=positive_int, default=16)
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    atlas = create_atlas(DEFAULT_VARIANT_AMOUNTS)
+    try:
+        jobs = [(color_wheel_key, hue_variant_key, root_color_name)
+                for color_wheel_key in atlas.color_wheels()
+                for hue_variant_key in HUE_VARIANT_KEYS
+                for root_color_name in atlas.color_names(color_wheel_key)]
+        chunks = [jobs[offset:offset + args.chunk_size]
+                  for offset in range(0, len(jobs), args.chunk_size)]
+        read_chunk = functools.partial(scheme_hexes_chunk,
+                                       atlas_name=atlas.name(),
+                                       color_scheme_key=args.scheme)
+
+        with ProcessPoolExecutor(max_workers=args.processes) as executor:
+            chunk_results = list(executor.map(read_chunk, chunks))
+    finally:
+        atlas.close()
+        atlas.unlink()
+
+    palette_count = sum(len(results) for results, _ in chunk_results)
+    print(f'Read {palette_count} palettes in '
+          f'{time.perf_counter() - start_time:.2f} s, peak worker '
+          f'allocations {max(memory for _, memory in chunk_results) // 1024} '
+          f'KB')
+
+
+if __name__ == '__main__':
+    main()
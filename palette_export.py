@@ -0,0 +1,132 @@
+import math
+
+from cmyk import separate
+from color import HEX_CODES
+from instrumentation import timed
+from main import show_error
+from palette import Palette
+
+EXPORT_CHUNK_COLOR_COUNT = 10000
+
+
+def color_to_text(color, palette):
+    """
+    Converts a color to a line in exported files. Colors of print palettes
+    are followed by their CMYK ink percentages.
+
+    :param color: Color, the color to convert.
+    :param palette: Palette, the palette of the color.
+    :return: str, the color as text.
+    """
+
+    if palette.get_color_wheel() != 'CMYK':
+        return str(color)
+
+    cyan, magenta, yellow, black = (round(ink) for ink in
+                                    separate([color.values()])[0])
+
+    return f'{color} cmyk({cyan}%, {magenta}%, {yellow}%, {black}%)'
+
+
+@timed('export.palette_to_text')
+def palette_to_text(palette, ramps=None):
+    """
+    Converts the palette to the text representation used in exported files.
+    Lists the colors in the palette's color scheme followed by all the colors
+    in the color wheel and optionally their tonal ramps. Colors of print
+    palettes include their CMYK separation.
+
+    :param palette: Palette, the palette to convert.
+    :param ramps: list, the tonal ramps of the palette colors as lists of
+    Color instances.
+    :return: str, the palette as text.
+    """
+
+    if not isinstance(palette, Palette):
+        show_error('Invalid palette to export received!')
+        return
+
+    content = 'Colorian Palette\n' + \
+              '================\n\n'
+
+    color_scheme = palette.get_color_scheme()
+
+    content += \
+        color_scheme + ' color scheme\n' + \
+        ('-' * (len(color_scheme) + 13)) + '\n'
+
+    for color in palette.get_scheme_colors():
+        content += color_to_text(color, palette) + '\n'
+
+    content += '\n'
+
+    content += 'Color wheel\n' + \
+               '-----------\n'
+
+    for color in palette.values():
+        content += color_to_text(color, palette) + '\n'
+
+    if ramps:
+        content += '\n'
+
+        content += 'Tonal ramps\n' + \
+                   '-----------\n'
+
+        for ramp in ramps:
+            content += ', '.join(str(color) for color in ramp) + '\n'
+
+    return content
+
+
+def collection_text_chunks(rgb_bytes, names,
+                           chunk_color_count=EXPORT_CHUNK_COLOR_COUNT):
+    """
+    Converts a color collection to text in chunks so large collections are
+    never held in memory as a whole. Unnamed colors are listed by their hex
+    code.
+
+    :param rgb_bytes: bytes, the packed RGB values of the colors.
+    :param names: list, the names of the colors, None for unnamed ones.
+    :param chunk_color_count: int, the number of colors in a chunk.
+    :return: generator, the text chunks, the first one with a heading.
+    """
+
+    for offset in range(0, len(names), chunk_color_count):
+        lines = ['Imported colors\n---------------\n'] if offset == 0 else []
+        for idx in range(offset, min(offset + chunk_color_count, len(names))):
+            hex_code = '#' + HEX_CODES[rgb_bytes[idx * 3]] \
+                + HEX_CODES[rgb_bytes[idx * 3 + 1]] \
+                + HEX_CODES[rgb_bytes[idx * 3 + 2]]
+            lines.append(f'{names[idx]}: {hex_code}\n' if names[idx]
+                         else hex_code + '\n')
+
+        yield ''.join(lines)
+
+
+def export_text_chunks(palette, imported_colors=None,
+                       chunk_color_count=EXPORT_CHUNK_COLOR_COUNT):
+    """
+    Splits an export into text chunks to write one at a time, the palette
+    followed by the imported colors.
+
+    :param palette: Palette, the palette to export.
+    :param imported_colors: dict, the packed RGB values and names of imported
+    colors to include or None.
+    :param chunk_color_count: int, the number of imported colors in a chunk.
+    :return: tuple, the number of chunks and a generator of the chunks.
+    """
+
+    # Note! The palette is converted right away as the chunks may be written
+    # from another thread while the palette keeps changing
+    palette_text = palette_to_text(palette)
+    if imported_colors is None or not imported_colors['names']:
+        return 1, iter([palette_text])
+
+    def generate_chunks():
+        yield palette_text + '\n'
+        yield from collection_text_chunks(imported_colors['rgb'],
+                                          imported_colors['names'],
+                                          chunk_color_count)
+
+    return 1 + math.ceil(len(imported_colors['names']) / chunk_color_count), \
+        generate_chunks()
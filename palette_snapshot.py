@@ -0,0 +1,194 @@
+import pickle
+
+from color import Color
+from palette import Palette
+
+SNAPSHOT_FILENAME = 'palette_snapshot.pickle'
+SNAPSHOT_VERSION = 1
+
+# Note! Keep in sync with the default amounts in ColorianUI, snapshots built
+# with other amounts are ignored at launch
+DEFAULT_VARIANT_AMOUNTS = {
+    'TINT': 25,
+    'SHADE': 25,
+    'TONE': 90
+}
+COLOR_WHEEL_KEYS = ['RYB', 'RGB', 'CMYK']
+
+
+def build_snapshot(variant_amounts=None):
+    """
+    Precomputes the colors of every hue variant of every color wheel. Colors
+    are stored in color wheel order as packed RGB bytes since sorting a wheel
+    by any root color only rotates it.
+
+    :param variant_amounts: dict, the tint, shade and tone percentages.
+    :return: dict, the snapshot of the color wheels.
+    """
+
+    if variant_amounts is None:
+        variant_amounts = DEFAULT_VARIANT_AMOUNTS
+
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'amounts': dict(variant_amounts),
+        'wheels': {},
+        'colors': {}
+    }
+
+    for color_wheel_key in COLOR_WHEEL_KEYS:
+        variant_palettes = {
+            'HUE': Palette(color_wheel_key),
+            'TINT': Palette(color_wheel_key).to_tint(
+                variant_amounts['TINT']),
+            'SHADE': Palette(color_wheel_key).to_shade(
+                variant_amounts['SHADE']),
+            'TONE': Palette(color_wheel_key).to_tone(
+                variant_amounts['TONE'])
+        }
+
+        snapshot['wheels'][color_wheel_key] = tuple(
+            color.name() for color in variant_palettes['HUE'].values())
+
+        for hue_variant_key, variant_palette in variant_palettes.items():
+            snapshot['colors'][(color_wheel_key, hue_variant_key)] = bytes(
+                value
+                for color in variant_palette.values()
+                for value in color.values())
+
+    return snapshot
+
+
+def save_snapshot(path, snapshot):
+    """
+    Writes the snapshot to a file.
+
+    :param path: str, the path of the snapshot file.
+    :param snapshot: dict, the snapshot to write.
+    """
+
+    with open(path, 'wb') as file:
+        pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_snapshot(path, variant_amounts=None):
+    """
+    Reads a snapshot from a file. Missing, outdated and snapshots built with
+    other hue variant amounts are ignored.
+
+    :param path: str, the path of the snapshot file.
+    :param variant_amounts: dict, the tint, shade and tone percentages the
+    snapshot must have been built with.
+    :return: dict, the snapshot or None if it couldn't be used.
+    """
+
+    if variant_amounts is None:
+        variant_amounts = DEFAULT_VARIANT_AMOUNTS
+
+    try:
+        with open(path, 'rb') as file:
+            snapshot = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+    if (
+            not isinstance(snapshot, dict)
+            or snapshot.get('version') != SNAPSHOT_VERSION
+            or snapshot.get('amounts') != dict(variant_amounts)
+    ):
+        return None
+
+    return snapshot
+
+
+def create_snapshot_palette(snapshot, color_wheel_key, hue_variant_key,
+                            root_color_name=None):
+    """
+    Creates a palette of a hue variant from the snapshot without recomputing
+    the variant. The colors keep the hue values as their original values just
+    like colors modified with the variant functions.
+
+    :param snapshot: dict, the snapshot of the color wheels.
+    :param color_wheel_key: str, the color wheel of the palette.
+    :param hue_variant_key: str, the hue variant of the palette.
+    :param root_color_name: str, the name of the root color to sort the
+    palette by and set as picked color.
+    :return: Palette, the palette of the hue variant.
+    """
+
+    if (color_wheel_key, hue_variant_key) not in snapshot['colors']:
+        return None
+
+    color_names = snapshot['wheels'][color_wheel_key]
+    hue_values = snapshot['colors'][(color_wheel_key, 'HUE')]
+    variant_values = snapshot['colors'][(color_wheel_key, hue_variant_key)]
+
+    colors = []
+    for idx, color_name in enumerate(color_names):
+        offset = idx * 3
+        color = Color(*hue_values[offset:offset + 3], color_name)
+        if hue_variant_key != 'HUE':
+            color.replace_values(*variant_values[offset:offset + 3])
+        colors.append(color)
+
+    palette = Palette(color_wheel_key, colors)
+
+    if root_color_name is not None:
+        root_color = palette.find_by_name(root_color_name)
+        palette.set_picked_color(root_color)
+        palette.sort_color_wheel(root_color)
+
+    return palette
+
+
+def create_variant_palette(color_wheel_key, root_color_name,
+                           color_scheme_key, hue_variant_key, variant_amounts,
+                           snapshot=None, sort_by_root=True):
+    """
+    Creates a color wheel palette with the hue variant applied to its colors
+    and the root color picked. The colors are read from the snapshot when one
+    is provided and computed otherwise.
+
+    :param color_wheel_key: str, the color wheel of the palette.
+    :param root_color_name: str, the name of the root color.
+    :param color_scheme_key: str, the color scheme of the palette.
+    :param hue_variant_key: str, the hue variant to apply.
+    :param variant_amounts: dict, the tint, shade and tone percentages.
+    :param snapshot: dict, the snapshot built with the same amounts.
+    :param sort_by_root: bool, whether to sort the wheel by the root color.
+    :return: Palette, the created palette.
+    """
+
+    variant_palette = None
+    if snapshot is not None:
+        variant_palette = create_snapshot_palette(
+            snapshot, color_wheel_key, hue_variant_key)
+
+    # Note! Wheels defined in wheel files aren't in the snapshot
+    if variant_palette is None:
+        variant_palette = Palette(color_wheel_key)
+
+        if hue_variant_key == 'TINT':
+            variant_palette.to_tint(variant_amounts['TINT'])
+        elif hue_variant_key == 'SHADE':
+            variant_palette.to_shade(variant_amounts['SHADE'])
+        elif hue_variant_key == 'TONE':
+            variant_palette.to_tone(variant_amounts['TONE'])
+
+    root_color = variant_palette.find_by_name(root_color_name)
+    variant_palette.set_picked_color(root_color)
+    if sort_by_root:
+        variant_palette.sort_color_wheel(root_color)
+
+    variant_palette.set_color_scheme(color_scheme_key)
+
+    return variant_palette
+
+
+def main():
+    save_snapshot(SNAPSHOT_FILENAME, build_snapshot())
+    print(f'Wrote {SNAPSHOT_FILENAME}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+import math
+import tkinter as tk
+
+from color import HEX_CODES
+
+DEFAULT_SWATCH_SIZE = 50
+MIN_SWATCH_SIZE = 10
+MAX_SWATCH_SIZE = 100
+ZOOM_FACTOR = 1.25
+
+# Note! Tk state bit of the Control key held down during an event
+CONTROL_MASK = 0x0004
+
+
+class PickerCanvas:
+
+    def __init__(self, master, width, height, pick_function,
+                 background='#313131', picked_outline='#B0AFB0'):
+        """
+        Creates a PickerCanvas instance that shows a color collection as a
+        grid of swatches on a canvas. Only the swatches in view are drawn, the
+        canvas items are reused when the grid is scrolled with the mouse wheel
+        or zoomed with Control and the mouse wheel, so collections of any size
+        stay smooth.
+
+        :param master: tkinter.Misc, the parent widget of the canvas.
+        :param width: int, the width of the canvas in pixels.
+        :param height: int, the height of the canvas in pixels.
+        :param pick_function: function, called with the index of the clicked
+        color in the collection.
+        :param background: str, the background and swatch border color.
+        :param picked_outline: str, the outline color of the picked color.
+        """
+
+        self.__width = width
+        self.__height = height
+        self.__pick_function = pick_function
+        self.__background = background
+        self.__picked_outline = picked_outline
+
+        self.__rgb_bytes = b''
+        self.__order = None
+        self.__picked_index = None
+        self.__swatch_size = DEFAULT_SWATCH_SIZE
+        self.__first_row = 0
+
+        self.__swatch_ids = []
+        self.__swatch_states = []
+
+        self.__canvas = tk.Canvas(master,
+                                  background=background,
+                                  height=height,
+                                  highlightthickness=0,
+                                  width=width)
+        self.__canvas.bind('<Button-1>', self.__click)
+        self.__canvas.bind('<MouseWheel>', self.__mouse_wheel)
+        self.__canvas.bind('<Button-4>', self.__mouse_wheel)
+        self.__canvas.bind('<Button-5>', self.__mouse_wheel)
+
+    def grid(self, **grid_options):
+        """
+        Places the canvas in its parent's grid.
+
+        :param grid_options: dict, the options of tkinter grid.
+        """
+
+        self.__canvas.grid(**grid_options)
+
+    def bind(self, sequence, function):
+        """
+        Binds an event of the canvas to a function.
+
+        :param sequence: str, the event sequence.
+        :param function: function, the function receiving the event.
+        """
+
+        self.__canvas.bind(sequence, function)
+
+    def set_colors(self, rgb_bytes, order=None, picked_index=None):
+        """
+        Shows a color collection. The view is scrolled back to the top when
+        the collection changes.
+
+        :param rgb_bytes: bytes, the packed RGB values of the colors.
+        :param order: array, the indexes of the colors in display order or
+        None to show them in collection order.
+        :param picked_index: int, the index of the picked color or None.
+        """
+
+        if rgb_bytes != self.__rgb_bytes or order is not self.__order:
+            self.__first_row = 0
+
+        self.__rgb_bytes = rgb_bytes
+        self.__order = order
+        self.__picked_index = picked_index
+        self.render()
+
+    def color_count(self):
+        """
+        Fetches the number of colors in the shown collection.
+
+        :return: int, the number of colors.
+        """
+
+        return len(self.__rgb_bytes) // 3
+
+    def column_count(self):
+        """
+        Fetches the number of swatches on a row at the current zoom.
+
+        :return: int, the number of columns.
+        """
+
+        return max(self.__width // self.__swatch_size, 1)
+
+    def visible_row_count(self):
+        """
+        Fetches the number of rows in view at the current zoom, a partially
+        visible last row included.
+
+        :return: int, the number of rows in view.
+        """
+
+        return math.ceil(self.__height / self.__swatch_size)
+
+    def max_first_row(self):
+        """
+        Fetches the last row the view can be scrolled to start from.
+
+        :return: int, the index of the row.
+        """
+
+        row_count = math.ceil(self.color_count() / self.column_count())
+
+        return max(row_count - self.__height // self.__swatch_size, 0)
+
+    def scroll(self, row_count):
+        """
+        Scrolls the view by rows.
+
+        :param row_count: int, the number of rows to scroll, negative to
+        scroll up.
+        """
+
+        first_row = min(max(self.__first_row + row_count, 0),
+                        self.max_first_row())
+        if first_row == self.__first_row:
+            return
+
+        self.__first_row = first_row
+        self.render()
+
+    def zoom(self, factor):
+        """
+        Zooms the swatches keeping the first color in view in view.
+
+        :param factor: float, the factor to scale the swatch size by.
+        """
+
+        swatch_size = min(max(round(self.__swatch_size * factor),
+                              MIN_SWATCH_SIZE), MAX_SWATCH_SIZE)
+        if swatch_size == self.__swatch_size:
+            return
+
+        first_position = self.__first_row * self.column_count()
+        self.__swatch_size = swatch_size
+        self.__first_row = min(first_position // self.column_count(),
+                               self.max_first_row())
+        self.render()
+
+    def index_at(self, x, y):
+        """
+        Finds the color of the swatch at a point of the canvas.
+
+        :param x: int, the x coordinate on the canvas.
+        :param y: int, the y coordinate on the canvas.
+        :return: int, the index of the color in the collection or None if
+        there's no swatch at the point.
+        """
+
+        column = x // self.__swatch_size
+        if x < 0 or y < 0 or column >= self.column_count():
+            return None
+
+        position = (self.__first_row + y // self.__swatch_size) \
+            * self.column_count() + column
+        if position >= self.color_count():
+            return None
+
+        return self.__order[position] if self.__order is not None \
+            else position
+
+    def render(self):
+        """
+        Draws the swatches in view. Canvas items are created only when more
+        swatches fit in view than before and only changed items are updated.
+        """
+
+        swatch_size = self.__swatch_size
+        column_count = self.column_count()
+        first_position = self.__first_row * column_count
+        last_position = min(
+            first_position + self.visible_row_count() * column_count,
+            self.color_count())
+        rgb_bytes = self.__rgb_bytes
+
+        while len(self.__swatch_ids) < last_position - first_position:
+            self.__swatch_ids.append(self.__canvas.create_rectangle(
+                0, 0, 0, 0, state=tk.HIDDEN))
+            self.__swatch_states.append(None)
+
+        for slot, position in enumerate(range(first_position,
+                                              last_position)):
+            color_idx = self.__order[position] if self.__order is not None \
+                else position
+            offset = color_idx * 3
+            x = (slot % column_count) * swatch_size
+            y = (slot // column_count) * swatch_size
+            is_picked = color_idx == self.__picked_index
+
+            swatch_state = (x, y, swatch_size, is_picked,
+                            rgb_bytes[offset:offset + 3])
+            if swatch_state == self.__swatch_states[slot]:
+                continue
+
+            self.__swatch_states[slot] = swatch_state
+            self.__canvas.coords(self.__swatch_ids[slot],
+                                 x + 1, y + 1,
+                                 x + swatch_size - 1, y + swatch_size - 1)
+            self.__canvas.itemconfigure(
+                self.__swatch_ids[slot],
+                fill='#' + HEX_CODES[rgb_bytes[offset]]
+                     + HEX_CODES[rgb_bytes[offset + 1]]
+                     + HEX_CODES[rgb_bytes[offset + 2]],
+                outline=self.__picked_outline if is_picked
+                else self.__background,
+                state=tk.NORMAL,
+                width=3 if is_picked else 1)
+
+        for slot in range(last_position - first_position,
+                          len(self.__swatch_ids)):
+            if self.__swatch_states[slot] is not None:
+                self.__swatch_states[slot] = None
+                self.__canvas.itemconfigure(self.__swatch_ids[slot],
+                                            state=tk.HIDDEN)
+
+    def __click(self, event):
+        """
+        Picks the color of the clicked swatch.
+
+        :param event: tkinter.Event, the event triggered by user.
+        """
+
+        color_idx = self.index_at(event.x, event.y)
+        if color_idx is not None:
+            self.__pick_function(color_idx)
+
+    def __mouse_wheel(self, event):
+        """
+        Scrolls the view a row at a time or zooms it with Control held down.
+
+        :param event: tkinter.Event, the event triggered by user.
+        """
+
+        is_up = event.num == 4 or getattr(event, 'delta', 0) > 0
+
+        if event.state & CONTROL_MASK:
+            self.zoom(ZOOM_FACTOR if is_up else 1 / ZOOM_FACTOR)
+        else:
+            self.scroll(-1 if is_up else 1)
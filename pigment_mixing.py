@@ -0,0 +1,339 @@
+"""
+Subtractive mixing of colors like paints with the Kubelka-Munk model. Every
+color is given the smoothest reflectance spectrum that reproduces it, the
+spectra are converted to absorption over scattering (K/S) and mixed by
+concentration, so yellow and blue mix darker and greener than the average of
+their RGB values. Spectra are calculated once per color and cached, mixing
+is then a pass over the precomputed tables.
+https://doi.org/10.1002/col.22437
+"""
+
+import argparse
+import functools
+import math
+import operator
+import time
+
+from color_space import SRGB_TO_LINEAR, linear_to_srgb_value
+
+WAVELENGTHS = tuple(range(380, 740, 10))
+MIN_REFLECTANCE = 0.0001
+SOLVER_TOLERANCE = 1e-8
+MAX_SOLVER_ITERATIONS = 100
+DEFAULT_RATIOS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9)
+
+# Note! The CIE 1931 color matching functions are approximated with the
+# piecewise Gaussian fit of Wyman, Sloan and Shirley instead of shipping the
+# tabulated functions
+# https://jcgt.org/published/0002/02/01/
+CIE_LOBES = (
+    ((1.056, 599.8, 37.9, 31.0), (0.362, 442.0, 16.0, 26.7),
+     (-0.065, 501.1, 20.4, 26.2)),
+    ((0.821, 568.8, 46.9, 40.5), (0.286, 530.9, 16.3, 31.1)),
+    ((1.217, 437.0, 11.8, 36.0), (0.681, 459.0, 26.0, 13.8))
+)
+
+XYZ_TO_LINEAR = (
+    (3.2406, -1.5372, -0.4986),
+    (-0.9689, 1.8758, 0.0415),
+    (0.0557, -0.2040, 1.0570)
+)
+
+
+def matching_function(lobes, wavelength):
+    """
+    Evaluates a color matching function as a sum of piecewise Gaussians.
+
+    :param lobes: tuple, the weight, center and left and right widths of each
+    Gaussian.
+    :param wavelength: float, the wavelength in nanometers.
+    :return: float, the value of the matching function.
+    """
+
+    value = 0.0
+    for weight, center, left_width, right_width in lobes:
+        width = left_width if wavelength < center else right_width
+        value += weight * math.exp(-0.5 * ((wavelength - center) / width) ** 2)
+
+    return value
+
+
+def build_rgb_matching():
+    """
+    Builds the table that projects reflectance spectra to linear RGB. The
+    rows are scaled so that a perfect white reflector under an equal-energy
+    illuminant is sRGB white.
+
+    :return: tuple, the red, green and blue weights of every wavelength.
+    """
+
+    xyz_matching = [[matching_function(lobes, wavelength)
+                     for wavelength in WAVELENGTHS] for lobes in CIE_LOBES]
+
+    rgb_matching = []
+    for matrix_row in XYZ_TO_LINEAR:
+        weights = [sum(factor * xyz_values[idx] for factor, xyz_values
+                       in zip(matrix_row, xyz_matching))
+                   for idx in range(len(WAVELENGTHS))]
+        white_value = sum(weights)
+        rgb_matching.append(tuple(weight / white_value for weight in weights))
+
+    return tuple(rgb_matching)
+
+
+RGB_MATCHING = build_rgb_matching()
+
+
+def solve_linear(matrix, values):
+    """
+    Solves a linear system with Gaussian elimination and partial pivoting.
+
+    :param matrix: list, the rows of the square coefficient matrix, modified
+    in place.
+    :param values: list, the right-hand side values.
+    :return: list, the solution.
+    """
+
+    size = len(values)
+    for row, value in zip(matrix, values):
+        row.append(value)
+
+    for column in range(size):
+        column_values = [abs(row[column]) for row in matrix[column:]]
+        pivot_row = column + column_values.index(max(column_values))
+        matrix[column], matrix[pivot_row] = matrix[pivot_row], matrix[column]
+        pivot = matrix[column]
+
+        # Note! The systems solved here are mostly zeros, so only the nonzero
+        # entries of the pivot row are eliminated
+        pivot_indexes = [idx for idx in range(column, size + 1)
+                         if pivot[idx]]
+        for row in matrix[column + 1:]:
+            if row[column]:
+                factor = row[column] / pivot[column]
+                for idx in pivot_indexes:
+                    row[idx] -= factor * pivot[idx]
+
+    solution = [0.0] * size
+    for row_idx in range(size - 1, -1, -1):
+        row = matrix[row_idx]
+        solution[row_idx] = (row[size] - sum(map(
+            operator.mul, row[row_idx + 1:size], solution[row_idx + 1:]))) \
+            / row[row_idx]
+
+    return solution
+
+
+@functools.lru_cache(maxsize=4096)
+def reflectance(rgb_value):
+    """
+    Reconstructs the smoothest reflectance spectrum of a color, the one with
+    the least slope in log reflectance that is bounded to 1.0 and reproduces
+    the color exactly. Solved with Newton's method, wavelengths that exceed
+    1.0 are pinned to it and the solution is iterated again.
+
+    :param rgb_value: tuple, the red, green and blue values 0-255.
+    :return: tuple, the reflectance of every wavelength.
+    """
+
+    target = [min(max(SRGB_TO_LINEAR[value], MIN_REFLECTANCE), 1.0)
+              for value in rgb_value]
+    matching = RGB_MATCHING
+    count = len(WAVELENGTHS)
+
+    log_values = [0.0] * count
+    multipliers = [0.0] * 3
+    pinned = set()
+
+    for _ in range(MAX_SOLVER_ITERATIONS):
+        spectrum = [math.exp(value) for value in log_values]
+        weighted = [sum(weights[idx] * multiplier for weights, multiplier
+                        in zip(matching, multipliers))
+                    for idx in range(count)]
+
+        residuals = []
+        for idx in range(count):
+            if idx in pinned:
+                residuals.append(log_values[idx])
+                continue
+
+            slope = 0.0
+            if idx > 0:
+                slope += log_values[idx] - log_values[idx - 1]
+            if idx < count - 1:
+                slope += log_values[idx] - log_values[idx + 1]
+            residuals.append(slope + spectrum[idx] * weighted[idx])
+
+        residuals.extend(
+            sum(weight * value for weight, value in zip(weights, spectrum))
+            - target_value
+            for weights, target_value in zip(matching, target))
+
+        if max(abs(residual) for residual in residuals) < SOLVER_TOLERANCE:
+            exceeding = {idx for idx in range(count)
+                         if log_values[idx] > 0.0} - pinned
+            if not exceeding:
+                break
+
+            pinned |= exceeding
+            continue
+
+        jacobian = [[0.0] * (count + 3) for _ in range(count + 3)]
+        for idx in range(count):
+            if idx in pinned:
+                jacobian[idx][idx] = 1.0
+            else:
+                jacobian[idx][idx] = (idx > 0) + (idx < count - 1) \
+                    + spectrum[idx] * weighted[idx]
+                if idx > 0:
+                    jacobian[idx][idx - 1] = -1.0
+                if idx < count - 1:
+                    jacobian[idx][idx + 1] = -1.0
+                for channel, weights in enumerate(matching):
+                    jacobian[idx][count + channel] = \
+                        spectrum[idx] * weights[idx]
+
+            for channel, weights in enumerate(matching):
+                jacobian[count + channel][idx] = spectrum[idx] * weights[idx]
+
+        steps = solve_linear(jacobian, [-residual for residual in residuals])
+        log_values = [value + step for value, step
+                      in zip(log_values, steps)]
+        multipliers = [value + step for value, step
+                       in zip(multipliers, steps[count:])]
+
+    return tuple(min(max(math.exp(value), MIN_REFLECTANCE), 1.0)
+                 for value in log_values)
+
+
+@functools.lru_cache(maxsize=4096)
+def pigment_ks(rgb_value):
+    """
+    Converts a color to the absorption over scattering (K/S) values of a
+    pigment of its reflectance spectrum.
+
+    :param rgb_value: tuple, the red, green and blue values 0-255.
+    :return: tuple, the K/S value of every wavelength.
+    """
+
+    return tuple((1.0 - value) ** 2 / (2.0 * value)
+                 for value in reflectance(tuple(rgb_value)))
+
+
+def mix_ks(first_ks, second_ks, ratio):
+    """
+    Mixes two pigments by concentration and converts the mixture back to
+    RGB.
+
+    :param first_ks: tuple, the K/S values of the first pigment.
+    :param second_ks: tuple, the K/S values of the second pigment.
+    :param ratio: float, the concentration of the second pigment 0.0-1.0.
+    :return: tuple, the red, green and blue values of the mixture.
+    """
+
+    first_ratio = 1.0 - ratio
+    ks_values = [first_value * first_ratio + second_value * ratio
+                 for first_value, second_value in zip(first_ks, second_ks)]
+
+    sqrt = math.sqrt
+    mixture = [1.0 + ks_value - sqrt(ks_value * ks_value + 2.0 * ks_value)
+               for ks_value in ks_values]
+
+    return tuple(linear_to_srgb_value(sum(map(operator.mul, weights,
+                                              mixture)))
+                 for weights in RGB_MATCHING)
+
+
+def mix_rgb(first_rgb, second_rgb, ratio=0.5):
+    """
+    Mixes two colors like paints.
+
+    :param first_rgb: tuple, the red, green and blue values of the first
+    color.
+    :param second_rgb: tuple, the red, green and blue values of the second
+    color.
+    :param ratio: float, the amount of the second color 0.0-1.0.
+    :return: tuple, the red, green and blue values of the mixture.
+    """
+
+    return mix_ks(pigment_ks(tuple(first_rgb)), pigment_ks(tuple(second_rgb)),
+                  ratio)
+
+
+def mix_batch(rgb_pairs, ratios=DEFAULT_RATIOS):
+    """
+    Mixes many pairs of colors at many ratios at once. The spectrum of every
+    distinct color is calculated only once.
+
+    :param rgb_pairs: list, the pairs of RGB value tuples to mix.
+    :param ratios: list, the amounts of the second color 0.0-1.0.
+    :return: list, the mixtures of every pair as lists of RGB value tuples
+    in ratio order.
+    """
+
+    return [[mix_ks(first_ks, second_ks, ratio) for ratio in ratios]
+            for first_ks, second_ks in (
+                (pigment_ks(tuple(first_rgb)), pigment_ks(tuple(second_rgb)))
+                for first_rgb, second_rgb in rgb_pairs)]
+
+
+def gradient_ratios(step_count):
+    """
+    Spreads the ratios of a mixing gradient evenly between two colors.
+
+    :param step_count: int, the number of mixtures between the colors.
+    :return: list, the ratios without the unmixed ends.
+    """
+
+    return [step / (step_count + 1) for step in range(1, step_count + 1)]
+
+
+def mixing_grid(rgb_values, ratios=DEFAULT_RATIOS):
+    """
+    Mixes every pair of colors of a wheel at the ratios.
+
+    :param rgb_values: list, the RGB values of the wheel colors.
+    :param ratios: list, the amounts of the second color 0.0-1.0.
+    :return: dict, the mixtures as lists of RGB value tuples keyed by the
+    indexes of the mixed colors.
+    """
+
+    index_pairs = [(first_idx, second_idx)
+                   for first_idx in range(len(rgb_values))
+                   for second_idx in range(first_idx + 1, len(rgb_values))]
+
+    return dict(zip(index_pairs, mix_batch(
+        [(rgb_values[first_idx], rgb_values[second_idx])
+         for first_idx, second_idx in index_pairs], ratios)))
+
+
+def main():
+    from argument_types import positive_int
+    from palette import Palette
+    from palette_snapshot import COLOR_WHEEL_KEYS
+    from wheel_library import default_library
+
+    parser = argparse.ArgumentParser(
+        description='Mix the intermediate hues of a color wheel like paints.')
+    parser.add_argument('--wheel', default='RYB',
+                        choices=COLOR_WHEEL_KEYS
+                        + list(default_library().wheels()))
+    parser.add_argument('--steps', type=positive_int, default=1,
+                        help='number of mixtures between adjacent colors')
+    args = parser.parse_args()
+
+    palette = Palette(args.wheel)
+    for color in palette.intermediate_hues(args.steps):
+        print(f'{color.name()}: {color.hex()}')
+
+    # Note! Run as a script this module isn't the one the palette imported,
+    # so the grid is timed with the spectra calculated afresh
+    rgb_values = [tuple(color.values()) for color in palette.values()]
+    start_time = time.perf_counter()
+    grid = mixing_grid(rgb_values)
+    print(f'Mixed {len(grid) * len(DEFAULT_RATIOS)} colors in '
+          f'{(time.perf_counter() - start_time) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
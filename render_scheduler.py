@@ -0,0 +1,175 @@
+import time
+
+import instrumentation
+from main import show_error
+
+
+class RenderScheduler:
+
+    def __init__(self, widget, frame_budget_ms=16):
+        """
+        Creates a RenderScheduler instance that keeps track of which view
+        regions are out of date and redraws them in one batch at most once per
+        frame budget on the Tk event loop. Rapid UI events, like slider drags,
+        get coalesced into a single render.
+
+        :param widget: tkinter.Misc, the widget whose event loop runs renders.
+        :param frame_budget_ms: int, the minimum time between renders in ms.
+        """
+
+        self.__widget = widget
+        self.__frame_budget_ms = frame_budget_ms
+        self.__regions = {}
+        self.__dirty_regions = set()
+        self.__pending_after_id = None
+        self.__last_flush_time = 0.0
+
+        self.__flush_listeners = []
+        self.__current_action = None
+        self.__render_counts = {}
+        self.__action_counts = {}
+        self.__action_render_counts = {}
+
+    def register(self, region, render_function, supersedes=()):
+        """
+        Registers the function that renders a view region. Regions are
+        rendered in the order they are registered.
+
+        :param region: str, the name of the view region.
+        :param render_function: function, the function drawing the region.
+        :param supersedes: tuple, the regions already covered by this region
+        that can be skipped when both are dirty.
+        """
+
+        if not isinstance(region, str) or not callable(render_function):
+            show_error('Invalid view region to render received!')
+            return
+
+        self.__regions[region] = (render_function, tuple(supersedes))
+        self.__render_counts[region] = 0
+
+    def invalidate(self, *regions):
+        """
+        Marks view regions dirty and schedules them to be redrawn on the next
+        frame.
+
+        :param regions: str, the names of the view regions to redraw.
+        """
+
+        for region in regions:
+            if region not in self.__regions:
+                show_error(f'Value {region} is not a valid view region!')
+                return
+
+        self.__dirty_regions.update(regions)
+
+        if self.__pending_after_id is not None:
+            return
+
+        elapsed_ms = (time.perf_counter() - self.__last_flush_time) * 1000
+        remaining_ms = int(self.__frame_budget_ms - elapsed_ms)
+
+        if remaining_ms > 0:
+            self.__pending_after_id = self.__widget.after(
+                remaining_ms, self.__run_pending)
+        else:
+            self.__pending_after_id = self.__widget.after_idle(
+                self.__run_pending)
+
+    def add_flush_listener(self, listener):
+        """
+        Registers a function to be called after each flush with the user action
+        that caused it, the rendered regions and the render time in seconds.
+
+        :param listener: function, the function to call after flushes.
+        """
+
+        if not callable(listener):
+            show_error('Invalid flush listener received!')
+            return
+
+        self.__flush_listeners.append(listener)
+
+    def begin_action(self, action):
+        """
+        Names the user action causing the following invalidations so the
+        renders of the next flush get counted for it.
+
+        :param action: str, the name of the user action.
+        """
+
+        self.__current_action = action
+        self.__action_counts[action] = self.__action_counts.get(action, 0) + 1
+        self.__action_render_counts.setdefault(action, 0)
+
+    def __run_pending(self):
+        """
+        Renders the dirty regions when the scheduled frame is due.
+        """
+
+        self.__pending_after_id = None
+        self.flush()
+
+    def flush(self):
+        """
+        Renders all the dirty regions immediately.
+        """
+
+        if self.__pending_after_id is not None:
+            self.__widget.after_cancel(self.__pending_after_id)
+            self.__pending_after_id = None
+
+        dirty_regions = self.__dirty_regions
+        self.__dirty_regions = set()
+
+        for region in dirty_regions.copy():
+            dirty_regions.difference_update(self.__regions[region][1])
+
+        start_time = time.perf_counter()
+        rendered_regions = []
+
+        for region, (render_function, _) in self.__regions.items():
+            if region not in dirty_regions:
+                continue
+
+            render_function()
+            rendered_regions.append(region)
+            self.__render_counts[region] += 1
+            instrumentation.count(f'render.{region}')
+
+            if self.__current_action is not None:
+                self.__action_render_counts[self.__current_action] += 1
+
+        action = self.__current_action or 'other'
+        self.__current_action = None
+        self.__last_flush_time = time.perf_counter()
+
+        if not rendered_regions:
+            return
+
+        render_time = self.__last_flush_time - start_time
+        instrumentation.record_time(f'render.action.{action}', render_time)
+
+        for listener in self.__flush_listeners:
+            listener(action, rendered_regions, render_time)
+
+    def render_counts(self):
+        """
+        Fetches how many times each view region has been rendered.
+
+        :return: dict, the render counts keyed by region.
+        """
+
+        return dict(self.__render_counts)
+
+    def action_render_counts(self):
+        """
+        Fetches how many renders the user actions have triggered on average.
+
+        :return: dict, the average renders per action keyed by action.
+        """
+
+        return {
+            action: self.__action_render_counts[action] / count
+            for action, count in self.__action_counts.items()
+        }
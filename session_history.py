@@ -0,0 +1,168 @@
+import collections
+import sys
+
+from color import Color
+from palette import Palette
+
+DEFAULT_MEMORY_BUDGET = 4 * 1024 * 1024
+
+
+def estimate_size(value, seen=None):
+    """
+    Estimates the memory held by a history value. Containers, palettes and
+    colors are followed, objects reached twice are only counted once.
+
+    :param value: object, the value to measure.
+    :param seen: set, the ids of the objects already counted.
+    :return: int, the estimated size in bytes.
+    """
+
+    if seen is None:
+        seen = set()
+
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(estimate_size(key, seen) + estimate_size(item, seen)
+                    for key, item in value.items())
+    elif isinstance(value, (tuple, list)):
+        size += sum(estimate_size(item, seen) for item in value)
+    elif isinstance(value, Palette):
+        size += estimate_size(value.values(), seen)
+    elif isinstance(value, Color):
+        size += sys.getsizeof(vars(value))
+
+    return size
+
+
+class SessionHistory:
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """
+        Creates a SessionHistory instance that records the steps of an editing
+        session for undo and redo. A step holds the view state before and
+        after it and only the colors it changed, the palettes in the view
+        states are shared with the session instead of copied. The oldest
+        steps are dropped when the history grows over its memory budget.
+
+        :param memory_budget: int, the allowed estimated size in bytes.
+        """
+
+        self.__memory_budget = memory_budget
+        self.__undo_steps = collections.deque()
+        self.__redo_steps = []
+        self.__memory_size = 0
+
+    def record(self, view_before, view_after, color_changes=()):
+        """
+        Records a step to be undone. Steps that didn't change anything are
+        skipped. Recording a step clears the steps to be redone.
+
+        :param view_before: dict, the view state before the step.
+        :param view_after: dict, the view state after the step.
+        :param color_changes: list, the changed colors with their RGB values
+        before and after the step as tuples.
+        :return: bool, True if the step was recorded.
+        """
+
+        color_changes = tuple(
+            (color, tuple(before_values), tuple(after_values))
+            for color, before_values, after_values in color_changes
+            if tuple(before_values) != tuple(after_values)
+        )
+        if view_before == view_after and not color_changes:
+            return False
+
+        # Note! Palettes and colors already in the view before the step are
+        # kept alive by the earlier steps, so only new objects are counted
+        shared_ids = set()
+        estimate_size(view_before, shared_ids)
+        step_size = sys.getsizeof(view_before) + estimate_size(
+            (view_after, color_changes), shared_ids)
+
+        step = (view_before, view_after, color_changes, step_size)
+
+        for redo_step in self.__redo_steps:
+            self.__memory_size -= redo_step[3]
+        self.__redo_steps.clear()
+
+        self.__undo_steps.append(step)
+        self.__memory_size += step[3]
+
+        # Note! The latest step is always kept even if it's over the budget
+        while (
+                self.__memory_size > self.__memory_budget
+                and len(self.__undo_steps) > 1
+        ):
+            self.__memory_size -= self.__undo_steps.popleft()[3]
+
+        return True
+
+    def undo(self):
+        """
+        Reverts the colors changed in the latest step.
+
+        :return: dict, the view state to restore or None if there's nothing
+        to undo.
+        """
+
+        if not self.__undo_steps:
+            return None
+
+        step = self.__undo_steps.pop()
+        for color, before_values, _ in reversed(step[2]):
+            color.replace_values(*before_values)
+
+        self.__redo_steps.append(step)
+
+        return step[0]
+
+    def redo(self):
+        """
+        Reapplies the colors changed in the latest undone step.
+
+        :return: dict, the view state to restore or None if there's nothing
+        to redo.
+        """
+
+        if not self.__redo_steps:
+            return None
+
+        step = self.__redo_steps.pop()
+        for color, _, after_values in step[2]:
+            color.replace_values(*after_values)
+
+        self.__undo_steps.append(step)
+
+        return step[1]
+
+    def can_undo(self):
+        """
+        Tells whether there are steps to undo.
+
+        :return: bool, True if a step can be undone.
+        """
+
+        return bool(self.__undo_steps)
+
+    def can_redo(self):
+        """
+        Tells whether there are steps to redo.
+
+        :return: bool, True if a step can be redone.
+        """
+
+        return bool(self.__redo_steps)
+
+    def memory_size(self):
+        """
+        Fetches the estimated memory held by the recorded steps.
+
+        :return: int, the estimated size in bytes.
+        """
+
+        return self.__memory_size
@@ -0,0 +1,301 @@
+"""
+Persistence of the editing session between launches. The session state is
+written to an append-only journal, a snapshot of the whole state followed by
+records of only what changed since. The journal is compacted back into a
+single snapshot once it has grown long. Palettes are stored with their colors
+so restoring them doesn't recompute any hue variants.
+"""
+
+import os
+import pickle
+
+from color import Color
+from palette import Palette
+from palette_snapshot import COLOR_WHEEL_KEYS
+from wheel_library import WHEEL_COLOR_COUNT, default_library
+
+SESSION_FILENAME = '.colorian_session'
+JOURNAL_VERSION = 1
+COMPACTION_RECORD_COUNT = 256
+
+
+def default_session_path():
+    """
+    Fetches the path of the session journal. The COLORIAN_SESSION environment
+    variable overrides the default path in the home directory.
+
+    :return: str, the path of the session journal.
+    """
+
+    return os.environ.get('COLORIAN_SESSION') or os.path.join(
+        os.path.expanduser('~'), SESSION_FILENAME)
+
+
+def palette_state(palette):
+    """
+    Converts a palette into the state stored in the journal. Both the original
+    and the current values of the colors are kept so edited colors are
+    restored as they were.
+
+    :param palette: Palette, the palette to convert.
+    :return: tuple, the color wheel, the color names, the picked color name
+    and the packed original and current RGB values of the colors.
+    """
+
+    colors = palette.values()
+    picked_color = palette.get_picked_color()
+
+    return (
+        palette.get_color_wheel(),
+        tuple(color.name() for color in colors),
+        picked_color.name() if picked_color is not None else None,
+        bytes(value for color in colors for value in color.original_values()),
+        bytes(value for color in colors for value in color.values())
+    )
+
+
+def create_session_palette(state):
+    """
+    Creates a palette of its state in the journal. States of unknown wheels
+    or with values of the wrong type are invalid.
+
+    :param state: tuple, the palette state from palette_state.
+    :return: Palette, the palette or None if the state is invalid.
+    """
+
+    if not isinstance(state, tuple) or len(state) != 5:
+        return None
+
+    color_wheel_key, color_names, picked_color_name, original_values, \
+        current_values = state
+
+    if (
+            not isinstance(color_wheel_key, str)
+            or (color_wheel_key not in COLOR_WHEEL_KEYS
+                and color_wheel_key not in default_library().wheels())
+            or not isinstance(color_names, tuple)
+            or len(color_names) != WHEEL_COLOR_COUNT
+            or not all(isinstance(color_name, str)
+                       for color_name in color_names)
+            or not isinstance(original_values, bytes)
+            or not isinstance(current_values, bytes)
+            or len(original_values) != len(color_names) * 3
+            or len(current_values) != len(color_names) * 3
+    ):
+        return None
+
+    colors = []
+    for idx, color_name in enumerate(color_names):
+        offset = idx * 3
+        color = Color(*original_values[offset:offset + 3], color_name)
+        color.replace_values(*current_values[offset:offset + 3])
+        colors.append(color)
+
+    picked_colors = [color for color in colors
+                     if color.name() == picked_color_name]
+    if not picked_colors:
+        return None
+
+    palette = Palette(color_wheel_key, colors)
+    palette.set_picked_color(picked_colors[0])
+
+    return palette
+
+
+def diff_states(old_state, new_state):
+    """
+    Finds the changes between two session states. Palettes with only edited
+    colors are stored as the changed colors instead of the whole palette.
+
+    :param old_state: dict, the earlier session state.
+    :param new_state: dict, the later session state.
+    :return: dict, the changed values of the state.
+    """
+
+    changes = {key: value for key, value in new_state.items()
+               if key != 'palettes' and old_state.get(key) != value}
+
+    palette_changes = {}
+    color_changes = {}
+    old_palettes = old_state.get('palettes', {})
+    for hue_variant_key, state in new_state['palettes'].items():
+        old_palette_state = old_palettes.get(hue_variant_key)
+        if old_palette_state == state:
+            continue
+
+        if old_palette_state is None or old_palette_state[:4] != state[:4]:
+            palette_changes[hue_variant_key] = state
+            continue
+
+        old_values = old_palette_state[4]
+        new_values = state[4]
+        color_changes[hue_variant_key] = tuple(
+            (offset, new_values[offset:offset + 3])
+            for offset in range(0, len(new_values), 3)
+            if old_values[offset:offset + 3] != new_values[offset:offset + 3])
+
+    if palette_changes:
+        changes['palettes'] = palette_changes
+    if color_changes:
+        changes['colors'] = color_changes
+
+    return changes
+
+
+def apply_changes(state, changes):
+    """
+    Applies the changes of a journal record to a session state.
+
+    :param state: dict, the session state.
+    :param changes: dict, the changes from diff_states.
+    :return: dict, the new session state.
+    """
+
+    new_state = dict(state)
+    palettes = dict(state['palettes'])
+    palettes.update(changes.get('palettes', {}))
+
+    for hue_variant_key, color_changes in changes.get('colors', {}).items():
+        palette_values = palettes[hue_variant_key]
+        current_values = bytearray(palette_values[4])
+        for offset, rgb_values in color_changes:
+            current_values[offset:offset + 3] = rgb_values
+
+        palettes[hue_variant_key] = palette_values[:4] + (
+            bytes(current_values),)
+
+    new_state.update((key, value) for key, value in changes.items()
+                     if key not in ('palettes', 'colors'))
+    new_state['palettes'] = palettes
+
+    return new_state
+
+
+class SessionJournal:
+
+    def __init__(self, path, compaction_record_count=COMPACTION_RECORD_COUNT):
+        """
+        Creates a SessionJournal instance that saves the session state to an
+        append-only journal file. Every save appends only the changes, the
+        journal is rewritten as a snapshot after the record count is reached.
+
+        :param path: str, the path of the journal file.
+        :param compaction_record_count: int, the number of change records
+        after which the journal is compacted.
+        """
+
+        self.__path = path
+        self.__compaction_record_count = compaction_record_count
+        self.__state = None
+        self.__record_count = 0
+
+    def load(self):
+        """
+        Reads the session state from the journal. A record cut short by an
+        interrupted write ends the journal instead of invalidating it.
+
+        :return: dict, the session state or None if there's no usable journal.
+        """
+
+        state = None
+        record_count = 0
+
+        try:
+            with open(self.__path, 'rb') as file:
+                record = pickle.load(file)
+                if (
+                        isinstance(record, tuple)
+                        and record[:2] == ('snapshot', JOURNAL_VERSION)
+                ):
+                    state = record[2]
+
+                while state is not None:
+                    try:
+                        record_type, changes = pickle.load(file)
+                    except (pickle.UnpicklingError, EOFError, ValueError):
+                        break
+
+                    if record_type != 'changes':
+                        break
+
+                    state = apply_changes(state, changes)
+                    record_count += 1
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError,
+                KeyError, TypeError):
+            return None
+
+        self.__state = state
+        self.__record_count = record_count
+
+        return state
+
+    def save(self, state):
+        """
+        Appends the changes of the session state since the latest save to the
+        journal.
+
+        :param state: dict, the session state to save.
+        :return: bool, True if anything was written.
+        """
+
+        if (
+                self.__state is None
+                or self.__record_count >= self.__compaction_record_count
+        ):
+            return self.compact(state)
+
+        changes = diff_states(self.__state, state)
+        if not changes:
+            return False
+
+        # Note! Saving the session is best-effort, the session goes on even
+        # if the journal can't be written
+        try:
+            with open(self.__path, 'ab') as file:
+                pickle.dump(('changes', changes), file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            return False
+
+        self.__state = apply_changes(self.__state, changes)
+        self.__record_count += 1
+
+        return True
+
+    def compact(self, state=None):
+        """
+        Rewrites the journal as a single snapshot of the session state. The
+        snapshot is written to a temporary file first so an interrupted write
+        never loses the journal.
+
+        :param state: dict, the session state, defaults to the latest saved.
+        :return: bool, True if the journal was rewritten.
+        """
+
+        if state is None:
+            state = self.__state
+        if state is None:
+            return False
+
+        temporary_path = self.__path + '.tmp'
+        try:
+            with open(temporary_path, 'wb') as file:
+                pickle.dump(('snapshot', JOURNAL_VERSION, state), file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.__path)
+        except OSError:
+            return False
+
+        self.__state = state
+        self.__record_count = 0
+
+        return True
+
+    def record_count(self):
+        """
+        Fetches the number of change records after the snapshot.
+
+        :return: int, the number of change records in the journal.
+        """
+
+        return self.__record_count
@@ -0,0 +1,87 @@
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubVariable:
+
+    def __init__(self, master=None, value=None):
+        """
+        Creates a StubVariable instance that stands in for the Tk variables
+        without a Tcl interpreter.
+
+        :param master: tkinter.Misc, the ignored master widget.
+        :param value: object, the initial value.
+        """
+
+        self.__value = value
+
+    def get(self):
+        """
+        Fetches the value of the variable.
+
+        :return: object, the value.
+        """
+
+        return self.__value
+
+    def set(self, value):
+        """
+        Sets the value of the variable.
+
+        :param value: object, the new value.
+        """
+
+        self.__value = value
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path, monkeypatch):
+    """
+    Points the home directory to a temporary one so the session journal and
+    the compiled wheel cache of the user are never read or written. The
+    shared wheel library is created afresh for every test.
+
+    :return: pathlib.Path, the temporary home directory.
+    """
+
+    from wheel_library import default_library
+
+    home_path = tmp_path / 'home'
+    home_path.mkdir()
+    monkeypatch.setenv('HOME', str(home_path))
+    default_library.cache_clear()
+
+    yield home_path
+
+    default_library.cache_clear()
+
+
+@pytest.fixture
+def stub_tk():
+    """
+    Replaces the Tk widgets of the UI with mocks so the UI can be built
+    without a display. Errors shown to the user are collected instead.
+
+    :return: list, the error messages shown while the fixture is in use.
+    """
+
+    import colorian_ui
+    import picker_canvas
+
+    stub_module = mock.MagicMock()
+    stub_module.StringVar = StubVariable
+    stub_module.IntVar = StubVariable
+    stub_module.DoubleVar = StubVariable
+
+    errors = []
+    with mock.patch.object(colorian_ui, 'tk', stub_module), \
+            mock.patch.object(colorian_ui, 'ttk', mock.MagicMock()), \
+            mock.patch.object(picker_canvas, 'tk', stub_module), \
+            mock.patch('main.messagebox.showerror',
+                       lambda title, message: errors.append(message)):
+        yield errors
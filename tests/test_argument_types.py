@@ -0,0 +1,38 @@
+import argparse
+
+import pytest
+
+from argument_types import (hex_rgb, number_range, positive_float,
+                            positive_int)
+
+
+def test_number_range_accepts_values_within_limits():
+    assert number_range(float, 1.0, 21.0)('4.5') == 4.5
+    assert positive_int('3') == 3
+
+
+@pytest.mark.parametrize('value', ['0', '-2', 'many'])
+def test_positive_int_rejects_invalid_values(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        positive_int(value)
+
+
+def test_hex_rgb_parses_hex_codes():
+    assert hex_rgb('#FF8000') == (255, 128, 0)
+    assert hex_rgb('ff8000') == (255, 128, 0)
+
+    with pytest.raises(argparse.ArgumentTypeError):
+        hex_rgb('F80')
+
+
+@pytest.mark.parametrize('value', ['nan', 'inf', '-inf'])
+def test_number_range_rejects_non_finite_values(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        number_range(float, 0.0, 1.0)(value)
+
+
+def test_positive_float_rejects_zero():
+    assert positive_float('0.5') == 0.5
+
+    with pytest.raises(argparse.ArgumentTypeError):
+        positive_float('0')
@@ -0,0 +1,22 @@
+import pytest
+
+from cmyk import BLACK_GENERATIONS, rgb_to_cmyk, separate
+
+
+@pytest.mark.parametrize('black_generation', BLACK_GENERATIONS)
+def test_white_separates_to_no_ink(black_generation):
+    assert rgb_to_cmyk([(255, 255, 255)], black_generation) == \
+        [(0, 0, 0, 0)]
+
+
+@pytest.mark.parametrize('black_generation', BLACK_GENERATIONS)
+@pytest.mark.parametrize('ink_limit', [300, 150])
+def test_black_separates_to_full_black_generation(black_generation,
+                                                  ink_limit):
+    expected = [tuple(round(ink) for ink in cmyk_value)
+                for cmyk_value in separate([(0, 0, 0)], black_generation,
+                                           ink_limit=ink_limit)]
+
+    assert rgb_to_cmyk([(0, 0, 0)], black_generation,
+                       ink_limit=ink_limit) == expected
+    assert expected[0][3] == 100
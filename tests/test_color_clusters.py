@@ -0,0 +1,16 @@
+import pytest
+
+from color_clusters import deduplicate
+
+
+def test_deduplicate_collapses_near_duplicates():
+    representatives = deduplicate([bytes([255, 0, 0, 254, 0, 0, 0, 0, 255])])
+
+    assert [(rgb_value, count) for rgb_value, _, count in representatives] \
+        == [((255, 0, 0), 2), ((0, 0, 255), 1)]
+
+
+@pytest.mark.parametrize('threshold', [0.0, -0.02, float('nan')])
+def test_deduplicate_rejects_invalid_threshold(threshold):
+    with pytest.raises(ValueError):
+        deduplicate([bytes([255, 0, 0])], threshold)
@@ -0,0 +1,23 @@
+from unittest import mock
+
+import instrumentation
+from export_job import ExportJob
+
+
+def test_export_times_only_the_file_write(tmp_path):
+    path = tmp_path / 'palette.txt'
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        job = ExportJob(mock.MagicMock(), str(path), iter(['Red\n', 'Blue\n']),
+                        2, mock.MagicMock(), mock.MagicMock())
+        job.start()
+        job.wait(5.0)
+        timings = instrumentation.stats()['timings']
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+    assert path.read_text() == 'Red\nBlue\n'
+    assert timings['export.write_file']['count'] == 1
+    assert not (tmp_path / 'palette.txt.tmp').exists()
@@ -0,0 +1,24 @@
+import pytest
+
+from harmony_search import search
+
+
+@pytest.mark.parametrize('settings', [
+    {'min_contrast': 0.0},
+    {'min_contrast': -3.0},
+    {'min_contrast': float('nan')},
+    {'min_distance': 0.0},
+    {'min_distance': -0.1},
+    {'min_distance': float('nan')}
+])
+def test_search_rejects_invalid_settings(settings):
+    with pytest.raises(ValueError):
+        search('Triadic', restart_count=1, step_count=1, **settings)
+
+
+def test_search_finds_palettes_following_the_scheme():
+    palettes = search('Triadic', result_count=1, restart_count=1,
+                      step_count=20, processes=1)
+
+    assert len(palettes) == 1
+    assert palettes[0].get_color_scheme() == 'Triadic'
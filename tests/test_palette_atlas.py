@@ -0,0 +1,78 @@
+import json
+from multiprocessing import shared_memory
+
+import pytest
+
+from palette_atlas import (ATLAS_HEADER, ATLAS_MAGIC, ATLAS_VERSION,
+                           PaletteAtlas, attach_atlas, create_atlas)
+
+
+def test_attached_atlas_reads_the_created_colors():
+    atlas = create_atlas()
+    try:
+        attached_atlas = attach_atlas(atlas.name())
+        assert attached_atlas.color_wheels() == atlas.color_wheels()
+        assert bytes(attached_atlas.rgb_values('RYB', 'TINT')) == \
+            bytes(atlas.rgb_values('RYB', 'TINT'))
+        attached_atlas.close()
+
+        with pytest.raises(ValueError):
+            attached_atlas.unlink()
+    finally:
+        atlas.close()
+        atlas.unlink()
+
+
+def test_block_without_atlas_is_rejected():
+    memory = shared_memory.SharedMemory(create=True, size=ATLAS_HEADER.size)
+    try:
+        with pytest.raises(ValueError):
+            attach_atlas(memory.name)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def atlas_block(index_bytes, colors_length=0):
+    """
+    Creates a shared memory block with an atlas header and the index.
+
+    :param index_bytes: bytes, the index of the atlas.
+    :param colors_length: int, the length of the colors in the header.
+    :return: SharedMemory, the block.
+    """
+
+    memory = shared_memory.SharedMemory(
+        create=True, size=ATLAS_HEADER.size + len(index_bytes) + 3)
+    ATLAS_HEADER.pack_into(memory.buf, 0, ATLAS_MAGIC, ATLAS_VERSION,
+                           len(index_bytes), colors_length)
+    memory.buf[ATLAS_HEADER.size:ATLAS_HEADER.size + len(index_bytes)] = \
+        index_bytes
+
+    return memory
+
+
+@pytest.mark.parametrize('index_bytes', [
+    b'{"amounts": {}, "wheels"',
+    json.dumps({'amounts': {}, 'wheels': {}}).encode('utf-8'),
+    json.dumps({'amounts': {}, 'wheels': {'RYB': ['Red']},
+                'offsets': {'RYB/HUE': 3}}).encode('utf-8')
+])
+def test_corrupt_atlas_is_closed_and_rejected(index_bytes):
+    memory = atlas_block(index_bytes, colors_length=3)
+    try:
+        with pytest.raises(ValueError):
+            PaletteAtlas(memory)
+        assert memory.buf is None
+    finally:
+        memory.unlink()
+
+
+def test_block_shorter_than_header_is_rejected():
+    memory = shared_memory.SharedMemory(create=True, size=4)
+    try:
+        with pytest.raises(ValueError):
+            PaletteAtlas(memory)
+        assert memory.buf is None
+    finally:
+        memory.unlink()
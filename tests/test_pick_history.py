@@ -0,0 +1,59 @@
+import time
+from unittest import mock
+
+from colorian_ui import ColorianUI
+
+
+def run_background_work(main_window, ui):
+    """
+    Polls the background work of the UI until the picked color's palettes
+    are shown.
+
+    :param main_window: MagicMock, the stubbed main window.
+    :param ui: ColorianUI, the UI waiting for its background work.
+    """
+
+    picked_color = ui.capture_view_state()['picked']
+    for _ in range(500):
+        _, poll_function = main_window.after.call_args[0]
+        poll_function()
+        palettes = ui.capture_view_state()['palettes']
+        if palettes[0].get_picked_color().name() == picked_color.name():
+            return
+        time.sleep(0.01)
+
+    raise AssertionError('The background work never finished')
+
+
+def test_superseded_pick_records_one_step(stub_tk, tmp_path, monkeypatch):
+    monkeypatch.setenv('COLORIAN_SESSION', str(tmp_path / 'session'))
+    main_window = mock.MagicMock()
+    ui = ColorianUI(main_window=main_window)
+    view_before = ui.capture_view_state()
+
+    picker_palette = ui._ColorianUI__color_picker_palette
+    first_color, second_color = [
+        color for color in picker_palette.values()
+        if color is not view_before['picked']][:2]
+    ui.pick_color(first_color)
+    ui.pick_color(second_color)
+    run_background_work(main_window, ui)
+
+    ui.undo()
+    assert ui.capture_view_state() == view_before
+
+    ui.undo()
+    assert ui.capture_view_state() == view_before
+    assert stub_tk == []
+
+
+def test_invalid_changes_leave_no_history_step(stub_tk, tmp_path,
+                                               monkeypatch):
+    monkeypatch.setenv('COLORIAN_SESSION', str(tmp_path / 'session'))
+    ui = ColorianUI(main_window=mock.MagicMock())
+
+    ui.set_hue_variant('Sepia')
+    ui.set_color_scheme(color_scheme_key='Pentadic')
+
+    assert len(stub_tk) == 2
+    assert ui._ColorianUI__history_step is None
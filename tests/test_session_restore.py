@@ -0,0 +1,70 @@
+from unittest import mock
+
+import pytest
+
+from colorian_ui import ColorianUI
+from session_journal import SessionJournal
+
+
+def test_ui_restores_saved_session(stub_tk, tmp_path, monkeypatch):
+    session_path = tmp_path / 'session'
+    monkeypatch.setenv('COLORIAN_SESSION', str(session_path))
+
+    first_ui = ColorianUI(main_window=mock.MagicMock())
+    first_ui.save_session()
+    assert session_path.exists()
+
+    second_ui = ColorianUI(main_window=mock.MagicMock())
+
+    assert second_ui.capture_session_state() == \
+        first_ui.capture_session_state()
+    assert stub_tk == []
+
+
+def corrupt_session(session_path, change_function):
+    """
+    Saves a session whose state is changed by the function.
+
+    :param session_path: pathlib.Path, the path of the session journal.
+    :param change_function: function, called with the session state to
+    change it.
+    """
+
+    ui = ColorianUI(main_window=mock.MagicMock())
+    session_state = ui.capture_session_state()
+    change_function(session_state)
+
+    journal = SessionJournal(str(session_path))
+    journal.compact(session_state)
+
+
+def set_amounts(session_state):
+    session_state['amounts'] = ['TINT', 'SHADE', 'TONE']
+
+
+def set_palette_wheel(session_state):
+    session_state['palettes']['TINT'] = \
+        ('NOPE',) + session_state['palettes']['TINT'][1:]
+
+
+def set_palette_names(session_state):
+    session_state['palettes']['HUE'] = \
+        session_state['palettes']['HUE'][:1] + ((1, 2),) \
+        + session_state['palettes']['HUE'][2:]
+
+
+@pytest.mark.parametrize('change_function', [set_amounts, set_palette_wheel,
+                                             set_palette_names])
+def test_ui_starts_clean_from_corrupt_session(stub_tk, tmp_path, monkeypatch,
+                                              change_function):
+    session_path = tmp_path / 'session'
+    monkeypatch.setenv('COLORIAN_SESSION', str(session_path))
+    corrupt_session(session_path, change_function)
+
+    ui = ColorianUI(main_window=mock.MagicMock())
+    session_state = ui.capture_session_state()
+
+    assert session_state['amounts'] == {'TINT': 25, 'SHADE': 25, 'TONE': 90}
+    assert {palette_state[0] for palette_state
+            in session_state['palettes'].values()} == {'RYB'}
+    assert stub_tk == []
@@ -0,0 +1,17 @@
+import pytest
+
+from wheel_library import parse_color
+
+
+def test_parse_color_reads_rgb_values():
+    assert parse_color({'name': 'Red', 'rgb': [255, 0, 0]}) == \
+        (('Red', (255, 0, 0)), None)
+
+
+@pytest.mark.parametrize('rgb_values', [[True, 0, 0], [255, False, 0],
+                                        [256, 0, 0], [255.0, 0, 0]])
+def test_parse_color_rejects_invalid_rgb_values(rgb_values):
+    color, error = parse_color({'name': 'Red', 'rgb': rgb_values})
+
+    assert color is None
+    assert error
@@ -0,0 +1,471 @@
+"""
+Offscreen thumbnails of the hue wheel with its color scheme outlines and of
+the color scheme swatch strip, rendered to PNG and SVG without a display.
+The wheel reproduces the geometry of the hue wheel drawn in the UI. The pixel
+layout of a wheel only depends on its size, so it's computed once and every
+thumbnail only swaps the colors of an indexed PNG. Batches of thumbnails are
+rendered in a pool of processes.
+"""
+
+from array import array
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import math
+import os
+import sys
+import time
+import zlib
+
+# Note! The hue wheel is drawn into the bounding box (50, 10, 440, 400) of a
+# 480 x 400 canvas with 3 pixel wide scheme outlines
+CANVAS_WIDTH = 480
+CANVAS_HEIGHT = 400
+WHEEL_CENTER = (245, 205)
+WHEEL_RADIUS = 195
+OUTLINE_WIDTH = 3
+
+DEFAULT_WIDTH = 120
+DEFAULT_SWATCH_SIZE = 20
+THUMBNAIL_FORMATS = ['png', 'svg']
+BATCH_CHUNK_SIZE = 64
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def slice_start_angles(color_count):
+    """
+    Calculates the start angles of the hue wheel slices like the UI, the
+    first color centered at the top and the rest following clockwise.
+
+    :param color_count: int, the number of colors in the wheel.
+    :return: list, the start angles in degrees counterclockwise from the
+    positive x axis.
+    """
+
+    extent = 360.0 / color_count
+
+    return [(-extent * idx + extent * 2.5) % 360 for idx in range(color_count)]
+
+
+def outline_positions(scheme_indexes, color_count):
+    """
+    Finds the slices outlined for the color scheme.
+
+    :param scheme_indexes: list, the indexes of the scheme colors in the
+    palette.
+    :param color_count: int, the number of colors in the wheel.
+    :return: list, the slice positions to outline.
+    """
+
+    # Note! The UI draws the scheme outlines counterclockwise from the root
+    # color while the slices go clockwise, the thumbnails match the UI
+    return [-idx % color_count for idx in scheme_indexes]
+
+
+def png_chunk(chunk_type, data):
+    """
+    Packs a PNG chunk with its length and checksum.
+
+    :param chunk_type: bytes, the four letter chunk type.
+    :param data: bytes, the chunk data.
+    :return: bytes, the packed chunk.
+    """
+
+    return (len(data).to_bytes(4, 'big') + chunk_type + data
+            + zlib.crc32(chunk_type + data).to_bytes(4, 'big'))
+
+
+def png_bytes(width, height, pixel_rows, palette_rgb=None,
+              transparent_count=0):
+    """
+    Encodes an 8-bit PNG image, an indexed one when a palette is given and a
+    truecolor one otherwise.
+
+    :param width: int, the width of the image in pixels.
+    :param height: int, the height of the image in pixels.
+    :param pixel_rows: bytes, the rows of pixels, each prefixed with its
+    filter type byte.
+    :param palette_rgb: list, the RGB values of the palette indexes.
+    :param transparent_count: int, the number of leading palette indexes that
+    are fully transparent.
+    :return: bytes, the PNG file contents.
+    """
+
+    color_type = 3 if palette_rgb is not None else 2
+    chunks = [png_chunk(b'IHDR', width.to_bytes(4, 'big')
+                        + height.to_bytes(4, 'big')
+                        + bytes((8, color_type, 0, 0, 0)))]
+
+    if palette_rgb is not None:
+        chunks.append(png_chunk(b'PLTE', bytes(
+            value for rgb_value in palette_rgb for value in rgb_value)))
+        if transparent_count:
+            chunks.append(png_chunk(b'tRNS', bytes(transparent_count)))
+
+    chunks.append(png_chunk(b'IDAT', zlib.compress(pixel_rows, 6)))
+    chunks.append(png_chunk(b'IEND', b''))
+
+    return PNG_SIGNATURE + b''.join(chunks)
+
+
+def wheel_height(width):
+    """
+    Calculates the height of a wheel thumbnail keeping the canvas proportions.
+
+    :param width: int, the width of the thumbnail in pixels.
+    :return: int, the height of the thumbnail in pixels.
+    """
+
+    return max(round(width * CANVAS_HEIGHT / CANVAS_WIDTH), 1)
+
+
+@functools.lru_cache(maxsize=None)
+def wheel_layout(width, color_count):
+    """
+    Rasterizes the hue wheel geometry into the slice of every pixel and the
+    pixels of every slice outline. Pixels are sampled at their centers.
+
+    :param width: int, the width of the thumbnail in pixels.
+    :param color_count: int, the number of colors in the wheel.
+    :return: tuple, the slice of every pixel as bytes, 0 for the background
+    and 1 onwards for the slices, and the pixel offsets of the outline of
+    every slice as arrays.
+    """
+
+    height = wheel_height(width)
+    scale = width / CANVAS_WIDTH
+    extent = 360.0 / color_count
+    start_angles = slice_start_angles(color_count)
+    first_start_angle = start_angles[0]
+    center_x, center_y = WHEEL_CENTER
+
+    # Note! Outlines are kept at least a pixel wide in small thumbnails
+    half_width = max(OUTLINE_WIDTH / 2, 0.5 / scale)
+
+    slice_map = bytearray(width * height)
+    outlines = [array('I') for _ in range(color_count)]
+
+    for y in range(height):
+        canvas_y = center_y - (y + 0.5) / scale
+        for x in range(width):
+            canvas_x = (x + 0.5) / scale - center_x
+            radius = math.hypot(canvas_x, canvas_y)
+            if radius > WHEEL_RADIUS + half_width:
+                continue
+
+            offset = y * width + x
+            angle = math.degrees(math.atan2(canvas_y, canvas_x)) % 360
+            position = int(((first_start_angle + extent - angle) % 360)
+                           // extent) % color_count
+
+            if radius <= WHEEL_RADIUS:
+                slice_map[offset] = position + 1
+
+            if radius >= WHEEL_RADIUS - half_width:
+                outlines[position].append(offset)
+                continue
+
+            # Note! The edge between two slices is the start of one and the
+            # end of the next
+            edge = round((first_start_angle - angle) / extent) % color_count
+            angle_difference = (angle - start_angles[edge] + 180) % 360 - 180
+            if radius * math.sin(math.radians(abs(angle_difference))) \
+                    <= half_width and abs(angle_difference) < 90:
+                outlines[edge].append(offset)
+                outlines[(edge + 1) % color_count].append(offset)
+
+    return bytes(slice_map), tuple(outlines)
+
+
+def render_wheel_png(rgb_values, scheme_indexes, width=DEFAULT_WIDTH):
+    """
+    Renders the hue wheel with the color scheme outlined into a PNG image
+    with a transparent background.
+
+    :param rgb_values: list, the RGB values of the palette colors in wheel
+    order.
+    :param scheme_indexes: list, the indexes of the scheme colors in the
+    palette.
+    :param width: int, the width of the image in pixels.
+    :return: bytes, the PNG file contents.
+    """
+
+    color_count = len(rgb_values)
+    height = wheel_height(width)
+    slice_map, outlines = wheel_layout(width, color_count)
+
+    pixels = bytearray(slice_map)
+    outline_index = color_count + 1
+    for position in outline_positions(scheme_indexes, color_count):
+        for offset in outlines[position]:
+            pixels[offset] = outline_index
+
+    pixel_rows = b''.join(b'\x00' + pixels[offset:offset + width]
+                          for offset in range(0, width * height, width))
+
+    return png_bytes(width, height, pixel_rows,
+                     [(0, 0, 0)] + [tuple(rgb_value)
+                                    for rgb_value in rgb_values]
+                     + [(0, 0, 0)],
+                     transparent_count=1)
+
+
+def render_strip_png(rgb_values, swatch_size=DEFAULT_SWATCH_SIZE):
+    """
+    Renders a strip of color swatches into a PNG image.
+
+    :param rgb_values: list, the RGB values of the swatches.
+    :param swatch_size: int, the width and height of a swatch in pixels.
+    :return: bytes, the PNG file contents.
+    """
+
+    pixel_row = b'\x00' + b''.join(bytes(rgb_value) * swatch_size
+                                   for rgb_value in rgb_values)
+
+    return png_bytes(swatch_size * len(rgb_values), swatch_size,
+                     pixel_row * swatch_size)
+
+
+def svg_hex(rgb_value):
+    """
+    Converts RGB values into an SVG color.
+
+    :param rgb_value: tuple, the red, green and blue values.
+    :return: str, the hex color code.
+    """
+
+    return '#%02X%02X%02X' % tuple(rgb_value)
+
+
+def slice_path(start_angle, extent):
+    """
+    Draws the outline of a hue wheel slice as an SVG path.
+
+    :param start_angle: float, the start angle in degrees counterclockwise
+    from the positive x axis.
+    :param extent: float, the angle of the slice in degrees.
+    :return: str, the path data.
+    """
+
+    center_x, center_y = WHEEL_CENTER
+    points = []
+    for angle in (start_angle, start_angle + extent):
+        radians = math.radians(angle)
+        points.append((center_x + WHEEL_RADIUS * math.cos(radians),
+                       center_y - WHEEL_RADIUS * math.sin(radians)))
+
+    return (f'M{center_x} {center_y}L{points[0][0]:.2f} {points[0][1]:.2f}'
+            f'A{WHEEL_RADIUS} {WHEEL_RADIUS} 0 0 0 '
+            f'{points[1][0]:.2f} {points[1][1]:.2f}Z')
+
+
+def render_wheel_svg(rgb_values, scheme_indexes, width=DEFAULT_WIDTH):
+    """
+    Renders the hue wheel with the color scheme outlined into an SVG image.
+
+    :param rgb_values: list, the RGB values of the palette colors in wheel
+    order.
+    :param scheme_indexes: list, the indexes of the scheme colors in the
+    palette.
+    :param width: int, the width of the image in pixels.
+    :return: str, the SVG file contents.
+    """
+
+    color_count = len(rgb_values)
+    extent = 360.0 / color_count
+    start_angles = slice_start_angles(color_count)
+
+    elements = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{wheel_height(width)}" '
+        f'viewBox="0 0 {CANVAS_WIDTH} {CANVAS_HEIGHT}">'
+    ]
+    for rgb_value, start_angle in zip(rgb_values, start_angles):
+        color_hex = svg_hex(rgb_value)
+        elements.append(f'<path d="{slice_path(start_angle, extent)}" '
+                        f'fill="{color_hex}" stroke="{color_hex}"/>')
+
+    for position in outline_positions(scheme_indexes, color_count):
+        elements.append(
+            f'<path d="{slice_path(start_angles[position], extent)}" '
+            f'fill="none" stroke="black" stroke-width="{OUTLINE_WIDTH}"/>')
+
+    elements.append('</svg>')
+
+    return '\n'.join(elements) + '\n'
+
+
+def render_strip_svg(rgb_values, swatch_size=DEFAULT_SWATCH_SIZE):
+    """
+    Renders a strip of color swatches into an SVG image.
+
+    :param rgb_values: list, the RGB values of the swatches.
+    :param swatch_size: int, the width and height of a swatch in pixels.
+    :return: str, the SVG file contents.
+    """
+
+    elements = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{swatch_size * len(rgb_values)}" height="{swatch_size}">'
+    ]
+    for idx, rgb_value in enumerate(rgb_values):
+        elements.append(f'<rect x="{idx * swatch_size}" width="{swatch_size}"'
+                        f' height="{swatch_size}" '
+                        f'fill="{svg_hex(rgb_value)}"/>')
+
+    elements.append('</svg>')
+
+    return '\n'.join(elements) + '\n'
+
+
+def palette_thumbnail_job(name, palette):
+    """
+    Collects what's needed to render the thumbnails of a palette into plain
+    values that can be sent to another process.
+
+    :param name: str, the file name of the thumbnails without extension.
+    :param palette: Palette, the palette to render.
+    :return: tuple, the name, the RGB values of the palette and the indexes
+    of the scheme colors in the palette.
+    """
+
+    return (name,
+            [tuple(color.values()) for color in palette.values()],
+            palette.get_scheme_indexes())
+
+
+def render_chunk(jobs, output_directory, formats, width, swatch_size):
+    """
+    Renders the wheel and swatch strip thumbnails of a chunk of palettes into
+    files named after the jobs.
+
+    :param jobs: list, the jobs from palette_thumbnail_job.
+    :param output_directory: str, the directory to write the files to.
+    :param formats: list, the formats to render, png and svg.
+    :param width: int, the width of the wheel thumbnails in pixels.
+    :param swatch_size: int, the size of the strip swatches in pixels.
+    :return: int, the number of files written.
+    """
+
+    file_count = 0
+    for name, rgb_values, scheme_indexes in jobs:
+        scheme_rgb_values = [rgb_values[idx] for idx in scheme_indexes]
+        path = os.path.join(output_directory, name)
+
+        if 'png' in formats:
+            with open(f'{path}-wheel.png', 'wb') as file:
+                file.write(render_wheel_png(rgb_values, scheme_indexes,
+                                            width))
+            with open(f'{path}-strip.png', 'wb') as file:
+                file.write(render_strip_png(scheme_rgb_values, swatch_size))
+            file_count += 2
+
+        if 'svg' in formats:
+            with open(f'{path}-wheel.svg', 'w') as file:
+                file.write(render_wheel_svg(rgb_values, scheme_indexes,
+                                            width))
+            with open(f'{path}-strip.svg', 'w') as file:
+                file.write(render_strip_svg(scheme_rgb_values, swatch_size))
+            file_count += 2
+
+    return file_count
+
+
+def render_batch(jobs, output_directory, formats=None, width=DEFAULT_WIDTH,
+                 swatch_size=DEFAULT_SWATCH_SIZE, processes=None):
+    """
+    Renders the thumbnails of thousands of palettes in parallel. The jobs are
+    split into chunks that are rendered in a pool of processes, small batches
+    are rendered in the calling process. Invalid settings raise ValueError
+    and failed writes OSError, the batch runs without the UI.
+
+    :param jobs: list, the jobs from palette_thumbnail_job.
+    :param output_directory: str, the directory to write the files to.
+    :param formats: list, the formats to render, png and svg by default.
+    :param width: int, the width of the wheel thumbnails in pixels.
+    :param swatch_size: int, the size of the strip swatches in pixels.
+    :param processes: int, the number of processes or None for one per CPU.
+    :return: int, the number of files written.
+    """
+
+    if formats is None:
+        formats = THUMBNAIL_FORMATS
+
+    if any(thumbnail_format not in THUMBNAIL_FORMATS
+           for thumbnail_format in formats):
+        raise ValueError('Thumbnail formats must be png or svg!')
+
+    if (
+            not isinstance(width, int) or width < 1
+            or not isinstance(swatch_size, int) or swatch_size < 1
+    ):
+        raise ValueError('Thumbnail sizes must be positive integers!')
+
+    os.makedirs(output_directory, exist_ok=True)
+
+    if len(jobs) <= BATCH_CHUNK_SIZE or processes == 1:
+        return render_chunk(jobs, output_directory, formats, width,
+                            swatch_size)
+
+    chunks = [jobs[offset:offset + BATCH_CHUNK_SIZE]
+              for offset in range(0, len(jobs), BATCH_CHUNK_SIZE)]
+    render = functools.partial(render_chunk,
+                               output_directory=output_directory,
+                               formats=formats, width=width,
+                               swatch_size=swatch_size)
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return sum(executor.map(render, chunks))
+
+
+def main():
+    from argument_types import positive_int
+    from palette import COLOR_SCHEMES
+    from palette_snapshot import (COLOR_WHEEL_KEYS, DEFAULT_VARIANT_AMOUNTS,
+                                  build_snapshot, create_variant_palette)
+
+    parser = argparse.ArgumentParser(
+        description='Render wheel and swatch strip thumbnails of every color '
+                    'wheel, root color, hue variant and color scheme.')
+    parser.add_argument('output', help='directory to write the thumbnails to')
+    parser.add_argument('--format', choices=THUMBNAIL_FORMATS,
+                        action='append',
+                        help='format to render, both by default')
+    parser.add_argument('--width', type=positive_int, default=DEFAULT_WIDTH,
+                        help='width of the wheel thumbnails in pixels')
+    parser.add_argument('--swatch-size', type=positive_int,
+                        default=DEFAULT_SWATCH_SIZE,
+                        help='size of the strip swatches in pixels')
+    parser.add_argument('--processes', type=positive_int)
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    snapshot = build_snapshot()
+
+    jobs = []
+    for color_wheel_key in COLOR_WHEEL_KEYS:
+        for root_color_name in snapshot['wheels'][color_wheel_key]:
+            for hue_variant_key in ['HUE', 'TINT', 'SHADE', 'TONE']:
+                for color_scheme_key in COLOR_SCHEMES:
+                    palette = create_variant_palette(
+                        color_wheel_key, root_color_name, color_scheme_key,
+                        hue_variant_key, DEFAULT_VARIANT_AMOUNTS, snapshot)
+                    name = '-'.join((color_wheel_key, root_color_name,
+                                     hue_variant_key, color_scheme_key))
+                    jobs.append(palette_thumbnail_job(
+                        name.lower().replace(' ', '-'), palette))
+
+    try:
+        file_count = render_batch(jobs, args.output, args.format,
+                                  args.width, args.swatch_size,
+                                  args.processes)
+    except OSError as error:
+        sys.exit(f'Writing the thumbnails ran into trouble: {error}')
+
+    print(f'Wrote {file_count} thumbnails of {len(jobs)} palettes in '
+          f'{time.perf_counter() - start_time:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+import argparse
+import functools
+import sys
+
+from argument_types import number_range
+from color import Color
+from color_space import (is_in_gamut, oklab_to_linear, oklab_to_oklch,
+                         oklab_to_rgb, oklch_to_oklab, rgb_to_oklab)
+from main import show_error
+from palette import Palette
+from palette_export import palette_to_text
+from palette_snapshot import COLOR_WHEEL_KEYS
+
+DEFAULT_STEP_COUNT = 10
+LIGHTEST_LIGHTNESS = 0.97
+DARKEST_LIGHTNESS = 0.25
+GAMUT_SEARCH_STEPS = 12
+
+
+def design_token_names(step_count):
+    """
+    Names the steps of a ramp like design token scales, 50 being the lightest
+    followed by hundreds. Ten steps make the common 50-900 scale.
+
+    :param step_count: int, the number of steps in the ramp.
+    :return: list, the token names from lightest to darkest.
+    """
+
+    return ['50'] + [str(step * 100) for step in range(1, step_count)]
+
+
+def fit_chroma_to_gamut(oklch_values):
+    """
+    Reduces the chroma of OKLCh values until they fit in the sRGB gamut while
+    keeping their lightness and hue. All the values are searched at once with
+    bisection.
+
+    :param oklch_values: list, the OKLCh values as tuples.
+    :return: list, the OKLCh values that fit in the gamut.
+    """
+
+    in_gamut = [is_in_gamut(linear_value) for linear_value in
+                oklab_to_linear(oklch_to_oklab(oklch_values))]
+    search_indexes = [idx for idx, fits in enumerate(in_gamut) if not fits]
+
+    fitted_values = list(oklch_values)
+    if not search_indexes:
+        return fitted_values
+
+    low_chromas = [0.0] * len(search_indexes)
+    high_chromas = [oklch_values[idx][1] for idx in search_indexes]
+
+    for _ in range(GAMUT_SEARCH_STEPS):
+        middle_chromas = [(low + high) / 2
+                          for low, high in zip(low_chromas, high_chromas)]
+        linear_values = oklab_to_linear(oklch_to_oklab([
+            (oklch_values[idx][0], chroma, oklch_values[idx][2])
+            for idx, chroma in zip(search_indexes, middle_chromas)
+        ]))
+
+        for position, linear_value in enumerate(linear_values):
+            if is_in_gamut(linear_value):
+                low_chromas[position] = middle_chromas[position]
+            else:
+                high_chromas[position] = middle_chromas[position]
+
+    for idx, chroma in zip(search_indexes, low_chromas):
+        fitted_values[idx] = (oklch_values[idx][0], chroma,
+                              oklch_values[idx][2])
+
+    return fitted_values
+
+
+@functools.lru_cache(maxsize=1024)
+def compute_ramps(rgb_values, step_count=DEFAULT_STEP_COUNT,
+                  lightest=LIGHTEST_LIGHTNESS, darkest=DARKEST_LIGHTNESS):
+    """
+    Computes perceptually even lightness ramps for the colors in OKLab. Each
+    step has the same OKLab lightness for every hue, the hue is kept and the
+    chroma is reduced where needed to stay in gamut. All the hues are
+    computed in one batch and the results are cached.
+
+    :param rgb_values: tuple, the RGB values as (red, green, blue) tuples.
+    :param step_count: int, the number of steps in each ramp.
+    :param lightest: float, the OKLab lightness of the lightest step.
+    :param darkest: float, the OKLab lightness of the darkest step.
+    :return: tuple, a ramp of RGB value tuples for each color.
+    """
+
+    lightness_step = (lightest - darkest) / max(step_count - 1, 1)
+    lightnesses = [lightest - lightness_step * step
+                   for step in range(step_count)]
+
+    target_values = [
+        (lightness, chroma, hue)
+        for _, chroma, hue in oklab_to_oklch(rgb_to_oklab(rgb_values))
+        for lightness in lightnesses
+    ]
+    ramp_values = oklab_to_rgb(oklch_to_oklab(
+        fit_chroma_to_gamut(target_values)))
+
+    return tuple(
+        tuple(ramp_values[idx * step_count:(idx + 1) * step_count])
+        for idx in range(len(rgb_values))
+    )
+
+
+def generate_ramps(palette, step_count=DEFAULT_STEP_COUNT):
+    """
+    Generates a tonal ramp for every color in the palette. The ramp colors are
+    named after the palette color and their design token.
+
+    :param palette: Palette, the palette to generate ramps for.
+    :param step_count: int, the number of steps in each ramp.
+    :return: list, the ramps as lists of Color instances in palette order.
+    """
+
+    if not isinstance(palette, Palette):
+        show_error('Invalid palette to generate ramps for received!')
+        return
+
+    if not isinstance(step_count, int) or step_count < 2:
+        show_error('Invalid ramp step count received!')
+        return
+
+    colors = palette.values()
+
+    # Note! Ramps are cached in a sorted order so wheels sorted by any root
+    # color share the cached result
+    rgb_values = [tuple(color.values()) for color in colors]
+    unique_rgb_values = tuple(sorted(set(rgb_values)))
+    unique_ramps = dict(zip(unique_rgb_values,
+                            compute_ramps(unique_rgb_values, step_count)))
+    token_names = design_token_names(step_count)
+
+    return [
+        [Color(*ramp_value, f'{color.name()} {token_name}')
+         for ramp_value, token_name in zip(unique_ramps[rgb_value],
+                                           token_names)]
+        for color, rgb_value in zip(colors, rgb_values)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export tonal ramps of the color wheels.')
+    parser.add_argument('--steps', type=number_range(int, 2),
+                        default=DEFAULT_STEP_COUNT,
+                        help='steps in each ramp, 10 makes a 50-900 scale')
+    parser.add_argument('--wheel', choices=COLOR_WHEEL_KEYS,
+                        action='append',
+                        help='color wheel to export, defaults to all')
+    args = parser.parse_args()
+
+    for color_wheel_key in args.wheel or COLOR_WHEEL_KEYS:
+        palette = Palette(color_wheel_key)
+        sys.stdout.write(palette_to_text(
+            palette, ramps=generate_ramps(palette, args.steps)))
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Precomputed sweep tables of the tint, shade and tone hue variants. A table
+holds the variant of every color wheel color at every amount 0-100% so
+changing an amount is a lookup instead of recomputing the colors. Tables are
+built on first use and cached per color wheel and hue variant.
+"""
+
+import functools
+
+from color import shade_rgb, tint_rgb, tone_rgb
+from main import show_error
+from palette import Palette
+
+SWEEP_AMOUNTS = range(101)
+HUE_VARIANT_KEYS = ['TINT', 'SHADE', 'TONE']
+VARIANT_FUNCTIONS = {
+    'TINT': tint_rgb,
+    'SHADE': shade_rgb,
+    'TONE': tone_rgb
+}
+
+
+def sweep_rgb_values(rgb_values, hue_variant_key):
+    """
+    Calculates the hue variant of the RGB values at every sweep amount with
+    the same arithmetic as the Color variant functions.
+
+    :param rgb_values: list, the RGB values as (red, green, blue) tuples.
+    :param hue_variant_key: str, the hue variant, TINT, SHADE or TONE.
+    :return: list, the RGB values of every amount as lists of tuples.
+    """
+
+    variant_rgb = VARIANT_FUNCTIONS[hue_variant_key]
+
+    return [[variant_rgb(red, green, blue, amount / 100)
+             for red, green, blue in rgb_values]
+            for amount in SWEEP_AMOUNTS]
+
+
+@functools.lru_cache(maxsize=None)
+def sweep_table(color_wheel_key, hue_variant_key):
+    """
+    Builds the sweep table of a color wheel's hue variant.
+
+    :param color_wheel_key: str, the color wheel of the table.
+    :param hue_variant_key: str, the hue variant, TINT, SHADE or TONE.
+    :return: dict, the wheel indexes of the colors keyed by name and the
+    variant colors of every amount as packed RGB bytes in wheel order.
+    """
+
+    colors = Palette(color_wheel_key).values()
+    sweeps = sweep_rgb_values([color.values() for color in colors],
+                              hue_variant_key)
+
+    return {
+        'names': {color.name(): idx for idx, color in enumerate(colors)},
+        'amounts': tuple(
+            bytes(value for rgb_value in rgb_values for value in rgb_value)
+            for rgb_values in sweeps)
+    }
+
+
+def validate_variant_amount(hue_variant_key, amount):
+    """
+    Checks the sweep table lookup parameters.
+
+    :param hue_variant_key: str, the hue variant, TINT, SHADE or TONE.
+    :param amount: int, the variant percentage 0-100.
+    :return: bool, True if the parameters are valid.
+    """
+
+    if hue_variant_key not in HUE_VARIANT_KEYS:
+        show_error(f'Value {hue_variant_key} is not a valid hue variant!')
+        return False
+
+    if not isinstance(amount, int) or amount not in SWEEP_AMOUNTS:
+        show_error('Hue variant amount must be a percentage 0-100!')
+        return False
+
+    return True
+
+
+def apply_variant_amount(palette, hue_variant_key, amount):
+    """
+    Sets the colors of a hue variant palette to another amount of the variant
+    from the sweep table. The colors keep their hue values as the original
+    values.
+
+    :param palette: Palette, the hue variant palette to update.
+    :param hue_variant_key: str, the hue variant, TINT, SHADE or TONE.
+    :param amount: int, the variant percentage 0-100.
+    :return: Palette, the updated palette.
+    """
+
+    if not isinstance(palette, Palette):
+        show_error('Invalid palette to update received!')
+        return
+
+    if not validate_variant_amount(hue_variant_key, amount):
+        return
+
+    table = sweep_table(palette.get_color_wheel(), hue_variant_key)
+    names = table['names']
+    variant_values = table['amounts'][amount]
+
+    for color in palette.values():
+        offset = names[color.name()] * 3
+        color.replace_values(*variant_values[offset:offset + 3])
+
+    return palette
+
+
+def create_sweep_palette(color_wheel_key, root_color_name, color_scheme_key,
+                         hue_variant_key, amount, sort_by_root=True):
+    """
+    Creates a color wheel palette with an amount of the hue variant read from
+    the sweep table and the root color picked.
+
+    :param color_wheel_key: str, the color wheel of the palette.
+    :param root_color_name: str, the name of the root color.
+    :param color_scheme_key: str, the color scheme of the palette.
+    :param hue_variant_key: str, the hue variant, TINT, SHADE or TONE.
+    :param amount: int, the variant percentage 0-100.
+    :param sort_by_root: bool, whether to sort the wheel by the root color.
+    :return: Palette, the created palette.
+    """
+
+    variant_palette = apply_variant_amount(Palette(color_wheel_key),
+                                           hue_variant_key, amount)
+    if variant_palette is None:
+        return
+
+    root_color = variant_palette.find_by_name(root_color_name)
+    variant_palette.set_picked_color(root_color)
+    if sort_by_root:
+        variant_palette.sort_color_wheel(root_color)
+
+    variant_palette.set_color_scheme(color_scheme_key)
+
+    return variant_palette
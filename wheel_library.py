@@ -0,0 +1,393 @@
+"""
+Color wheels defined in JSON and TOML files. Wheel files are discovered from
+the wheel directories, parsed and validated once and compiled into a cache
+keyed by the modification time, size and content hash of each file, so
+launching with any number of installed wheels only reads the cache. The
+colors of a wheel are created when it's first used.
+
+A wheel file has a key, a title and twelve colors in wheel order:
+
+    key = "PASTEL"
+    title = "Pastel (Screen)"
+
+    [[colors]]
+    name = "Red"
+    hex = "#FF8080"
+
+Colors are given either as a hex code or as "rgb" = [red, green, blue].
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import pickle
+
+# Note! TOML wheel files need tomllib from Python 3.11, JSON wheel files work
+# without it
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+from color import HEX_VALUES, Color
+from main import resource_path
+
+WHEEL_DIRECTORY = 'wheels'
+WHEEL_EXTENSIONS = ('.json', '.toml')
+CACHE_FILENAME = '.colorian_wheels.cache'
+# Note! Bump the version when the validation changes so cached wheels get
+# validated again
+CACHE_VERSION = 2
+WHEEL_COLOR_COUNT = 12
+BUILTIN_WHEEL_KEYS = ['RYB', 'RGB', 'CMYK']
+
+
+def default_wheel_directories():
+    """
+    Fetches the directories to discover wheel files from, the bundled wheel
+    directory and the directories in the COLORIAN_WHEELS environment variable.
+
+    :return: list, the paths of the wheel directories.
+    """
+
+    directories = [resource_path(WHEEL_DIRECTORY)]
+    directories.extend(path for path in os.environ.get(
+        'COLORIAN_WHEELS', '').split(os.pathsep) if path)
+
+    return directories
+
+
+def default_cache_path():
+    """
+    Fetches the path of the compiled wheel cache in the home directory.
+
+    :return: str, the path of the cache file.
+    """
+
+    return os.path.join(os.path.expanduser('~'), CACHE_FILENAME)
+
+
+def parse_color(color_definition):
+    """
+    Parses a color of a wheel file.
+
+    :param color_definition: dict, the name and hex code or RGB values.
+    :return: tuple, the name and RGB values of the color, or None and an
+    error message for invalid colors.
+    """
+
+    if not isinstance(color_definition, dict):
+        return None, 'Colors must be tables with a name and a hex or rgb value'
+
+    name = color_definition.get('name')
+    if not isinstance(name, str) or not name:
+        return None, 'Every color needs a name'
+
+    if 'hex' in color_definition:
+        hex_code = color_definition['hex']
+        if not isinstance(hex_code, str):
+            return None, f'Color {name} has an invalid hex code'
+
+        digits = hex_code[1:] if hex_code.startswith('#') else hex_code
+        rgb_values = [HEX_VALUES.get(digits[idx:idx + 2]) for idx in (0, 2, 4)]
+        if len(digits) != 6 or None in rgb_values:
+            return None, f'Color {name} has an invalid hex code'
+    else:
+        rgb_values = color_definition.get('rgb')
+        if (
+                not isinstance(rgb_values, list)
+                or len(rgb_values) != 3
+                or not all(isinstance(value, int)
+                           and not isinstance(value, bool)
+                           and 0 <= value <= 255 for value in rgb_values)
+        ):
+            return None, f'Color {name} needs a hex code or rgb values 0-255'
+
+    return (name, tuple(rgb_values)), None
+
+
+def compile_wheel(data, extension):
+    """
+    Parses and validates the contents of a wheel file into its compiled form.
+
+    :param data: bytes, the contents of the wheel file.
+    :param extension: str, the file extension, .json or .toml.
+    :return: tuple, the compiled wheel with its key, title, color names and
+    packed RGB values, or None and an error message for invalid files.
+    """
+
+    try:
+        if extension == '.toml':
+            if tomllib is None:
+                return None, 'TOML wheel files need Python 3.11 or newer'
+            definition = tomllib.loads(data.decode('utf-8'))
+        else:
+            definition = json.loads(data)
+    except (ValueError, UnicodeDecodeError) as error:
+        return None, f'Invalid {extension[1:].upper()}: {error}'
+
+    if not isinstance(definition, dict):
+        return None, 'A wheel file must define a key, a title and colors'
+
+    key = definition.get('key')
+    title = definition.get('title')
+    if not isinstance(key, str) or not key or key != key.upper():
+        return None, 'The wheel key must be an uppercase string'
+
+    if key in BUILTIN_WHEEL_KEYS:
+        return None, f'The wheel key {key} is reserved'
+
+    if not isinstance(title, str) or not title:
+        return None, 'The wheel needs a title'
+
+    color_definitions = definition.get('colors')
+    if (
+            not isinstance(color_definitions, list)
+            or len(color_definitions) != WHEEL_COLOR_COUNT
+    ):
+        return None, f'The wheel needs exactly {WHEEL_COLOR_COUNT} colors'
+
+    names = []
+    rgb_values = bytearray()
+    for color_definition in color_definitions:
+        color, error = parse_color(color_definition)
+        if color is None:
+            return None, error
+
+        names.append(color[0])
+        rgb_values.extend(color[1])
+
+    if len(set(names)) != len(names):
+        return None, 'The color names of a wheel must be unique'
+
+    return {
+        'key': key,
+        'title': title,
+        'names': tuple(names),
+        'rgb': bytes(rgb_values)
+    }, None
+
+
+class WheelLibrary:
+
+    def __init__(self, directories, cache_path=None):
+        """
+        Creates a WheelLibrary instance of the wheel files in the directories.
+        The files are discovered on first use.
+
+        :param directories: list, the paths of the wheel directories.
+        :param cache_path: str, the path of the compiled wheel cache or None
+        to compile the files on every launch.
+        """
+
+        self.__directories = list(directories)
+        self.__cache_path = cache_path
+        self.__wheels = None
+        self.__errors = []
+
+    def __load(self):
+        """
+        Discovers the wheel files and compiles the ones that have changed
+        since they were cached. Files are matched to the cache by their
+        modification time and size, and by content hash if those differ.
+        """
+
+        cache_entries = self.__read_cache()
+        new_cache_entries = {}
+        self.__wheels = {}
+        self.__errors = []
+
+        for path in self.__discover():
+            try:
+                file_stat = os.stat(path)
+                entry = cache_entries.get(path)
+
+                if (
+                        entry is None
+                        or entry['mtime'] != file_stat.st_mtime_ns
+                        or entry['size'] != file_stat.st_size
+                ):
+                    with open(path, 'rb') as file:
+                        data = file.read()
+
+                    content_hash = hashlib.sha256(data).hexdigest()
+                    if entry is None or entry['hash'] != content_hash:
+                        wheel, error = compile_wheel(
+                            data, os.path.splitext(path)[1].lower())
+                    else:
+                        wheel, error = entry['wheel'], entry['error']
+
+                    entry = {
+                        'mtime': file_stat.st_mtime_ns,
+                        'size': file_stat.st_size,
+                        'hash': content_hash,
+                        'wheel': wheel,
+                        'error': error
+                    }
+            except OSError as error:
+                self.__errors.append((path, str(error)))
+                continue
+
+            new_cache_entries[path] = entry
+
+            wheel = entry['wheel']
+            if wheel is None:
+                self.__errors.append((path, entry['error']))
+            elif wheel['key'] in self.__wheels:
+                self.__errors.append(
+                    (path, f'The wheel key {wheel["key"]} is already used'))
+            else:
+                self.__wheels[wheel['key']] = wheel
+
+        if new_cache_entries != cache_entries:
+            self.__write_cache(new_cache_entries)
+
+    def __discover(self):
+        """
+        Lists the wheel files of the wheel directories in name order.
+
+        :return: list, the paths of the wheel files.
+        """
+
+        paths = []
+        for directory in self.__directories:
+            try:
+                with os.scandir(directory) as directory_entries:
+                    paths.extend(sorted(
+                        directory_entry.path
+                        for directory_entry in directory_entries
+                        if directory_entry.is_file()
+                        and os.path.splitext(directory_entry.name)[1].lower()
+                        in WHEEL_EXTENSIONS))
+            except OSError:
+                continue
+
+        return paths
+
+    def __read_cache(self):
+        """
+        Reads the compiled wheel cache. Missing and outdated caches are
+        ignored.
+
+        :return: dict, the cache entries keyed by file path.
+        """
+
+        if self.__cache_path is None:
+            return {}
+
+        try:
+            with open(self.__cache_path, 'rb') as file:
+                cache = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return {}
+
+        if (
+                not isinstance(cache, dict)
+                or cache.get('version') != CACHE_VERSION
+        ):
+            return {}
+
+        return cache['entries']
+
+    def __write_cache(self, cache_entries):
+        """
+        Writes the compiled wheel cache through a temporary file so an
+        interrupted write never leaves a partial cache.
+
+        :param cache_entries: dict, the cache entries keyed by file path.
+        """
+
+        if self.__cache_path is None:
+            return
+
+        # Note! The cache only speeds up launching, wheels work without it
+        temporary_path = self.__cache_path + '.tmp'
+        try:
+            with open(temporary_path, 'wb') as file:
+                pickle.dump({'version': CACHE_VERSION,
+                             'entries': cache_entries},
+                            file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.__cache_path)
+        except OSError:
+            pass
+
+    def wheels(self):
+        """
+        Fetches the wheels of the library.
+
+        :return: dict, the wheel titles keyed by wheel key.
+        """
+
+        if self.__wheels is None:
+            self.__load()
+
+        return {key: wheel['title'] for key, wheel in self.__wheels.items()}
+
+    def colors(self, color_wheel_key):
+        """
+        Creates the colors of a wheel.
+
+        :param color_wheel_key: str, the key of the wheel.
+        :return: list, new Color instances of the wheel in wheel order or None
+        if the library has no such wheel.
+        """
+
+        if self.__wheels is None:
+            self.__load()
+
+        wheel = self.__wheels.get(color_wheel_key)
+        if wheel is None:
+            return None
+
+        rgb_values = wheel['rgb']
+
+        return [Color(*rgb_values[idx * 3:idx * 3 + 3], name)
+                for idx, name in enumerate(wheel['names'])]
+
+    def errors(self):
+        """
+        Fetches the wheel files that couldn't be used.
+
+        :return: list, the paths of the files with an error message as tuples.
+        """
+
+        if self.__wheels is None:
+            self.__load()
+
+        return list(self.__errors)
+
+
+@functools.lru_cache(maxsize=None)
+def default_library():
+    """
+    Fetches the library of the default wheel directories.
+
+    :return: WheelLibrary, the shared wheel library.
+    """
+
+    return WheelLibrary(default_wheel_directories(), default_cache_path())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Validate and compile color wheel files.')
+    parser.add_argument('directories', nargs='*',
+                        help='wheel directories, defaults to the bundled '
+                             'wheels and COLORIAN_WHEELS')
+    args = parser.parse_args()
+
+    # Note! Wheel directories given to validate are always compiled afresh
+    library = default_library() if not args.directories \
+        else WheelLibrary(args.directories)
+
+    for color_wheel_key, title in library.wheels().items():
+        print(f'{color_wheel_key}: {title}')
+
+    for path, error in library.errors():
+        print(f'{path}: {error}')
+
+
+if __name__ == '__main__':
+    main()